@@ -1,14 +1,26 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.routes import router as api_router
+from fastapi.responses import JSONResponse
+from src.api.routes import router as api_router, solution_store
+from src.api.schemas import BudgetExceededResponse
+from src.solver.limits import BudgetExceeded
 from src.config import settings
 from src.logging_config import logger
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    if solution_store is not None:
+        solution_store.close()   # commit buffered solutions
+        logger.info("Solution store closed")
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
         version=settings.VERSION,
-        openapi_url=f"{settings.API_V1_STR}/openapi.json"
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan,
     )
 
     # Set all CORS enabled origins
@@ -21,6 +33,19 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(api_router, prefix=settings.API_V1_STR)
+
+    @app.exception_handler(BudgetExceeded)
+    async def budget_exceeded_handler(request: Request, exc: BudgetExceeded):
+        logger.warning(f"{request.url.path}: {exc}")
+        body = BudgetExceededResponse(
+            reason=exc.reason,
+            algorithm=exc.algorithm,
+            steps=exc.steps,
+            backtracks=exc.backtracks,
+            execution_time=exc.elapsed,
+            message="Solve budget exceeded",
+        )
+        return JSONResponse(status_code=503, content=body.model_dump())
     
     logger.info("FastAPI application initialized")
     return app
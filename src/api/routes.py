@@ -1,54 +1,242 @@
-from fastapi import APIRouter, HTTPException
-from src.api.schemas import SudokuBoard, SolveResponse, HealthCheck
+import json
+from typing import Iterator, Literal, Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from src.api.schemas import (
+    SudokuBoard, SolveResponse, HealthCheck, CountRequest, CountResponse, StreamRequest, CacheStats,
+)
 from src.solver.backtracking_solver import BacktrackingSolver
 from src.solver.dlx_solver import DLXSolver
+from src.solver.portfolio import PortfolioSolver
+from src.solver.cache import CachedSolver, SolutionCache
+from src.solver.store import SolutionStore
+from src.solver.profiling import ProfileCapture, RequestProfiler
+from src.solver.limits import BudgetExceeded, SolveLimits
+from src.solver.validator import SudokuValidator
 from src.config import settings
 from src.logging_config import logger
 
 router = APIRouter()
 
+DeadlineHeader = Header(
+    None, alias="X-Deadline-Ms", ge=1,
+    description="Give up after this many milliseconds (responds 503 with partial statistics)",
+)
+
+# Shared by the single-engine solve routes (disabled when SOLUTION_CACHE_MAX_MB is 0)
+solution_cache = SolutionCache()
+# Persistent store behind the cache (enabled by SOLUTION_STORE_PATH; closed on shutdown)
+solution_store = (
+    SolutionStore(settings.SOLUTION_STORE_PATH, settings.SOLUTION_STORE_BATCH)
+    if settings.SOLUTION_STORE_PATH else None
+)
+# Profiles requests that ask for it, plus every PROFILE_SAMPLE_EVERY-th solve
+request_profiler = RequestProfiler()
+
+InstrumentQuery = Query(
+    False, description="Return search-tree statistics (skips the solution cache for this request)",
+)
+ProfileQuery = Query(
+    None, description="Profile this request; the file is written to PROFILE_DIR and named in the response",
+)
+ProfileMode = Optional[Literal["cprofile", "sampling"]]
+VariableOrder = Optional[Literal["first-empty", "mrv", "mrv-degree"]]
+ValueOrder = Optional[Literal["ascending", "lcv", "random"]]
+
+# The solving routes are plain `def`: FastAPI runs them in its threadpool, so
+# a long solve (bounded by X-Deadline-Ms and MAX_STEPS) never blocks the event
+# loop that serves /health and the other requests.
+
+def _limits(deadline_ms: Optional[int]) -> SolveLimits:
+    return SolveLimits.from_settings(timeout=None if deadline_ms is None else deadline_ms / 1000)
+
+def _solve(cached: CachedSolver, board, deadline_ms: Optional[int], instrument: bool):
+    # A cache hit has no search tree to report, so instrumented requests always search
+    if instrument:
+        return cached.solver.solve(board, _limits(deadline_ms))
+    return cached.solve(board, _limits(deadline_ms))
+
+def _profile_path(capture: Optional[ProfileCapture]) -> Optional[str]:
+    return capture.path if capture is not None else None
+
+def _cache_hit_response(
+    result, algorithm: str, cached: CachedSolver, capture: Optional[ProfileCapture] = None
+) -> SolveResponse:
+    return SolveResponse(
+        solved_board=result,
+        success=True,
+        algorithm=algorithm,
+        execution_time=cached.lookup_time,
+        memory_usage_mb=0.0,
+        steps=0,
+        backtracks=0,
+        cached=True,
+        profile=_profile_path(capture),
+        message=f"Solved from {cached.source}"
+    )
+
 @router.get("/health", response_model=HealthCheck)
 async def health_check():
     return HealthCheck(status="healthy", version=settings.VERSION)
 
 @router.post("/solve/backtracking", response_model=SolveResponse)
-async def solve_backtracking(request: SudokuBoard):
-    solver = BacktrackingSolver()
-    result = solver.solve(request.board)
+def solve_backtracking(
+    request: SudokuBoard,
+    deadline_ms: Optional[int] = DeadlineHeader,
+    instrument: bool = InstrumentQuery,
+    profile: ProfileMode = ProfileQuery,
+    variable_order: VariableOrder = Query(None, description="Cell ordering (default: VARIABLE_ORDERING)"),
+    value_order: ValueOrder = Query(None, description="Digit ordering (default: VALUE_ORDERING)"),
+    seed: Optional[int] = Query(None, description="Seed of the random digit ordering (default: ORDERING_SEED)"),
+):
+    try:
+        solver = BacktrackingSolver(
+            instrument=instrument, variable_order=variable_order, value_order=value_order, seed=seed,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    cached = CachedSolver(solver, solution_cache, solution_store)
+    with request_profiler.profile("backtracking", mode=profile) as capture:
+        result = _solve(cached, request.board, deadline_ms, instrument)
     
     if result is None:
         raise HTTPException(status_code=400, detail="Puzzle is unsolvable or invalid")
-        
-    bench = solver.benchmarker.end_benchmark("Backtracking", solver.steps, solver.backtracks)
+    if cached.hit:
+        return _cache_hit_response(result, "Backtracking", cached, capture)
+
+    solver = cached.solver
+
+    bench = solver.benchmarker.last
     
     return SolveResponse(
         solved_board=result,
         success=True,
         algorithm="Backtracking",
+        ordering=bench.ordering,
         execution_time=bench.execution_time,
+        cpu_time=bench.cpu_time,
         memory_usage_mb=bench.memory_usage_mb,
         steps=bench.steps,
         backtracks=bench.backtracks,
+        propagated_cells=bench.propagated_cells,
+        search_cells=bench.search_cells,
+        search_stats=bench.search_stats,
+        profile=_profile_path(capture),
         message="Solved successfully"
     )
 
 @router.post("/solve/dlx", response_model=SolveResponse)
-async def solve_dlx(request: SudokuBoard):
-    solver = DLXSolver()
-    result = solver.solve(request.board)
+def solve_dlx(
+    request: SudokuBoard,
+    deadline_ms: Optional[int] = DeadlineHeader,
+    instrument: bool = InstrumentQuery,
+    profile: ProfileMode = ProfileQuery,
+):
+    cached = CachedSolver(DLXSolver(instrument=instrument), solution_cache, solution_store)
+    with request_profiler.profile("dlx", mode=profile) as capture:
+        result = _solve(cached, request.board, deadline_ms, instrument)
     
     if result is None:
         raise HTTPException(status_code=400, detail="Puzzle is unsolvable or invalid")
-        
-    bench = solver.benchmarker.end_benchmark("DLX", solver.nodes_visited, solver.backtracks)
+    if cached.hit:
+        return _cache_hit_response(result, "DLX", cached, capture)
+
+    solver = cached.solver
+
+    bench = solver.benchmarker.last
     
     return SolveResponse(
         solved_board=result,
         success=True,
         algorithm="DLX",
         execution_time=bench.execution_time,
+        cpu_time=bench.cpu_time,
         memory_usage_mb=bench.memory_usage_mb,
         steps=bench.steps,
         backtracks=bench.backtracks,
+        propagated_cells=bench.propagated_cells,
+        search_cells=bench.search_cells,
+        search_stats=bench.search_stats,
+        profile=_profile_path(capture),
         message="Solved successfully"
     )
+
+@router.post("/solve/portfolio", response_model=SolveResponse)
+def solve_portfolio(request: SudokuBoard, deadline_ms: Optional[int] = DeadlineHeader):
+    solver = PortfolioSolver()
+    result = solver.solve(request.board, _limits(deadline_ms))
+
+    if result is None:
+        raise HTTPException(status_code=400, detail="Puzzle is unsolvable or invalid")
+
+    bench = solver.benchmark
+    return SolveResponse(
+        solved_board=result,
+        success=True,
+        algorithm="Portfolio",
+        execution_time=solver.solve_time,
+        memory_usage_mb=bench.memory_usage_mb,
+        steps=bench.steps,
+        backtracks=bench.backtracks,
+        propagated_cells=bench.propagated_cells,
+        search_cells=bench.search_cells,
+        winner=solver.winner,
+        message=f"Solved successfully by {solver.winner}"
+    )
+
+@router.post("/solve/stream")
+async def solve_stream(request: StreamRequest, deadline_ms: Optional[int] = DeadlineHeader):
+    """NDJSON stream of search events; the last line is "solved", "unsolvable" or "budget_exceeded"."""
+    if not SudokuValidator.is_valid_board(request.board):
+        raise HTTPException(status_code=400, detail="Puzzle is invalid")
+
+    solver = BacktrackingSolver(engine=request.engine, propagation="off")
+    limits = _limits(deadline_ms)
+
+    def lines() -> Iterator[str]:
+        solved = False
+        try:
+            for event in solver.iter_solve(request.board, limits):
+                solved = event.kind == "solved"
+                yield json.dumps(event.to_dict()) + "\n"
+        except BudgetExceeded as exc:
+            yield json.dumps({
+                "event": "budget_exceeded", "reason": exc.reason,
+                "step": exc.steps, "backtracks": exc.backtracks,
+            }) + "\n"
+            return
+        if not solved:
+            yield json.dumps({"event": "unsolvable", "step": solver.steps}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/cache", response_model=CacheStats)
+async def cache_stats():
+    return CacheStats(**solution_cache.stats())
+
+@router.post("/count", response_model=CountResponse)
+def count_solutions(
+    request: CountRequest, deadline_ms: Optional[int] = DeadlineHeader, profile: ProfileMode = ProfileQuery
+):
+    if not SudokuValidator.is_valid_board(request.board):
+        raise HTTPException(status_code=400, detail="Puzzle is invalid")
+
+    solver = BacktrackingSolver() if request.algorithm == "backtracking" else DLXSolver()
+    with request_profiler.profile(f"count-{request.algorithm}", mode=profile) as capture:
+        count = solver.count_solutions(request.board, limit=request.limit, limits=_limits(deadline_ms))
+    if request.algorithm == "backtracking":
+        algorithm, steps = "Backtracking", solver.steps
+    else:
+        algorithm, steps = "DLX", solver.nodes_visited
+
+    return CountResponse(
+        count=count,
+        limit=request.limit,
+        unique=count == 1,
+        exhaustive=count < request.limit,
+        algorithm=algorithm,
+        execution_time=solver.solve_time,
+        steps=steps,
+        backtracks=solver.backtracks,
+        profile=_profile_path(capture),
+    )
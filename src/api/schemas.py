@@ -1,8 +1,35 @@
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator
+from src.solver.board import Board
+from src.solver.validator import SUPPORTED_SIZES
 
 class SudokuBoard(BaseModel):
-    board: List[List[int]] = Field(..., description="9x9 Sudoku board where 0 represents empty cells")
+    board: List[List[int]] = Field(
+        ...,
+        description=(
+            "N×N Sudoku board (N = 4, 9, 16 or 25) where 0 represents empty cells, "
+            "or the same board as an N²-character string (\"53..7....\")"
+        ),
+    )
+
+    @field_validator("board", mode="before")
+    @classmethod
+    def parse_string(cls, board: Any) -> Any:
+        if isinstance(board, (str, Board)):
+            return Board.coerce(board).to_rows()
+        return board
+
+    @field_validator("board")
+    @classmethod
+    def check_dimensions(cls, board: List[List[int]]) -> List[List[int]]:
+        n = len(board)
+        if n not in SUPPORTED_SIZES:
+            raise ValueError(f"board must have {', '.join(map(str, SUPPORTED_SIZES))} rows, got {n}")
+        if any(len(row) != n for row in board):
+            raise ValueError(f"board must be square ({n}×{n})")
+        if any(not 0 <= v <= n for row in board for v in row):
+            raise ValueError(f"cell values must be between 0 and {n}")
+        return board
 
     model_config = {
         "json_schema_extra": {
@@ -22,16 +49,73 @@ class SudokuBoard(BaseModel):
         }
     }
 
+class CountRequest(SudokuBoard):
+    limit: int = Field(2, ge=1, le=1000, description="Stop counting once this many solutions are found")
+    algorithm: Literal["dlx", "backtracking"] = "dlx"
+
+class StreamRequest(SudokuBoard):
+    engine: Literal["bitmask", "classic"] = "bitmask"
+
+class SearchTreeStats(BaseModel):
+    nodes: int
+    max_depth: int
+    branching_factor: float = Field(..., description="Mean number of options at the nodes that branched")
+    nodes_by_depth: List[int]
+    choice_sizes: Dict[int, int] = Field(..., description="Options at a branching node -> how many nodes had that many")
+    dead_ends_by_depth: List[int]
+    dead_end_reasons: Dict[str, int] = Field(..., description="cell, row, column, box or propagation")
+
 class SolveResponse(BaseModel):
     solved_board: Optional[List[List[int]]] = None
     success: bool
     algorithm: str
+    ordering: Optional[str] = Field(None, description="Variable/value ordering strategies (backtracking only)")
     execution_time: float
+    cpu_time: float = 0.0
     memory_usage_mb: float
+    steps: int = Field(..., description=(
+        "Search effort: placements tried by backtracking, or DLX search nodes entered "
+        "(at least search_cells + 1). Clues and propagated cells are not searched "
+        "and not counted"
+    ))
+    backtracks: int
+    propagated_cells: int = 0
+    search_cells: int = 0
+    winner: Optional[str] = Field(None, description="Engine that answered first (portfolio only)")
+    cached: bool = Field(False, description="Answered from the solution cache or store (no search statistics)")
+    search_stats: Optional[SearchTreeStats] = Field(None, description="Search-tree statistics (?instrument=true only)")
+    profile: Optional[str] = Field(None, description="Profile file written for this request, if it was profiled")
+    message: str
+
+class CountResponse(BaseModel):
+    count: int
+    limit: int
+    unique: bool
+    exhaustive: bool = Field(..., description="True if the whole search space was explored (count < limit)")
+    algorithm: str
+    execution_time: float
+    steps: int
+    backtracks: int
+    profile: Optional[str] = Field(None, description="Profile file written for this request, if it was profiled")
+
+class BudgetExceededResponse(BaseModel):
+    reason: Literal["steps", "deadline", "cancelled"]
+    algorithm: str
     steps: int
     backtracks: int
+    execution_time: float
     message: str
 
+class CacheStats(BaseModel):
+    entries: int
+    bytes_used: int
+    max_bytes: int
+    hits: int
+    exact_hits: int
+    canonical_hits: int
+    misses: int
+    evictions: int
+
 class HealthCheck(BaseModel):
     status: str
     version: str
@@ -0,0 +1,307 @@
+"""
+cli.py
+======
+Multi-engine benchmarking CLI:
+
+    python -m src.bench                                  # all engines, default corpora
+    python -m src.bench --engine dlx --engine dlx-array --corpus 9x9-hard
+    python -m src.bench --puzzles hard.txt --trials 10 --json out.json --csv out.csv
+    python -m src.bench --list
+
+Engines come from the suite registry (`src.bench.suite.ENGINES`), and
+generated corpora from `CORPORA`. The built-in "samples" corpus holds the
+four classic 9×9 puzzles. Puzzle files may hold one puzzle per line, as a
+string of N² characters, a CSV line (first field) or a JSON object with a
+"puzzle" or "board" key. A file may also be a single JSON document, either
+{"board": rows} or a list of boards.
+
+Each trial solves the whole corpus once in a fresh subprocess, so no trial
+benefits from warm caches (the DLX matrix pool, memoised templates) or
+allocator state left behind by earlier ones (pass --no-isolate to run
+in-process). Throughput and mean
+latency are reported with 95% confidence intervals across trials, and
+p50/p95 latency over all solves. --memory adds a tracemalloc pass per trial.
+"""
+
+import argparse
+import csv
+import json
+import math
+import multiprocessing as mp
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from src.bench.suite import CORPORA, ENGINES, machine_fingerprint
+from src.solver.benchmarker import summarize
+from src.solver.board import Board
+from src.solver.limits import SolveLimits
+from src.logging_config import logger
+
+Puzzle = List[List[int]]
+
+SAMPLES: Dict[str, Puzzle] = {
+    "easy": [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0], [6, 0, 0, 1, 9, 5, 0, 0, 0], [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3], [4, 0, 0, 8, 0, 3, 0, 0, 1], [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0], [0, 0, 0, 4, 1, 9, 0, 0, 5], [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ],
+    "medium": [
+        [0, 0, 0, 2, 6, 0, 7, 0, 1], [6, 8, 0, 0, 7, 0, 0, 9, 0], [1, 9, 0, 0, 0, 4, 5, 0, 0],
+        [8, 2, 0, 1, 0, 0, 0, 4, 0], [0, 0, 4, 6, 0, 2, 9, 0, 0], [0, 5, 0, 0, 0, 3, 0, 2, 8],
+        [0, 0, 9, 3, 0, 0, 0, 7, 4], [0, 4, 0, 0, 5, 0, 0, 3, 6], [7, 0, 3, 0, 1, 8, 0, 0, 0],
+    ],
+    "hard": [
+        [0, 0, 0, 6, 0, 0, 4, 0, 0], [7, 0, 0, 0, 0, 3, 6, 0, 0], [0, 0, 0, 0, 9, 1, 0, 8, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 5, 0, 1, 8, 0, 0, 0, 3], [0, 0, 0, 3, 0, 6, 0, 4, 5],
+        [0, 4, 0, 2, 0, 0, 0, 6, 0], [9, 0, 3, 0, 0, 0, 0, 0, 0], [0, 2, 0, 0, 0, 0, 1, 0, 0],
+    ],
+    "expert (Arto Inkala)": [
+        [8, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 3, 6, 0, 0, 0, 0, 0], [0, 7, 0, 0, 9, 0, 2, 0, 0],
+        [0, 5, 0, 0, 0, 7, 0, 0, 0], [0, 0, 0, 0, 4, 5, 7, 0, 0], [0, 0, 0, 1, 0, 0, 0, 3, 0],
+        [0, 0, 1, 0, 0, 0, 0, 6, 8], [0, 0, 8, 5, 0, 0, 0, 1, 0], [0, 9, 0, 0, 0, 0, 4, 0, 0],
+    ],
+}
+
+DEFAULT_CORPORA = ["samples", "9x9-easy", "9x9-medium", "9x9-hard"]
+
+# Two-sided 95% Student t critical values by degrees of freedom (normal beyond 30)
+_T95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+CSV_FIELDS = [
+    "engine", "ordering", "corpus", "puzzles", "trials", "solved", "steps", "backtracks",
+    "mean_ms", "mean_ms_ci95", "p50_ms", "p95_ms", "throughput", "throughput_ci95", "peak_mb",
+]
+
+
+# ---------------------------------------------------------------------------
+# Puzzle sources
+# ---------------------------------------------------------------------------
+
+def load_puzzles(path: str) -> List[Puzzle]:
+    """Boards from a puzzle file (see the module docstring for the formats)."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+        boards = data if isinstance(data, list) else [data]
+    except ValueError:
+        boards = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            boards.append(json.loads(line) if line.startswith("{") else line.split(",")[0])
+
+    puzzles = []
+    for number, item in enumerate(boards, 1):
+        if isinstance(item, dict):
+            item = item.get("puzzle", item.get("board"))
+        try:
+            puzzles.append(Board.coerce(item).to_rows())
+        except (ValueError, TypeError) as exc:
+            if number > 1:
+                logger.warning(f"{path}:{number}: skipped ({exc})")   # a bad first line is a header
+    if not puzzles:
+        raise ValueError(f"{path}: no puzzles found")
+    return puzzles
+
+
+def corpus_puzzles(name: str) -> List[Puzzle]:
+    if name == "samples":
+        return list(SAMPLES.values())
+    if name not in CORPORA:
+        raise ValueError(f"Unknown corpus {name!r} (expected 'samples' or one of {sorted(CORPORA)})")
+    return CORPORA[name].puzzles()
+
+
+# ---------------------------------------------------------------------------
+# Trials
+# ---------------------------------------------------------------------------
+
+def _quiet_worker(log_level: str):
+    """Subprocess initializer: a log line per solve would distort the timings."""
+    logger.remove()
+    logger.add(sys.stderr, level=log_level)
+
+
+def run_trial(engine: str, puzzles: List[Puzzle], memory: bool = False) -> Dict:
+    """Solve every puzzle once with a fresh solver; per-solve latencies and totals."""
+    factory = ENGINES[engine].factory
+    latencies, steps, backtracks, solved = [], 0, 0, 0
+    for puzzle in puzzles:
+        solver = factory()
+        start = time.perf_counter()
+        result = solver.solve(puzzle, SolveLimits())
+        latencies.append(time.perf_counter() - start)
+        solved += result is not None
+        steps += solver.nodes_visited if hasattr(solver, "nodes_visited") else solver.steps
+        backtracks += solver.backtracks
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            for puzzle in puzzles:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                factory().solve(puzzle, SolveLimits())
+                peak = max(peak or 0.0, (tracemalloc.get_traced_memory()[1] - base) / (1024 * 1024))
+        finally:
+            tracemalloc.stop()
+    return {
+        "latencies": latencies, "steps": steps, "backtracks": backtracks, "solved": solved, "peak_mb": peak,
+        "ordering": getattr(solver, "ordering", None),   # backtracking engines only
+    }
+
+
+def run_trials(
+    engine: str,
+    puzzles: List[Puzzle],
+    trials: int = 5,
+    isolate: bool = True,
+    memory: bool = False,
+    log_level: str = "WARNING",
+) -> List[Dict]:
+    if not isolate:
+        return [run_trial(engine, puzzles, memory) for _ in range(trials)]
+    context = mp.get_context("spawn")   # a fresh interpreter per trial, even where fork is the default
+    results = []
+    for _ in range(trials):
+        with ProcessPoolExecutor(1, mp_context=context, initializer=_quiet_worker, initargs=(log_level,)) as pool:
+            results.append(pool.submit(run_trial, engine, puzzles, memory).result())
+    return results
+
+
+def ci95(samples: Sequence[float]) -> float:
+    """Half-width of the 95% confidence interval of the mean (0 for one sample)."""
+    if len(samples) < 2:
+        return 0.0
+    df = len(samples) - 1
+    t = _T95[df - 1] if df <= len(_T95) else 1.96
+    return t * statistics.stdev(samples) / math.sqrt(len(samples))
+
+
+def summarize_trials(engine: str, corpus: str, trials: List[Dict]) -> Dict:
+    means = [statistics.fmean(t["latencies"]) * 1000 for t in trials]
+    rates = [len(t["latencies"]) / sum(t["latencies"]) for t in trials]
+    pooled = summarize([x for t in trials for x in t["latencies"]])
+    peaks = [t["peak_mb"] for t in trials if t["peak_mb"] is not None]
+    return {
+        "engine": engine,
+        "ordering": trials[0]["ordering"],
+        "corpus": corpus,
+        "puzzles": len(trials[0]["latencies"]),
+        "trials": len(trials),
+        "solved": min(t["solved"] for t in trials),
+        "steps": trials[0]["steps"],
+        "backtracks": trials[0]["backtracks"],
+        "mean_ms": statistics.fmean(means),
+        "mean_ms_ci95": ci95(means),
+        "p50_ms": pooled["median"] * 1000,
+        "p95_ms": pooled["p95"] * 1000,
+        "throughput": statistics.fmean(rates),
+        "throughput_ci95": ci95(rates),
+        "peak_mb": max(peaks) if peaks else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def print_table(rows: List[Dict]):
+    corpus = None
+    for row in rows:
+        if row["corpus"] != corpus:
+            corpus = row["corpus"]
+            print(f"\n{corpus} ({row['puzzles']} puzzles, {row['trials']} trials)")
+            print(f"  {'Engine':<24} {'Ordering':<22} {'Mean ms':>18} {'p50 ms':>9} {'p95 ms':>9} "
+                  f"{'Puzzles/s':>20} {'Steps':>9}")
+            print(f"  {'─' * 117}")
+        mean = f"{row['mean_ms']:.3f} ± {row['mean_ms_ci95']:.3f}"
+        rate = f"{row['throughput']:.1f} ± {row['throughput_ci95']:.1f}"
+        solved = "" if row["solved"] == row["puzzles"] else f"  ({row['solved']}/{row['puzzles']} solved)"
+        print(f"  {row['engine']:<24} {row['ordering'] or '-':<22} {mean:>18} {row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} "
+              f"{rate:>20} {row['steps']:>9}{solved}")
+    print("\n  ± = 95% confidence interval over trials")
+
+
+def write_json(path: str, rows: List[Dict], args: argparse.Namespace):
+    data = {
+        "machine": machine_fingerprint(),
+        "trials": args.trials,
+        "isolated": not args.no_isolate,
+        "results": rows,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def write_csv(path: str, rows: List[Dict]):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.bench", description="Benchmark the Sudoku solver engines")
+    parser.add_argument("--engine", action="append", choices=sorted(ENGINES),
+                        help="engine to run (repeatable; default: all)")
+    parser.add_argument("--corpus", action="append",
+                        help=f"generated corpus or 'samples' (repeatable; default: {', '.join(DEFAULT_CORPORA)})")
+    parser.add_argument("--puzzles", action="append", default=[], metavar="FILE", help="puzzle file (repeatable)")
+    parser.add_argument("--trials", type=int, default=5, help="independent runs per engine and corpus")
+    parser.add_argument("--no-isolate", action="store_true", help="run trials in this process")
+    parser.add_argument("--memory", action="store_true", help="also measure peak allocation with tracemalloc")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--csv", metavar="PATH", help="write results as CSV")
+    parser.add_argument("--list", action="store_true", help="list engines and corpora and exit")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> List[Dict]:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.list:
+        print("Engines:  " + ", ".join(ENGINES))
+        print("Corpora:  samples, " + ", ".join(CORPORA))
+        return []
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+
+    sources: Dict[str, List[Puzzle]] = {}
+    try:
+        for name in args.corpus or ([] if args.puzzles else DEFAULT_CORPORA):
+            sources[name] = corpus_puzzles(name)
+        for path in args.puzzles:
+            sources[os.path.basename(path)] = load_puzzles(path)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+    rows = []
+    for corpus, puzzles in sources.items():
+        box = max(Board.from_rows(p).box for p in puzzles)
+        for engine in args.engine or list(ENGINES):
+            if box > ENGINES[engine].max_box:
+                continue   # the engine does not scale to this size
+            trials = run_trials(engine, puzzles, args.trials, not args.no_isolate, args.memory)
+            rows.append(summarize_trials(engine, corpus, trials))
+
+    print_table(rows)
+    if args.json:
+        write_json(args.json, rows, args)
+    if args.csv:
+        write_csv(args.csv, rows)
+    return rows
@@ -0,0 +1,246 @@
+"""
+suite.py
+========
+Performance regression suite: fixed, seeded corpora run through every
+solver engine, with results compared against a stored JSON baseline.
+
+A corpus is a difficulty tier (`CORPORA`): a box size, the fraction of
+cells blanked and a number of puzzles generated with fixed seeds, so every
+run solves exactly the same boards. The 9×9 tiers come from
+SudokuGenerator, whose puzzles have one solution and are only as
+constrained as the difficulty allows; blanking random cells of a solved
+grid leaves many solutions and is easy at any ratio, so only the other
+sizes are built that way. For each (engine, corpus) pair the suite
+records:
+
+  - steps, backtracks  total search effort over the corpus (deterministic)
+  - p50_ms, p95_ms     per-puzzle latency percentiles (best of REPEAT solves)
+  - throughput         puzzles solved per second
+
+`compare()` flags a regression when a metric is worse than the baseline by
+more than its tolerance (a fraction, 0.25 = 25%): `tolerance` for the
+search counters and the looser `timing_tolerance` for timings. Search
+counters are exact and portable between machines, so they are always
+checked. Timings are only checked when asked for (`check_timing`,
+`pytest --perf --perf-timing`): they only mean something on the machine
+that recorded the baseline (its `machine` fingerprint: host, CPU model,
+core count and Python), and even there sub-millisecond latencies move by
+more than any useful tolerance between runs.
+
+Run it with `pytest --perf` (see tests/test_performance.py).
+"""
+
+import gc
+import json
+import os
+import platform
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, NamedTuple, Optional
+from src.solver.array_dlx_solver import ArrayDLXSolver
+from src.solver.backtracking_solver import BacktrackingSolver
+from src.solver.benchmarker import summarize
+from src.solver.dlx_solver import DLXSolver
+from src.solver.limits import SolveLimits
+from src.utils.generator import SudokuGenerator, generate_sized_puzzle
+
+DEFAULT_TOLERANCE = 0.25          # search counters
+DEFAULT_TIMING_TOLERANCE = 0.5    # latency/throughput: wall-clock timings are noisy
+REPEAT = 3            # solves per puzzle; the fastest one counts
+FORMAT_VERSION = 1
+
+
+class Corpus(NamedTuple):
+    box: int
+    empty_ratio: float
+    count: int
+    seed: int = 0
+    difficulty: Optional[str] = None   # 9×9 only: unique puzzles from SudokuGenerator
+
+    def puzzles(self) -> List[List[List[int]]]:
+        if self.difficulty is not None:
+            generator = SudokuGenerator(self.difficulty, seed=self.seed)
+            return [generator.generate_puzzle() for _ in range(self.count)]
+        return [generate_sized_puzzle(self.box, self.empty_ratio, seed=self.seed + i) for i in range(self.count)]
+
+
+CORPORA: Dict[str, Corpus] = {
+    "4x4":         Corpus(box=2, empty_ratio=0.6, count=50),
+    "9x9-easy":    Corpus(box=3, empty_ratio=0.4, count=20, difficulty="easy"),
+    "9x9-medium":  Corpus(box=3, empty_ratio=0.5, count=20, difficulty="medium"),
+    "9x9-hard":    Corpus(box=3, empty_ratio=0.6, count=20, difficulty="hard"),
+    "16x16":       Corpus(box=4, empty_ratio=0.5, count=5),
+    "25x25":       Corpus(box=5, empty_ratio=0.5, count=2),
+}
+
+
+class Engine(NamedTuple):
+    factory: Callable
+    max_box: int      # larger corpora are skipped (the engine does not scale to them)
+
+
+ENGINES: Dict[str, Engine] = {
+    "backtracking-classic": Engine(lambda: BacktrackingSolver(engine="classic", propagation="off"), 3),
+    "backtracking-bitmask": Engine(lambda: BacktrackingSolver("bitmask", variable_order="mrv", value_order="ascending"), 4),
+    "backtracking-nodes":   Engine(lambda: BacktrackingSolver(engine="bitmask", propagation="nodes"), 5),
+    # Ordering strategies (ordering.py) on the bitmask engine
+    "backtracking-mrv-degree": Engine(lambda: BacktrackingSolver("bitmask", variable_order="mrv-degree"), 4),
+    "backtracking-lcv":        Engine(lambda: BacktrackingSolver("bitmask", value_order="lcv"), 4),
+    "backtracking-random":     Engine(lambda: BacktrackingSolver("bitmask", value_order="random", seed=0), 4),
+    "dlx":                  Engine(DLXSolver, 5),
+    "dlx-array":            Engine(ArrayDLXSolver, 5),
+}
+
+
+@dataclass
+class RunResult:
+    engine: str
+    corpus: str
+    puzzles: int
+    solved: int
+    steps: int
+    backtracks: int
+    p50_ms: float
+    p95_ms: float
+    throughput: float     # puzzles per second
+
+    @property
+    def key(self) -> str:
+        return f"{self.engine}/{self.corpus}"
+
+
+def machine_fingerprint() -> str:
+    return (
+        f"{platform.node()}|{platform.machine()}|{_cpu_model()}|{os.cpu_count() or 1} cores|"
+        f"{platform.python_implementation()} {platform.python_version()}"
+    )
+
+
+def _cpu_model() -> str:
+    # platform.processor() is empty on most Linux systems
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or "unknown"
+
+
+def run_engine(engine: str, corpus: str, puzzles: Optional[List] = None, repeat: int = REPEAT) -> RunResult:
+    """
+    Solve a corpus with one engine, after one untimed warm-up solve. Each
+    puzzle's latency is the best of `repeat` solves, which filters out
+    scheduler and GC noise.
+    """
+    factory = ENGINES[engine].factory
+    puzzles = puzzles if puzzles is not None else CORPORA[corpus].puzzles()
+    factory().solve(puzzles[0], SolveLimits())
+
+    latencies, steps, backtracks, solved = [], 0, 0, 0
+    gc.collect()
+    for puzzle in puzzles:
+        best = float("inf")
+        for _ in range(repeat):
+            solver = factory()
+            start = time.perf_counter()
+            result = solver.solve(puzzle, SolveLimits())   # unbounded: the corpus must finish
+            best = min(best, time.perf_counter() - start)
+        latencies.append(best)
+        solved += result is not None
+        steps += solver.nodes_visited if hasattr(solver, "nodes_visited") else solver.steps
+        backtracks += solver.backtracks
+
+    stats = summarize(latencies)
+    return RunResult(
+        engine=engine,
+        corpus=corpus,
+        puzzles=len(puzzles),
+        solved=solved,
+        steps=steps,
+        backtracks=backtracks,
+        p50_ms=stats["median"] * 1000,
+        p95_ms=stats["p95"] * 1000,
+        throughput=len(puzzles) / sum(latencies),
+    )
+
+
+def run_suite(
+    engines: Optional[List[str]] = None, corpora: Optional[List[str]] = None, repeat: int = REPEAT
+) -> List[RunResult]:
+    """Every (engine, corpus) pair the engine can handle."""
+    results = []
+    for corpus in corpora or list(CORPORA):
+        puzzles = CORPORA[corpus].puzzles()
+        for engine in engines or list(ENGINES):
+            if CORPORA[corpus].box <= ENGINES[engine].max_box:
+                results.append(run_engine(engine, corpus, puzzles, repeat))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+
+def save_baseline(path: str, results: List[RunResult]):
+    data = {
+        "version": FORMAT_VERSION,
+        "machine": machine_fingerprint(),
+        "results": {r.key: asdict(r) for r in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported baseline version {data.get('version')}")
+    return data
+
+
+def compare(
+    baseline: Dict,
+    results: List[RunResult],
+    tolerance: float = DEFAULT_TOLERANCE,
+    timing_tolerance: float = DEFAULT_TIMING_TOLERANCE,
+    check_timing: bool = False,
+) -> List[str]:
+    """
+    Regressions of `results` against `baseline`, as readable messages (empty
+    if none). Only the deterministic counters are compared unless
+    `check_timing` is set. Pairs missing from the baseline are not checked.
+    """
+    regressions = []
+    for result in results:
+        old = baseline["results"].get(result.key)
+        if old is None:
+            continue
+        if result.solved < old["solved"]:
+            regressions.append(f"{result.key}: solved {result.solved}/{result.puzzles}, baseline {old['solved']}")
+        # Lower is better for these; throughput is checked as mean time per puzzle
+        metrics = [("steps", tolerance), ("backtracks", tolerance)]
+        if check_timing:
+            metrics += [("p50_ms", timing_tolerance), ("p95_ms", timing_tolerance)]
+        for metric, allowed in metrics:
+            now, before = getattr(result, metric), old[metric]
+            if now > before * (1 + allowed) and now - before > _NOISE_FLOOR[metric]:
+                regressions.append(f"{result.key}: {metric} {now:.6g} vs baseline {before:.6g} (+{_change(now, before)})")
+        if check_timing:
+            now, before = 1000 / result.throughput, 1000 / old["throughput"]   # mean ms per puzzle
+            if now > before * (1 + timing_tolerance) and now - before > _NOISE_FLOOR["p50_ms"]:
+                regressions.append(
+                    f"{result.key}: throughput {result.throughput:.1f}/s vs baseline {old['throughput']:.1f}/s"
+                )
+    return regressions
+
+
+# Absolute changes below these never count (sub-millisecond timing changes are jitter)
+_NOISE_FLOOR = {"p50_ms": 1.0, "p95_ms": 1.0, "steps": 0, "backtracks": 0}
+
+
+def _change(now: float, before: float) -> str:
+    return f"{(now / before - 1) * 100:.0f}%" if before else "new"
@@ -12,6 +12,22 @@ class Settings(BaseSettings):
     
     # Solver Settings
     MAX_STEPS: int = 100000
+    BACKTRACKING_ENGINE: str = "bitmask"  # or "classic"
+    PROPAGATION_MODE: str = "prepass"     # "off", "prepass" or "nodes"
+    VARIABLE_ORDERING: str = "mrv"        # bitmask engine: "first-empty", "mrv" or "mrv-degree"
+    VALUE_ORDERING: str = "ascending"     # bitmask engine: "ascending", "lcv" or "random"
+    ORDERING_SEED: int = 0                # seed of the "random" value ordering
+    SOLUTION_CACHE_MAX_MB: float = 64.0   # solution cache for the API (0 = off)
+    SOLUTION_CACHE_CANONICAL: bool = False  # also match isomorphic puzzles (costs several 9x9 solves per miss)
+    SOLUTION_STORE_PATH: str = ""         # SQLite solution store for the API ("" = off)
+    SOLUTION_STORE_BATCH: int = 500       # entries per store commit
+    BENCHMARK_TRACE_MEMORY: bool = False  # tracemalloc peaks per solve (slows allocation-heavy solves)
+
+    # Profiling
+    PROFILE_DIR: str = "profiles"         # .pstats / .folded files, one per profiled request
+    PROFILE_MODE: str = "sampling"        # mode for sampled requests: "cprofile" or "sampling"
+    PROFILE_SAMPLE_EVERY: int = 0         # profile every Nth solve request (0 = only on ?profile=)
+    PROFILE_INTERVAL_MS: float = 5.0      # stack sampling interval
     
     # Logging
     LOG_LEVEL: str = "INFO"
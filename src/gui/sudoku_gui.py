@@ -7,7 +7,7 @@ from src.utils.constants import *
 from src.utils.helpers import *
 from src.utils.generator import generate_new_puzzle
 from src.solver.backtracking_solver import BacktrackingSolver, VisualSolver
-from src.solver.validator import SudokuValidator
+from src.solver.incremental import IncrementalBoard
 from src.logging_config import logger
 from src.config import settings
 
@@ -55,6 +55,15 @@ class SudokuGUI:
         self.ui_padding = 10
         self.btn_row_y = 530
 
+    @property
+    def grid(self):
+        """The play grid; moves go through `self.play` so checks stay O(1)."""
+        return self.play.grid
+
+    @grid.setter
+    def grid(self, rows):
+        self.play = IncrementalBoard(rows)
+
     def _setup_fonts(self):
         """Initializes fonts with fallbacks."""
         # Main grid numbers
@@ -371,7 +380,7 @@ class SudokuGUI:
         self.cell_state.clear()
         
         # Run visual solve
-        success = self.solver.run_solve(self.grid)
+        success = self.solver.run_solve(self.play)
         
         if success:
             self.message = "Puzzle Solved!"
@@ -383,6 +392,16 @@ class SudokuGUI:
         self.visualizing = False
         self.current_pos = None
 
+    def solve_custom(self):
+        try:
+            self.grid = [r[:] for r in self.custom_grid]
+        except ValueError:
+            self.message = "Fix the highlighted conflicts first!"
+            self.message_color = Colors.ERROR
+            return
+        self.start_grid = [r[:] for r in self.custom_grid]
+        self.mode = 'play'; self.start_solve()
+
     def update_display(self):
         if self.visualizing:
             self.solver.solve_time = _time.perf_counter() - self.solver.start_time
@@ -442,8 +461,8 @@ class SudokuGUI:
                         elif pygame.K_1 <= event.key <= pygame.K_9:
                             if self.flag_box and self.start_grid[self.row][self.col] == 0:
                                 val = event.key - pygame.K_0
-                                if SudokuValidator.is_safe_move(self.grid, self.row, self.col, val):
-                                    self.grid[self.row][self.col] = val
+                                if self.play.can_place(self.row, self.col, val):
+                                    self.play.place(self.row, self.col, val)
                                     # Provide specific feedback against the solution
                                     if self.solution_grid and self.solution_grid[self.row][self.col] == val:
                                         self.message = "Correct Number!"; self.message_color = Colors.SUCCESS
@@ -453,7 +472,7 @@ class SudokuGUI:
                                     self.message = "Invalid Move!"; self.message_color = Colors.ERROR
                         elif event.key in (pygame.K_BACKSPACE, pygame.K_0, pygame.K_DELETE):
                             if self.flag_box and self.start_grid[self.row][self.col] == 0:
-                                self.grid[self.row][self.col] = 0
+                                self.play.clear(self.row, self.col)
 
             elif self.mode == 'custom_input':
                 self.draw_custom_input_ui()
@@ -467,9 +486,7 @@ class SudokuGUI:
                         else:
                             # Custom Button Click Handling
                             if self.buttons.get("c_solve") and self.buttons["c_solve"].collidepoint(pos):
-                                self.grid = [r[:] for r in self.custom_grid]
-                                self.start_grid = [r[:] for r in self.custom_grid]
-                                self.mode = 'play'; self.start_solve()
+                                self.solve_custom()
                             elif self.buttons.get("c_clear") and self.buttons["c_clear"].collidepoint(pos):
                                 self.custom_grid = [[0]*9 for _ in range(9)]
                             elif self.buttons.get("c_import") and self.buttons["c_import"].collidepoint(pos):
@@ -490,9 +507,7 @@ class SudokuGUI:
                         elif event.key == pygame.K_LEFT: self.custom_col = (self.custom_col - 1) % 9
                         elif event.key == pygame.K_RIGHT: self.custom_col = (self.custom_col + 1) % 9
                         elif event.key == pygame.K_s:
-                            self.grid = [r[:] for r in self.custom_grid]
-                            self.start_grid = [r[:] for r in self.custom_grid]
-                            self.mode = 'play'; self.start_solve()
+                            self.solve_custom()
                         elif event.key == pygame.K_c: self.custom_grid = [[0]*9 for _ in range(9)]
                         elif event.key == pygame.K_i: self.import_puzzle()
                         elif event.key == pygame.K_o:
@@ -0,0 +1,362 @@
+"""
+array_dlx_solver.py
+===================
+Dancing Links with the matrix stored in flat integer arrays instead of
+per-node Python objects.
+
+Node 0 is the root, nodes 1..COLS are the column headers and every
+candidate row adds four nodes after that. For node i:
+
+  L[i], R[i], U[i], D[i]  – neighbour node indices
+  C[i]                    – column header index
+  ROW[i]                  – candidate row id, (r * N + c) * N + (d - 1)
+
+and S[c] is the number of live nodes in column c. The full empty-grid
+matrix (all N³ rows) is built once per box size by template_for() – the
+9×9 one at import; each solver takes a private copy of it (a handful of
+slice copies) the first time it sees that size, covers the clue rows per
+solve and uncovers them afterwards, so nothing is rebuilt or reallocated
+between solves.
+
+The search is DLXSolver's, except that the column scan stops at the first
+column of size <= 1 (nothing can beat it), so `nodes_visited` and
+`backtracks` keep their meaning but may differ slightly in value.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from src.solver.dlx_solver import DLXSolver
+
+Buffers = Tuple[List[int], ...]   # (L, R, U, D, C, ROW, S)
+
+
+def _build_template(box: int) -> Buffers:
+    """Build the full empty-grid matrix (all N³ rows) as flat lists."""
+    N = box * box
+    NN = N * N
+    COLS = 4 * NN
+    size = 1 + COLS + N * NN * 4
+    L, R, U, D, C, ROW = ([0] * size for _ in range(6))
+    S = [0] * (COLS + 1)
+
+    # Root + column headers in one circular list
+    for i in range(COLS + 1):
+        L[i] = i - 1
+        R[i] = i + 1
+        U[i] = i
+        D[i] = i
+        C[i] = i
+    L[0] = COLS
+    R[COLS] = 0
+
+    node = COLS + 1
+    row_id = 0
+    for r in range(N):
+        for c in range(N):
+            b = (r // box) * box + (c // box)
+            for d in range(1, N + 1):
+                first = node
+                for col in (
+                    1 + r * N + c,                   # cell constraint
+                    1 + NN     + r * N + (d - 1),    # row constraint
+                    1 + 2 * NN + c * N + (d - 1),    # col constraint
+                    1 + 3 * NN + b * N + (d - 1),    # box constraint
+                ):
+                    # Link into column (above column header)
+                    U[node] = U[col]
+                    D[node] = col
+                    D[U[col]] = node
+                    U[col] = node
+                    S[col] += 1
+                    C[node] = col
+                    ROW[node] = row_id
+
+                    L[node] = node - 1
+                    R[node] = node + 1
+                    node += 1
+
+                # Close the row into a circle
+                L[first] = node - 1
+                R[node - 1] = first
+                row_id += 1
+
+    return L, R, U, D, C, ROW, S
+
+
+_TEMPLATES: Dict[int, Buffers] = {}
+
+
+def template_for(box: int) -> Buffers:
+    """The shared, read-only template for a box size (built on first use)."""
+    template = _TEMPLATES.get(box)
+    if template is None:
+        template = _TEMPLATES.setdefault(box, _build_template(box))
+    return template
+
+
+class ArrayDLXSolver(DLXSolver):
+    """DLXSolver with the exact-cover matrix held in flat integer lists."""
+
+    ALGORITHM = "DLX (array)"
+
+    def __init__(self, propagation=None, instrument=False):
+        super().__init__(propagation, instrument)
+        # Private working copies of the shared templates, per box size
+        self._buffers: Dict[int, Buffers] = {}
+        self._use_buffers(3)
+
+    def _use_buffers(self, box: int):
+        buffers = self._buffers.get(box)
+        if buffers is None:
+            buffers = self._buffers[box] = tuple(buf[:] for buf in template_for(box))
+        self._L, self._R, self._U, self._D, self._C, self._ROW, self._S = buffers
+
+    # -----------------------------------------------------------------------
+    # Matrix handling
+    # -----------------------------------------------------------------------
+
+    def _row_node(self, r: int, c: int, d: int) -> int:
+        return self.COLS + 1 + ((r * self.N + c) * self.N + (d - 1)) * 4
+
+    def _attach(self):
+        self._use_buffers(self.box)
+        R, C = self._R, self._C
+        givens: List[int] = []
+        for r in range(self.N):
+            for c in range(self.N):
+                d = self._board[r][c]
+                if d:
+                    node = self._row_node(r, c, d)
+                    self._cover(C[node])
+                    j = R[node]
+                    while j != node:
+                        self._cover(C[j])
+                        j = R[j]
+                    givens.append(node)
+        self._givens = givens
+        self._stack = []
+        self._attached = True
+
+    def _detach(self):
+        L, C = self._L, self._C
+        for node in reversed(self._givens):
+            j = L[node]
+            while j != node:
+                self._uncover(C[j])
+                j = L[j]
+            self._uncover(C[node])
+        self._givens = []
+        self._attached = False
+
+    def _frames(self) -> List[List[int]]:
+        ROW = self._ROW
+        return [[col - 1, ROW[row]] for col, row in self._stack]
+
+    def _push_frame(self, col_index: int, row_id: int):
+        R, D, C, ROW = self._R, self._D, self._C, self._ROW
+        col = col_index + 1
+        self._cover(col)
+        row = D[col]
+        while ROW[row] != row_id:
+            row = D[row]
+        self._stack.append([col, row])
+        j = R[row]
+        while j != row:
+            self._cover(C[j])
+            j = R[j]
+
+    def _unwind(self):
+        L, C = self._L, self._C
+        while self._stack:
+            col, row = self._stack.pop()
+            j = L[row]
+            while j != row:
+                self._uncover(C[j])
+                j = L[j]
+            self._uncover(col)
+
+    # -----------------------------------------------------------------------
+    # Search (same state machine as DLXSolver._search, with cover inlined)
+    # -----------------------------------------------------------------------
+
+    def _search(self, max_nodes: Optional[int] = None) -> bool:
+        L, R, U, D, C, S, ROW = self._L, self._R, self._U, self._D, self._C, self._S, self._ROW
+        stack = self._stack
+        entering = self._entering
+        stats = self.stats
+        budget = -1 if max_nodes is None else max_nodes
+
+        while True:
+            if entering:
+                if budget == 0:
+                    self._entering = True
+                    return False
+                budget -= 1
+                self.nodes_visited += 1
+                if stats is not None:
+                    stats.node(len(stack))
+
+                if R[0] == 0:
+                    self.solutions_found += 1
+                    if self.result is None:
+                        self.result = [ROW[row] for _, row in stack]
+                    if self.solutions_found >= self._limit:
+                        self._unwind()
+                        return True
+                    entering = False
+                    continue
+
+                # Choose column with minimum size (S-heuristic), inlined
+                col = -1
+                best_size = 1 << 30
+                c = R[0]
+                while c != 0:
+                    if S[c] < best_size:
+                        col, best_size = c, S[c]
+                        if best_size <= 1:
+                            break
+                    c = R[c]
+                if stats is not None:
+                    self._record_choice(stats, col - 1, best_size, len(stack))
+                if best_size == 0:
+                    self.backtracks += 1
+                    entering = False
+                    continue
+
+                self._cover(col)
+                row = D[col]
+                stack.append([col, row])
+            else:
+                if not stack:
+                    self._entering = False
+                    return True
+
+                frame = stack[-1]
+                col, row = frame
+
+                # Undo the current row (inlined _uncover, right-to-left)
+                j = L[row]
+                while j != row:
+                    cj = C[j]
+                    i = U[cj]
+                    while i != cj:
+                        k = L[i]
+                        while k != i:
+                            S[C[k]] += 1
+                            D[U[k]] = k
+                            U[D[k]] = k
+                            k = L[k]
+                        i = U[i]
+                    L[R[cj]] = cj
+                    R[L[cj]] = cj
+                    j = L[j]
+
+                row = D[row]
+                if row == col:
+                    self.backtracks += 1
+                    self._uncover(col)
+                    stack.pop()
+                    continue
+                frame[1] = row
+                entering = True
+
+            # Cover all other columns in this row (inlined _cover)
+            j = R[row]
+            while j != row:
+                cj = C[j]
+                R[L[cj]] = R[cj]
+                L[R[cj]] = L[cj]
+                i = D[cj]
+                while i != cj:
+                    k = R[i]
+                    while k != i:
+                        D[U[k]] = D[k]
+                        U[D[k]] = U[k]
+                        S[C[k]] -= 1
+                        k = R[k]
+                    i = D[i]
+                j = R[j]
+
+    def _cover(self, col: int):
+        L, R, U, D, C, S = self._L, self._R, self._U, self._D, self._C, self._S
+        R[L[col]] = R[col]
+        L[R[col]] = L[col]
+
+        i = D[col]
+        while i != col:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, col: int):
+        L, R, U, D, C, S = self._L, self._R, self._U, self._D, self._C, self._S
+        i = U[col]
+        while i != col:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+
+        L[R[col]] = col
+        R[L[col]] = col
+
+
+template_for(3)  # the 9×9 template is built eagerly at import
+
+
+# ---------------------------------------------------------------------------
+# Micro-benchmark against the object-based DLXSolver
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import time
+
+    puzzles = {
+        "Easy": [
+            [5, 3, 0, 0, 7, 0, 0, 0, 0],
+            [6, 0, 0, 1, 9, 5, 0, 0, 0],
+            [0, 9, 8, 0, 0, 0, 0, 6, 0],
+            [8, 0, 0, 0, 6, 0, 0, 0, 3],
+            [4, 0, 0, 8, 0, 3, 0, 0, 1],
+            [7, 0, 0, 0, 2, 0, 0, 0, 6],
+            [0, 6, 0, 0, 0, 0, 2, 8, 0],
+            [0, 0, 0, 4, 1, 9, 0, 0, 5],
+            [0, 0, 0, 0, 8, 0, 0, 7, 9],
+        ],
+        "Expert (Arto Inkala)": [
+            [8, 0, 0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 3, 6, 0, 0, 0, 0, 0],
+            [0, 7, 0, 0, 9, 0, 2, 0, 0],
+            [0, 5, 0, 0, 0, 7, 0, 0, 0],
+            [0, 0, 0, 0, 4, 5, 7, 0, 0],
+            [0, 0, 0, 1, 0, 0, 0, 3, 0],
+            [0, 0, 1, 0, 0, 0, 0, 6, 8],
+            [0, 0, 8, 5, 0, 0, 0, 1, 0],
+            [0, 9, 0, 0, 0, 0, 4, 0, 0],
+        ],
+    }
+    runs = 20
+
+    def _timed(solver, puzzle):
+        """Best-of-`runs` solve time in milliseconds."""
+        best = float("inf")
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            solver.solve(puzzle)
+            best = min(best, time.perf_counter() - t0)
+        return best * 1000
+
+    print(f"{'Puzzle':<24} {'DLX (ms)':>10} {'Array DLX (ms)':>15} {'Speedup':>8}")
+    for name, puzzle in puzzles.items():
+        obj, arr = DLXSolver(propagation="off"), ArrayDLXSolver(propagation="off")
+        t_obj = _timed(obj, puzzle)
+        t_arr = _timed(arr, puzzle)
+        print(f"{name:<24} {t_obj:>10.3f} {t_arr:>15.3f} {t_obj / t_arr:>7.2f}×")
+        print(f"{'  nodes visited':<24} {obj.nodes_visited:>10} {arr.nodes_visited:>15}")
+        assert obj.solve(puzzle) == arr.solve(puzzle)
@@ -1,126 +1,631 @@
+import math
+import random
 import time
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from src.solver.validator import SudokuValidator
 from src.solver.benchmarker import Benchmarker
+from src.solver.board import Board, BoardLike, as_rows
+from src.solver.limits import BudgetExceeded, SolveLimits
+from src.solver.incremental import IncrementalBoard
+from src.solver.events import SolveEvent, TRY, PLACE, BACKTRACK, SOLVED
+from src.solver.propagation import ConstraintPropagator, PROPAGATION_MODES
+from src.solver.search_stats import SearchStats
+from src.solver.ordering import VALUE_ORDERINGS, VARIABLE_ORDERINGS
+from src.config import settings
 from src.logging_config import logger
 
 class BacktrackingSolver:
     """
     Core backtracking algorithm for Sudoku solving.
     Production-ready, modular, and performant.
+
+    Works on any board size SudokuValidator accepts (4×4 up to 25×25), as
+    lists of rows or Boards; `solve()` returns the same type it was given.
+
+    Two engines are available:
+      - "classic": first empty cell in row-major order, digits 1..N checked
+        against an IncrementalBoard's occupancy masks.
+      - "bitmask": row/column/box candidate bitmasks, minimum-remaining-values
+        cell selection and O(1) place/undo.
+
+    In both engines `steps` counts digit placements attempted and
+    `backtracks` counts placements that had to be undone.
+
+    The bitmask engine's cell and digit order are pluggable (see
+    ordering.py): `variable_order` is "first-empty", "mrv" or "mrv-degree",
+    `value_order` is "ascending", "lcv" or "random" (shuffled with `seed`).
+    Defaults come from settings; MRV/ascending is the built-in fast path.
+    The classic engine is always first-empty/ascending, and propagation
+    "nodes" and `iter_solve()` always use MRV/ascending.
+
+    `propagation` selects constraint propagation (see propagation.py):
+    "off", "prepass" (reduce the board once before searching) or "nodes"
+    (prepass, plus propagation at every search node of the bitmask engine).
+
+    `count_solutions(board, limit)` always uses the bitmask engine (after
+    the propagation prepass, which never changes the solution count).
+
+    Both take optional SolveLimits (default: settings.MAX_STEPS steps) and
+    raise BudgetExceeded when a limit trips.
+
+    `iter_solve(board)` runs the same engine as a generator of SolveEvents
+    (see events.py); `solve()` does not pay for it.
+
+    With `instrument=True`, `solve()` and `count_solutions()` also fill
+    `stats` (a SearchStats: nodes per depth, candidate counts of the chosen
+    cells, dead ends). `iter_solve()` is not instrumented.
     """
-    def __init__(self):
+    ENGINES = ("classic", "bitmask")
+
+    def __init__(
+        self,
+        engine: Optional[str] = None,
+        propagation: Optional[str] = None,
+        instrument: bool = False,
+        variable_order: Optional[str] = None,
+        value_order: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        self.engine = engine or settings.BACKTRACKING_ENGINE
+        if self.engine not in self.ENGINES:
+            raise ValueError(f"Unknown backtracking engine: {self.engine}")
+        self.propagation = propagation or settings.PROPAGATION_MODE
+        if self.propagation not in PROPAGATION_MODES:
+            raise ValueError(f"Unknown propagation mode: {self.propagation}")
+        if self.engine == "classic":
+            self.variable_order = variable_order or "first-empty"
+            self.value_order = value_order or "ascending"
+            fixed = ("first-empty", "ascending")
+        else:
+            self.variable_order = variable_order or settings.VARIABLE_ORDERING
+            self.value_order = value_order or settings.VALUE_ORDERING
+            fixed = ("mrv", "ascending") if self.propagation == "nodes" else None
+        if self.variable_order not in VARIABLE_ORDERINGS:
+            raise ValueError(f"Unknown variable ordering: {self.variable_order}")
+        if self.value_order not in VALUE_ORDERINGS:
+            raise ValueError(f"Unknown value ordering: {self.value_order}")
+        if fixed and (self.variable_order, self.value_order) != fixed:
+            raise ValueError(f"Orderings are fixed to {'/'.join(fixed)} for this engine and propagation mode")
+        self.seed = settings.ORDERING_SEED if seed is None else seed
+        self._select_cell = VARIABLE_ORDERINGS[self.variable_order]
+        self._order_values = VALUE_ORDERINGS[self.value_order]
+        self._rng = random.Random(self.seed)
+        self.propagator = ConstraintPropagator()
         self.steps = 0
         self.backtracks = 0
+        self.propagated_cells = 0
+        self.search_cells = 0
+        self.solutions_found = 0
         self.solve_time: float = 0.0
         self.start_time: float = 0.0
         self.benchmarker = Benchmarker()
+        self.instrument = instrument
+        self.stats: Optional[SearchStats] = None   # filled per solve when instrumented
+        self._limit = 1
+        self._limits = SolveLimits()
+        self._next_check = self._limits.next_check(0)
+
+    @property
+    def ordering(self) -> str:
+        return f"{self.variable_order}/{self.value_order}"
 
-    def solve(self, board: List[List[int]]) -> Optional[List[List[int]]]:
+    def solve(self, board: BoardLike, limits: Optional[SolveLimits] = None) -> Optional[BoardLike]:
         """
         Solves the Sudoku board using backtracking.
         Returns the solved board or None if unsolvable.
         """
+        if isinstance(board, Board):
+            solved = self.solve(board.to_rows(), limits)
+            return None if solved is None else Board.from_rows(solved)
+
         self.steps = 0
         self.backtracks = 0
+        self.propagated_cells = 0
+        self.search_cells = 0
+        self.solutions_found = 0
         self.solve_time = 0.0
+        self.stats = SearchStats() if self.instrument else None
         
         if not SudokuValidator.is_valid_board(board):
             logger.error("Initial board state is invalid")
             return None
             
         self.benchmarker.start_benchmark()
-        
-        board_copy = [row[:] for row in board]
-        if self._backtrack(board_copy):
-            bench = self.benchmarker.end_benchmark("Backtracking", self.steps, self.backtracks)
-            self.solve_time = bench.execution_time
-            return board_copy
+        try:
+            self._set_limits(limits)
+            empty_cells = sum(row.count(0) for row in board)
+
+            if self.engine == "bitmask" and self.propagation == "nodes":
+                board_copy = self._solve_propagating(board)
+                solved = board_copy is not None
+            else:
+                board_copy = [row[:] for row in board]
+                if self.propagation != "off":
+                    board_copy = self.propagator.reduce(board_copy)
+                if board_copy is None:
+                    solved = False
+                else:
+                    self.search_cells = sum(row.count(0) for row in board_copy)
+                    if self.engine == "bitmask":
+                        solved = self._solve_bitmask(board_copy)
+                    else:
+                        state = IncrementalBoard(board_copy)
+                        solved = self._backtrack(state)
+                        board_copy = state.grid
+
+            if solved:
+                self.propagated_cells = empty_cells - self.search_cells
+                bench = self.benchmarker.end_benchmark(
+                    "Backtracking", self.steps, self.backtracks,
+                    propagated_cells=self.propagated_cells, search_cells=self.search_cells,
+                    search_stats=self._stats_dict(), ordering=self.ordering,
+                )
+                self.solve_time = bench.execution_time
+                return board_copy
             
-        logger.warning("No solution found for the provided puzzle")
-        return None
+            logger.warning("No solution found for the provided puzzle")
+            return None
+        finally:
+            self.benchmarker.stop_tracing()   # ends tracing on unsolvable/raising paths too
+
+    def count_solutions(
+        self, board: BoardLike, limit: int = 2, limits: Optional[SolveLimits] = None
+    ) -> int:
+        """
+        Count the solutions of `board`, stopping once `limit` are found
+        (limit=2 is enough to decide uniqueness). Invalid boards count 0.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        board = as_rows(board)
+        self.steps = 0
+        self.backtracks = 0
+        self.propagated_cells = 0
+        self.search_cells = 0
+        self.solutions_found = 0
+        self.solve_time = 0.0
+        self.stats = SearchStats() if self.instrument else None
+
+        if not SudokuValidator.is_valid_board(board):
+            logger.error("Initial board state is invalid")
+            return 0
+
+        self.benchmarker.start_benchmark()
+        try:
+            self._set_limits(limits)
+            board_copy = [row[:] for row in board]
+            if self.propagation != "off":
+                board_copy = self.propagator.reduce(board_copy)
+
+            if board_copy is not None:
+                self._limit = limit
+                try:
+                    self._solve_bitmask(board_copy)
+                finally:
+                    self._limit = 1
+
+            bench = self.benchmarker.end_benchmark(
+                "Backtracking count", self.steps, self.backtracks, search_stats=self._stats_dict(),
+                ordering=self.ordering if self.engine == "bitmask" else "mrv/ascending",
+            )
+            self.solve_time = bench.execution_time
+            return self.solutions_found
+        finally:
+            self.benchmarker.stop_tracing()
+
+    # -----------------------------------------------------------------------
+    # Event stream
+    # -----------------------------------------------------------------------
+
+    def iter_solve(self, board: BoardLike, limits: Optional[SolveLimits] = None) -> Iterator[SolveEvent]:
+        """
+        Search `board` with the selected engine, yielding try/place/backtrack
+        events and a final "solved" event (none if the board is unsolvable
+        or invalid). `board` itself is not modified.
+
+        No propagation is applied, so every placement shows up as an event.
+        `steps` and `backtracks` match `solve()` with propagation="off".
+        """
+        board = as_rows(board)
+        self.steps = 0
+        self.backtracks = 0
+        self.propagated_cells = 0
+        self.search_cells = 0
+        self.solve_time = 0.0
+
+        if not SudokuValidator.is_valid_board(board):
+            logger.error("Initial board state is invalid")
+            return
+
+        self.benchmarker.start_benchmark()
+        try:
+            self._set_limits(limits)
+
+            work = [row[:] for row in board]
+            n = len(work)
+            box = math.isqrt(n)
+            full = (1 << n) - 1
+            rows, cols, boxes = [0] * n, [0] * n, [0] * n
+            empties: List[Tuple[int, int, int]] = []
+            for r in range(n):
+                for c in range(n):
+                    b = (r // box) * box + c // box
+                    if work[r][c]:
+                        bit = 1 << (work[r][c] - 1)
+                        rows[r] |= bit
+                        cols[c] |= bit
+                        boxes[b] |= bit
+                    else:
+                        empties.append((r, c, b))
+            self.search_cells = len(empties)
+            mrv = self.engine == "bitmask"
+
+            # One frame per open cell on the current path: [r, c, b, untried digits, placed bit]
+            stack: List[List[int]] = []
+            descend = True
+            while True:
+                if descend:
+                    depth = len(stack)
+                    if depth == len(empties):
+                        bench = self.benchmarker.end_benchmark(
+                            "Backtracking", self.steps, self.backtracks, search_cells=self.search_cells,
+                        )
+                        self.solve_time = bench.execution_time
+                        yield SolveEvent(SOLVED, -1, -1, 0, self.steps)
+                        return
+
+                    if mrv:
+                        # Classic tries 1..N at the next empty cell; bitmask picks the MRV cell
+                        best, best_mask, best_count = -1, 0, 64
+                        for i in range(depth, len(empties)):
+                            r, c, b = empties[i]
+                            mask = full & ~(rows[r] | cols[c] | boxes[b])
+                            count = mask.bit_count()
+                            if count < best_count:
+                                best, best_mask, best_count = i, mask, count
+                                if count <= 1:
+                                    break
+                        if best_count:
+                            empties[depth], empties[best] = empties[best], empties[depth]
+                            r, c, b = empties[depth]
+                            stack.append([r, c, b, best_mask, 0])
+                        else:
+                            descend = False   # dead end: resume the parent frame
+                    else:
+                        r, c, b = empties[depth]
+                        stack.append([r, c, b, full, 0])
+
+                if not stack:
+                    logger.warning("No solution found for the provided puzzle")
+                    return
+
+                frame = stack[-1]
+                r, c, b, mask, placed = frame
+                if placed:
+                    self.backtracks += 1
+                    rows[r] ^= placed
+                    cols[c] ^= placed
+                    boxes[b] ^= placed
+                    work[r][c] = 0
+                    frame[4] = 0
+                    yield SolveEvent(BACKTRACK, r, c, placed.bit_length(), self.steps)
+
+                descend = False
+                while mask:
+                    bit = mask & -mask
+                    mask ^= bit
+                    self.steps += 1
+                    if self.steps >= self._next_check:
+                        self._check_limits()
+                    d = bit.bit_length()
+                    yield SolveEvent(TRY, r, c, d, self.steps)
+                    if (rows[r] | cols[c] | boxes[b]) & bit:
+                        continue   # only the classic engine tries occupied digits
+
+                    rows[r] |= bit
+                    cols[c] |= bit
+                    boxes[b] |= bit
+                    work[r][c] = d
+                    frame[3] = mask
+                    frame[4] = bit
+                    yield SolveEvent(PLACE, r, c, d, self.steps)
+                    descend = True
+                    break
+
+                if not descend:
+                    stack.pop()
+        finally:
+            self.benchmarker.stop_tracing()   # also runs when the consumer stops early
+
+    # -----------------------------------------------------------------------
+    # Limits
+    # -----------------------------------------------------------------------
+
+    def _set_limits(self, limits: Optional[SolveLimits]):
+        self._limits = limits or SolveLimits.from_settings()
+        self._next_check = 0
+        self._check_limits()
+
+    def _check_limits(self):
+        """Called when `steps` reaches `_next_check`; raises if a limit tripped."""
+        reason = self._limits.exceeded(self.steps)
+        if reason is None:
+            self._next_check = self._limits.next_check(self.steps)
+            return
+        if self.steps:
+            self.steps -= 1   # the pending step never ran
+        bench = self.benchmarker.end_benchmark("Backtracking (stopped)", self.steps, self.backtracks)
+        self.solve_time = bench.execution_time
+        raise BudgetExceeded(reason, "Backtracking", self.steps, self.backtracks, bench.execution_time)
+
+    def _stats_dict(self) -> Optional[Dict]:
+        return self.stats.to_dict() if self.stats is not None else None
 
-    def _backtrack(self, board: List[List[int]]) -> bool:
-        find = self._find_empty(board)
+    def _backtrack(self, state: IncrementalBoard) -> bool:
+        stats = self.stats
+        if stats is not None:
+            depth = self.search_cells - state.empty
+            stats.node(depth)
+        find = state.find_empty()
         if not find:
             return True
         else:
             row, col = find
 
-        for i in range(1, 10):
+        if stats is not None:
+            count = state.candidate_count(row, col)
+            if count:
+                stats.choice(count)
+            else:
+                stats.dead_end(depth, "cell")
+
+        for i in range(1, state.size + 1):
             self.steps += 1
-            if SudokuValidator.is_safe_move(board, row, col, i):
-                board[row][col] = i
+            if self.steps >= self._next_check:
+                self._check_limits()
+            if state.can_place(row, col, i):
+                state.place(row, col, i)
 
-                if self._backtrack(board):
+                if self._backtrack(state):
                     return True
 
                 self.backtracks += 1
-                board[row][col] = 0
+                state.undo()
 
         return False
 
-    def _find_empty(self, board: List[List[int]]) -> Optional[Tuple[int, int]]:
-        for i in range(len(board)):
-            for j in range(len(board[0])):
-                if board[i][j] == 0:
-                    return (i, j)
+    # -----------------------------------------------------------------------
+    # Bitmask / MRV engine
+    # -----------------------------------------------------------------------
+
+    def _solve_bitmask(self, board: List[List[int]]) -> bool:
+        """Initialise the occupancy masks from the board and run the MRV search."""
+        n = len(board)
+        box = math.isqrt(n)
+        self._full = (1 << n) - 1   # one bit per digit 1..n
+        self._rows = [0] * n
+        self._cols = [0] * n
+        self._boxes = [0] * n
+        empties: List[Tuple[int, int, int]] = []
+
+        for r in range(n):
+            for c in range(n):
+                b = (r // box) * box + c // box
+                d = board[r][c]
+                if d:
+                    bit = 1 << (d - 1)
+                    self._rows[r] |= bit
+                    self._cols[c] |= bit
+                    self._boxes[b] |= bit
+                else:
+                    empties.append((r, c, b))
+
+        if self.engine == "bitmask" and (self.variable_order, self.value_order) != ("mrv", "ascending"):
+            self._rng = random.Random(self.seed)   # the same seed replays the same search
+            return self._search_ordered(board, empties, 0)
+        return self._search_bitmask(board, empties, 0)
+
+    def _search_bitmask(self, board: List[List[int]], empties: List[Tuple[int, int, int]], k: int) -> bool:
+        stats = self.stats
+        if stats is not None:
+            stats.node(k)
+        if k == len(empties):
+            # Stop here unless we are counting towards a larger limit
+            self.solutions_found += 1
+            return self.solutions_found >= self._limit
+
+        rows, cols, boxes, full = self._rows, self._cols, self._boxes, self._full
+
+        # Minimum remaining values: pick the open cell with the fewest candidates
+        best = -1
+        best_mask = 0
+        best_count = 64
+        for i in range(k, len(empties)):
+            r, c, b = empties[i]
+            mask = full & ~(rows[r] | cols[c] | boxes[b])
+            count = mask.bit_count()
+            if count < best_count:
+                best, best_mask, best_count = i, mask, count
+                if count <= 1:
+                    break
+
+        if best_count == 0:
+            if stats is not None:
+                stats.dead_end(k, "cell")
+            return False  # dead end: some cell has no legal digit
+        if stats is not None:
+            stats.choice(best_count)
+
+        empties[k], empties[best] = empties[best], empties[k]
+        r, c, b = empties[k]
+
+        mask = best_mask
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            self.steps += 1
+            if self.steps >= self._next_check:
+                self._check_limits()
+
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            board[r][c] = bit.bit_length()
+
+            if self._search_bitmask(board, empties, k + 1):
+                return True
+
+            self.backtracks += 1
+            rows[r] ^= bit
+            cols[c] ^= bit
+            boxes[b] ^= bit
+            board[r][c] = 0
+
+        return False
+
+    def _search_ordered(self, board: List[List[int]], empties: List[Tuple[int, int, int]], k: int) -> bool:
+        """_search_bitmask with the cell and digit order taken from the selected strategies."""
+        stats = self.stats
+        if stats is not None:
+            stats.node(k)
+        if k == len(empties):
+            self.solutions_found += 1
+            return self.solutions_found >= self._limit
+
+        rows, cols, boxes, full = self._rows, self._cols, self._boxes, self._full
+        best, best_mask = self._select_cell(empties, k, rows, cols, boxes, full)
+        if not best_mask:
+            if stats is not None:
+                stats.dead_end(k, "cell")
+            return False  # dead end: the chosen cell has no legal digit
+        if stats is not None:
+            stats.choice(best_mask.bit_count())
+
+        empties[k], empties[best] = empties[best], empties[k]
+        r, c, b = empties[k]
+
+        for bit in self._order_values(best_mask, empties, k, rows, cols, boxes, full, self._rng):
+            self.steps += 1
+            if self.steps >= self._next_check:
+                self._check_limits()
+
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            board[r][c] = bit.bit_length()
+
+            if self._search_ordered(board, empties, k + 1):
+                return True
+
+            self.backtracks += 1
+            rows[r] ^= bit
+            cols[c] ^= bit
+            boxes[b] ^= bit
+            board[r][c] = 0
+
+        return False
+
+    # -----------------------------------------------------------------------
+    # Bitmask engine with propagation at every node
+    # -----------------------------------------------------------------------
+
+    def _solve_propagating(self, board: List[List[int]]) -> Optional[List[List[int]]]:
+        state = self.propagator.initial_state(board)
+        if state is None:
+            return None
+        values = self._search_propagating(state[0], state[1], 0)
+        if values is None:
+            return None
+        n = len(board)
+        return [values[r * n:(r + 1) * n] for r in range(n)]
+
+    def _search_propagating(self, cands: List[int], values: List[int], depth: int) -> Optional[List[int]]:
+        stats = self.stats
+        if stats is not None:
+            stats.node(depth)
+        if not self.propagator.propagate(cands, values):
+            if stats is not None:
+                stats.dead_end(depth, "propagation")
+            return None
+
+        best = -1
+        best_count = 64
+        for i, v in enumerate(values):
+            if not v:
+                count = cands[i].bit_count()
+                if count < best_count:
+                    best, best_count = i, count
+                    if count == 2:
+                        break
+
+        if best < 0:
+            self.search_cells = depth
+            return values
+        if stats is not None:
+            stats.choice(best_count)
+
+        mask = cands[best]
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            self.steps += 1
+            if self.steps >= self._next_check:
+                self._check_limits()
+
+            # Narrow the cell to one candidate; propagation places it as a naked single
+            child_cands = cands[:]
+            child_cands[best] = bit
+            solved = self._search_propagating(child_cands, values[:], depth + 1)
+            if solved is not None:
+                return solved
+
+            self.backtracks += 1
+
         return None
 
 class VisualSolver(BacktrackingSolver):
     """
-    Visual version of the backtracking solver for GUI integration.
+    Animates the classic engine's event stream on the GUI.
     """
     def __init__(self, gui_app):
-        super().__init__()
+        super().__init__(engine="classic", propagation="off")
         self.app = gui_app
 
-    def visual_solve(self, board: List[List[int]]) -> bool:
-        """Backtracking algorithm with real-time visualization for GUI."""
+    def run_solve(self, board: Union[List[List[int]], IncrementalBoard]) -> bool:
+        """Solve `board` in place, redrawing the GUI after every place/backtrack."""
         import pygame # Local import to avoid dependency in non-GUI context
-        
-        find = self._find_empty(board)
-        if not find:
-            return True
-        else:
-            row, col = find
-            self.app.current_pos = (row, col)
 
-        for i in range(1, 10):
-            self.steps += 1
-            if SudokuValidator.is_safe_move(board, row, col, i):
-                board[row][col] = i
-                self.app.cell_state[(row, col)] = "TRYING"
-                
-                self.app.update_display()
-                pygame.time.delay(int(self.app.solve_speed * 1000))
-
-                if self.visual_solve(board):
-                    self.app.cell_state[(row, col)] = "STABLE"
-                    return True
+        incremental = isinstance(board, IncrementalBoard)
+        rows = board.grid if incremental else board
+        self.app.cell_state.clear()
+        self.start_time = time.perf_counter()   # the GUI shows a live timer
+        solved = False
+        for event in self.iter_solve(rows, SolveLimits()):
+            if event.kind == SOLVED:
+                solved = True
+                break
+            if event.kind == TRY:
+                continue
 
-                self.backtracks += 1
-                board[row][col] = 0
-                self.app.cell_state[(row, col)] = "BACKTRACK"
-                self.app.update_display()
-                pygame.time.delay(int(self.app.solve_speed * 1000))
-                
-        return False
+            self.app.current_pos = (event.row, event.col)
+            if event.kind == PLACE:
+                if incremental:
+                    board.place(event.row, event.col, event.digit)
+                else:
+                    rows[event.row][event.col] = event.digit
+                self.app.cell_state[(event.row, event.col)] = "TRYING"
+            else:
+                if incremental:
+                    board.undo()
+                else:
+                    rows[event.row][event.col] = 0
+                self.app.cell_state[(event.row, event.col)] = "BACKTRACK"
+            self.app.update_display()
+            pygame.time.delay(int(self.app.solve_speed * 1000))
 
-    def run_solve(self, board: List[List[int]]) -> bool:
-        """Wrapper for GUI to start the visual solve."""
-        self.steps = 0
-        self.backtracks = 0
-        self.solve_time = 0.0
-        self.app.cell_state.clear()
-        
-        if not SudokuValidator.is_valid_board(board):
-            logger.error("Initial board state is invalid for visual solve")
-            return False
-            
-        self.start_time = time.perf_counter()
-        self.benchmarker.start_benchmark()
-        success = self.visual_solve(board)
-        bench = self.benchmarker.end_benchmark("Visual Backtracking", self.steps, self.backtracks)
-        self.solve_time = bench.execution_time
-        return success
+        if solved:
+            # Cells still marked TRYING are exactly the ones on the solution path
+            for pos, state in self.app.cell_state.items():
+                if state == "TRYING":
+                    self.app.cell_state[pos] = "STABLE"
+        return solved
@@ -1,44 +1,263 @@
-import time
-import psutil
+"""
+benchmarker.py
+==============
+Timing and memory measurement for solvers.
+
+Every solve records one sample between `start_benchmark()` and
+`end_benchmark()`: wall-clock time, process CPU time and memory. Memory is
+the tracemalloc peak of Python allocations made during the solve when
+tracing is on (`trace_memory`, default settings.BENCHMARK_TRACE_MEMORY).
+Otherwise it is the process RSS delta, which is coarse and usually 0.
+
+For numbers worth publishing, `measure()` runs a callable `warmup` times,
+then `repeat` timed runs, then one more run under tracemalloc for the
+allocation peak. Tracing slows allocation-heavy code, so it is kept out of
+the timed runs. The result carries min/median/p95/stdev over the samples.
+
+Named phases can be timed with the `phase()` context manager, which also
+works as a decorator:
+
+    bench = Benchmarker()
+    with bench.phase("build"):
+        ...
+    @bench.phase("search")
+    def search(): ...
+    bench.phase_stats()   # {"build": {...}, "search": {...}}
+"""
+
+import math
 import os
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import psutil
+from src.config import settings
 from src.logging_config import logger
 
+_MB = 1024 * 1024
+
+
 @dataclass
 class BenchmarkResult:
-    execution_time: float
-    memory_usage_mb: float
+    execution_time: float       # wall clock, seconds (median when repeated)
+    memory_usage_mb: float      # tracemalloc peak when traced, else RSS delta
     steps: int
     backtracks: int
     algorithm: str
+    propagated_cells: int = 0   # empty cells filled by constraint propagation
+    search_cells: int = 0       # empty cells filled by search decisions
+    cpu_time: float = 0.0       # process CPU time, seconds (median when repeated)
+    peak_memory_mb: Optional[float] = None   # tracemalloc peak (None if not traced)
+    repeats: int = 1
+    warmup: int = 0
+    min_time: float = 0.0
+    median_time: float = 0.0
+    p95_time: float = 0.0
+    stdev_time: float = 0.0
+    search_stats: Optional[Dict[str, Any]] = None   # SearchStats.to_dict() of an instrumented solve
+    ordering: Optional[str] = None   # "variable/value" ordering strategies (backtracking only)
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """min/median/p95/stdev/mean of a list of timings (nearest-rank p95)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"min": 0.0, "median": 0.0, "p95": 0.0, "stdev": 0.0, "mean": 0.0}
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": p95,
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "mean": statistics.fmean(ordered),
+    }
+
 
 class Benchmarker:
     """
     Benchmarks solving performance (time and memory).
+    `last` holds the most recent BenchmarkResult.
     """
-    
-    def __init__(self):
+
+    def __init__(self, trace_memory: Optional[bool] = None):
         self._process = psutil.Process(os.getpid())
-        
+        self.trace_memory = settings.BENCHMARK_TRACE_MEMORY if trace_memory is None else trace_memory
+        self.last: Optional[BenchmarkResult] = None
+        self.phases: Dict[str, List[float]] = {}
+        self._started_tracing = False
+
     def start_benchmark(self):
+        if self.trace_memory:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._start_traced = tracemalloc.get_traced_memory()[0]
+        else:
+            self._start_mem = self._process.memory_info().rss / _MB
+        self._start_cpu = time.process_time()
         self._start_time = time.perf_counter()
-        self._start_mem = self._process.memory_info().rss / (1024 * 1024)
-        
-    def end_benchmark(self, algorithm: str, steps: int = 0, backtracks: int = 0) -> BenchmarkResult:
-        end_time = time.perf_counter()
-        end_mem = self._process.memory_info().rss / (1024 * 1024)
-        
-        execution_time = end_time - self._start_time
-        memory_used = end_mem - self._start_mem
-        
+
+    def stop_tracing(self):
+        """
+        Stop tracemalloc if start_benchmark() started it. end_benchmark()
+        does this; solve paths that end without a result call it directly,
+        or tracing would stay on for the rest of the process.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def end_benchmark(
+        self,
+        algorithm: str,
+        steps: int = 0,
+        backtracks: int = 0,
+        propagated_cells: int = 0,
+        search_cells: int = 0,
+        search_stats: Optional[Dict[str, Any]] = None,
+        ordering: Optional[str] = None,
+    ) -> BenchmarkResult:
+        execution_time = time.perf_counter() - self._start_time
+        cpu_time = time.process_time() - self._start_cpu
+
+        peak = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak = max(0.0, (tracemalloc.get_traced_memory()[1] - self._start_traced) / _MB)
+            self.stop_tracing()
+            memory_used = peak
+        else:
+            memory_used = max(0.0, self._process.memory_info().rss / _MB - self._start_mem)
+
         result = BenchmarkResult(
             execution_time=execution_time,
-            memory_usage_mb=max(0, memory_used),
+            memory_usage_mb=memory_used,
             steps=steps,
             backtracks=backtracks,
-            algorithm=algorithm
+            algorithm=algorithm,
+            propagated_cells=propagated_cells,
+            search_cells=search_cells,
+            cpu_time=cpu_time,
+            peak_memory_mb=peak,
+            min_time=execution_time,
+            median_time=execution_time,
+            p95_time=execution_time,
+            search_stats=search_stats,
+            ordering=ordering,
+        )
+        self.last = result
+
+        logger.info(
+            f"Benchmark for {algorithm}{f' ({ordering})' if ordering else ''}: "
+            f"{execution_time:.4f}s (cpu {cpu_time:.4f}s), "
+            f"{result.memory_usage_mb:.2f}MB, Steps: {steps}, "
+            f"Cells (propagation/search): {propagated_cells}/{search_cells}"
+        )
+        return result
+
+    # -----------------------------------------------------------------------
+    # Repeated measurement
+    # -----------------------------------------------------------------------
+
+    def measure(
+        self,
+        algorithm: str,
+        func: Callable,
+        *args,
+        repeat: int = 5,
+        warmup: int = 1,
+        trace_memory: bool = True,
+        **kwargs,
+    ) -> BenchmarkResult:
+        """
+        Time `func(*args, **kwargs)` over `repeat` runs after `warmup`
+        untimed ones. When `func` is a solver method, steps/backtracks/cells
+        are read from the solver after the last run.
+        """
+        if repeat < 1:
+            raise ValueError("repeat must be at least 1")
+        for _ in range(warmup):
+            func(*args, **kwargs)
+
+        wall, cpu = [], []
+        for _ in range(repeat):
+            start_cpu = time.process_time()
+            start = time.perf_counter()
+            func(*args, **kwargs)
+            wall.append(time.perf_counter() - start)
+            cpu.append(time.process_time() - start_cpu)
+        solver = getattr(func, "__self__", None)
+        counters = _counters(solver)
+
+        peak = None
+        if trace_memory:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            try:
+                func(*args, **kwargs)
+                peak = max(0.0, (tracemalloc.get_traced_memory()[1] - base) / _MB)
+            finally:
+                if started:
+                    tracemalloc.stop()
+
+        stats = summarize(wall)
+        result = BenchmarkResult(
+            execution_time=stats["median"],
+            memory_usage_mb=peak if peak is not None else 0.0,
+            algorithm=algorithm,
+            cpu_time=statistics.median(cpu),
+            peak_memory_mb=peak,
+            repeats=repeat,
+            warmup=warmup,
+            min_time=stats["min"],
+            median_time=stats["median"],
+            p95_time=stats["p95"],
+            stdev_time=stats["stdev"],
+            **counters,
+        )
+        self.last = result
+        logger.info(
+            f"Measured {algorithm}: median {stats['median'] * 1000:.3f}ms "
+            f"(min {stats['min'] * 1000:.3f}, p95 {stats['p95'] * 1000:.3f}, "
+            f"stdev {stats['stdev'] * 1000:.3f}) over {repeat} runs, peak {result.memory_usage_mb:.2f}MB"
         )
-        
-        logger.info(f"Benchmark for {algorithm}: {execution_time:.4f}s, {result.memory_usage_mb:.2f}MB, Steps: {steps}")
         return result
+
+    # -----------------------------------------------------------------------
+    # Named phases
+    # -----------------------------------------------------------------------
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block (or, as a decorator, every call) under `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.setdefault(name, []).append(time.perf_counter() - start)
+
+    def phase_stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {"count": len(samples), "total": sum(samples), **summarize(samples)}
+            for name, samples in self.phases.items()
+        }
+
+
+def _counters(solver) -> Dict[str, int]:
+    if solver is None:
+        return {"steps": 0, "backtracks": 0}
+    steps = getattr(solver, "nodes_visited", None)
+    if steps is None:
+        steps = getattr(solver, "steps", 0)
+    return {
+        "steps": steps,
+        "backtracks": getattr(solver, "backtracks", 0),
+        "propagated_cells": getattr(solver, "propagated_cells", 0),
+        "search_cells": getattr(solver, "search_cells", 0),
+    }
@@ -0,0 +1,159 @@
+"""
+board.py
+========
+Compact, immutable Sudoku board.
+
+A Board stores its N×N cells row-major in an N²-byte `bytes` object (81
+bytes for 9×9), so it is cheap to copy, hashable and usable directly as a
+cache key. It converts to and from:
+
+  - lists of rows:   Board.from_rows(rows) / board.to_rows()
+  - strings:         Board.from_string("53..7....6..195...") / str(board)
+                     one character per cell: 1-9 then A-P for 10-25,
+                     "0" or "." for an empty cell
+  - packed nibbles:  board.pack() / Board.from_packed(data) – two cells per
+                     byte (41 bytes for 9×9), for sizes up to 9×9
+  - NumPy:           board.to_numpy() – a zero-copy (N, N) uint8 view
+"""
+
+import math
+from itertools import chain
+from typing import Iterator, List, Union
+import numpy as np
+
+# Supported box sizes: 2 (4×4) up to 5 (25×25)
+SUPPORTED_BOX_SIZES = (2, 3, 4, 5)
+SUPPORTED_SIZES = tuple(b * b for b in SUPPORTED_BOX_SIZES)
+
+_ALPHABET = b"0123456789ABCDEFGHIJKLMNOP"          # digit value -> character
+_TO_CHAR = bytes(_ALPHABET[i] if i < len(_ALPHABET) else ord("?") for i in range(256))
+_FROM_CHAR = bytearray(b"\xff" * 256)               # character -> digit value
+for _value, _char in enumerate(_ALPHABET):
+    _FROM_CHAR[_char] = _value
+    _FROM_CHAR[ord(chr(_char).lower())] = _value
+_FROM_CHAR[ord(".")] = 0
+_FROM_CHAR = bytes(_FROM_CHAR)
+
+
+class Board:
+    """An immutable N×N board (N in SUPPORTED_SIZES) backed by N² bytes."""
+
+    __slots__ = ("cells", "size", "box")
+
+    def __init__(self, cells: Union[bytes, bytearray, memoryview]):
+        cells = bytes(cells)
+        size = math.isqrt(len(cells))
+        if size * size != len(cells) or size not in SUPPORTED_SIZES:
+            raise ValueError(f"A board needs N² cells for N in {SUPPORTED_SIZES}, got {len(cells)}")
+        self.cells: bytes = cells
+        self.size: int = size
+        self.box: int = math.isqrt(size)
+
+    # -----------------------------------------------------------------------
+    # Conversions
+    # -----------------------------------------------------------------------
+
+    @classmethod
+    def from_rows(cls, rows: List[List[int]]) -> "Board":
+        if any(len(row) != len(rows) for row in rows):
+            raise ValueError("board must be square")
+        return cls(bytes(chain.from_iterable(rows)))
+
+    @classmethod
+    def from_string(cls, text: str) -> "Board":
+        cells = text.strip().encode("ascii").translate(_FROM_CHAR)
+        if b"\xff" in cells:
+            raise ValueError(f"Invalid board character in {text!r}")
+        return cls(cells)
+
+    @classmethod
+    def from_packed(cls, data: bytes, size: int = 9) -> "Board":
+        """Inverse of `pack()`."""
+        cells = bytearray(size * size)
+        for i in range(len(cells)):
+            byte = data[i >> 1]
+            cells[i] = byte >> 4 if i & 1 == 0 else byte & 0x0F
+        return cls(cells)
+
+    @classmethod
+    def coerce(cls, board: Union["Board", str, List[List[int]]]) -> "Board":
+        """A Board from a Board, a string or a list of rows."""
+        if isinstance(board, Board):
+            return board
+        if isinstance(board, str):
+            return cls.from_string(board)
+        return cls.from_rows(board)
+
+    def to_rows(self) -> List[List[int]]:
+        n, cells = self.size, self.cells
+        return [list(cells[i:i + n]) for i in range(0, n * n, n)]
+
+    def to_string(self) -> str:
+        return self.cells.translate(_TO_CHAR).decode("ascii")
+
+    def to_numpy(self) -> np.ndarray:
+        """Read-only (N, N) uint8 view of the cells (no copy)."""
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.size, self.size)
+
+    def pack(self) -> bytes:
+        """Two cells per byte, high nibble first (4×4 and 9×9 only)."""
+        if self.size > 15:
+            raise ValueError(f"{self.size}×{self.size} values do not fit in 4 bits")
+        cells = self.cells
+        if len(cells) & 1:
+            cells += b"\x00"
+        return bytes((cells[i] << 4) | cells[i + 1] for i in range(0, len(cells), 2))
+
+    # -----------------------------------------------------------------------
+    # Access
+    # -----------------------------------------------------------------------
+
+    def __getitem__(self, row: int) -> List[int]:
+        """`board[r]` is row r as a list, so `board[r][c]` works as for lists."""
+        if not 0 <= row < self.size:
+            raise IndexError(row)
+        return list(self.cells[row * self.size:(row + 1) * self.size])
+
+    def __iter__(self) -> Iterator[List[int]]:
+        return iter(self.to_rows())
+
+    def __len__(self) -> int:
+        return self.size
+
+    def get(self, row: int, col: int) -> int:
+        return self.cells[row * self.size + col]
+
+    def with_cell(self, row: int, col: int, value: int) -> "Board":
+        cells = bytearray(self.cells)
+        cells[row * self.size + col] = value
+        return Board(cells)
+
+    @property
+    def empty_count(self) -> int:
+        return self.cells.count(0)
+
+    # -----------------------------------------------------------------------
+    # Value semantics
+    # -----------------------------------------------------------------------
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Board):
+            return self.cells == other.cells
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.cells)
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+    def __repr__(self) -> str:
+        return f"Board({self.to_string()!r})"
+
+
+BoardLike = Union[Board, List[List[int]]]
+
+
+def as_rows(board: BoardLike) -> List[List[int]]:
+    """Lists of rows for either representation (the list itself, uncopied)."""
+    return board.to_rows() if isinstance(board, Board) else board
@@ -0,0 +1,196 @@
+"""
+cache.py
+========
+Bounded LRU cache of solutions, keyed on the board as given and,
+optionally, on its canonical form.
+
+A lookup tries the board exactly as given. With `canonical` on
+(SOLUTION_CACHE_CANONICAL), a miss then canonicalises the board and looks
+up the canonical solution, which is mapped back to the caller's board
+through the inverse transform, and stores record both keys.
+Canonicalisation costs several times a 9×9 bitmask solve, so it is off by
+default: it only pays when isomorphic repeats are common or the engine in
+front of the cache is slow.
+
+The cache is bounded by an approximate memory cap in bytes (key, value
+and per-entry overhead). It counts hits (split into exact and canonical),
+misses and evictions.
+
+For a puzzle with several solutions, a canonical hit returns *a* valid
+solution, not necessarily the one a fresh solve would pick.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from src.solver.board import Board, BoardLike
+from src.solver.canonical import canonicalize
+from src.solver.limits import SolveLimits
+from src.config import settings
+from src.logging_config import logger
+
+_ENTRY_OVERHEAD = 120    # OrderedDict node + bookkeeping, bytes (approximate)
+
+
+@lru_cache(maxsize=256)
+def _canonical_form(board: Board):
+    """canonicalize() memoised, so a miss followed by put() pays for it once."""
+    return canonicalize(board)
+
+
+class SolutionCache:
+    """Thread-safe LRU of puzzle -> solution, bounded by `max_bytes`."""
+
+    def __init__(self, max_bytes: Optional[int] = None, canonical: Optional[bool] = None):
+        if max_bytes is None:
+            max_bytes = int(settings.SOLUTION_CACHE_MAX_MB * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.canonical = settings.SOLUTION_CACHE_CANONICAL if canonical is None else canonical
+        self._entries: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.exact_hits = 0
+        self.canonical_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hits(self) -> int:
+        return self.exact_hits + self.canonical_hits
+
+    def get(self, board: Board) -> Optional[Board]:
+        """The cached solution for `board`, or None."""
+        if self.max_bytes <= 0:
+            return None
+        solution = self._lookup(b"=" + board.cells)
+        if solution is not None:
+            with self._lock:
+                self.exact_hits += 1
+            return Board(solution)
+
+        canonical = _canonical_form(board) if self.canonical else None
+        if canonical is not None:
+            form, transform = canonical
+            solution = self._lookup(b"~" + form.cells)
+            if solution is not None:
+                result = transform.invert(Board(solution))
+                self._store(b"=" + board.cells, result.cells)
+                with self._lock:
+                    self.canonical_hits += 1
+                return result
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, board: Board, solution: Board):
+        """Remember `solution` for `board` (exactly, and by canonical form if enabled)."""
+        if self.max_bytes <= 0:
+            return
+        self._store(b"=" + board.cells, solution.cells)
+        canonical = _canonical_form(board) if self.canonical else None
+        if canonical is not None:
+            form, transform = canonical
+            self._store(b"~" + form.cells, transform.apply(solution).cells)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes_used": self.bytes_used,
+                "max_bytes": self.max_bytes,
+                "hits": self.exact_hits + self.canonical_hits,
+                "exact_hits": self.exact_hits,
+                "canonical_hits": self.canonical_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    # -----------------------------------------------------------------------
+    # LRU internals
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _cost(key: bytes, value: bytes) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value) + _ENTRY_OVERHEAD
+
+    def _lookup(self, key: bytes) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: bytes, value: bytes):
+        cost = self._cost(key, value)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes_used -= self._cost(key, old)
+            self._entries[key] = value
+            self.bytes_used += cost
+            while self.bytes_used > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self.bytes_used -= self._cost(evicted_key, evicted)
+                self.evictions += 1
+
+
+class CachedSolver:
+    """
+    Puts a SolutionCache, and optionally a persistent SolutionStore behind
+    it, in front of a solver (DLXSolver, BacktrackingSolver, ...).
+    `source` is "cache" or "store" when the last `solve()` was answered
+    without solving (`hit` is then True); on a miss the wrapped solver's
+    statistics are current and the solution is written to both.
+    """
+
+    def __init__(self, solver, cache: Optional[SolutionCache] = None, store=None):
+        self.solver = solver
+        self.cache = cache if cache is not None else SolutionCache()
+        self.store = store
+        self.source: Optional[str] = None
+        self.lookup_time: float = 0.0
+
+    @property
+    def hit(self) -> bool:
+        return self.source is not None
+
+    def solve(self, board: BoardLike, limits: Optional[SolveLimits] = None) -> Optional[BoardLike]:
+        as_board = isinstance(board, Board)
+        try:
+            key = board if as_board else Board.from_rows(board)
+        except ValueError:
+            return self.solver.solve(board, limits)   # let the solver reject it
+
+        start = time.perf_counter()
+        self.source = None
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.source = "cache"
+        elif self.store is not None:
+            cached = self.store.get(key)
+            if cached is not None:
+                self.source = "store"
+                self.cache.put(key, cached)
+        self.lookup_time = time.perf_counter() - start
+        if cached is not None:
+            logger.info(f"Solution {self.source} hit in {self.lookup_time:.4f}s")
+            return cached if as_board else cached.to_rows()
+
+        solution = self.solver.solve(key, limits)
+        if solution is None:
+            return None
+        self.cache.put(key, solution)
+        if self.store is not None:
+            self.store.put(key, solution)
+        return solution if as_board else solution.to_rows()
@@ -0,0 +1,159 @@
+"""
+canonical.py
+============
+Canonical form of a board under the Sudoku symmetry group.
+
+Transforms that map a puzzle onto an equivalent one, and any solution onto
+a solution of the new puzzle:
+
+  - transposition
+  - permuting bands (groups of `box` rows), and rows within each band
+  - permuting stacks (groups of `box` columns), and columns within each stack
+  - relabelling the digits
+
+For a fixed geometric transform, the labelling is fixed too: digits are
+renumbered 1, 2, 3, ... in order of first appearance, reading row by row.
+The canonical form is the lexicographically smallest resulting cell
+sequence (0 = empty sorts first).
+
+It is found by building the output one row at a time. Every surviving
+candidate is a (transpose, rows chosen so far, column permutation,
+labelling) state. Each row extends every state by each admissible source
+row. The extensions are scored with NumPy, and only those giving the
+smallest row survive. Boards with so much symmetry that the candidate set
+explodes (nearly empty grids) are not canonicalised; canonicalize()
+returns None for them and for sizes above 9×9.
+"""
+
+from itertools import permutations, product
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+import numpy as np
+from src.solver.board import Board
+
+MAX_BOX = 3            # 16×16 has 24⁵ column permutations: not worth it
+MAX_STATES = 200_000   # give up on boards with more tied candidates than this
+
+
+class Transform(NamedTuple):
+    """
+    canonical[i][j] = digits[src[rows[i]][cols[j]]], where src is the board,
+    transposed first if `transpose` is set.
+    """
+    transpose: bool
+    rows: Tuple[int, ...]
+    cols: Tuple[int, ...]
+    digits: Tuple[int, ...]     # original digit -> canonical digit (digits[0] == 0)
+
+    def apply(self, board: Board) -> Board:
+        grid = board.to_numpy()
+        if self.transpose:
+            grid = grid.T
+        digits = np.array(self.digits, dtype=np.uint8)
+        return Board(digits[grid[np.ix_(self.rows, self.cols)]].tobytes())
+
+    def invert(self, board: Board) -> Board:
+        """Map a board in canonical coordinates back to the original ones."""
+        inverse = np.zeros(len(self.digits), dtype=np.uint8)
+        inverse[list(self.digits)] = np.arange(len(self.digits), dtype=np.uint8)
+        grid = np.empty((board.size, board.size), dtype=np.uint8)
+        grid[np.ix_(self.rows, self.cols)] = inverse[board.to_numpy()]
+        if self.transpose:
+            grid = grid.T
+        return Board(np.ascontiguousarray(grid).tobytes())
+
+
+@lru_cache(maxsize=None)
+def _line_permutations(box: int) -> np.ndarray:
+    """All band/row (equivalently stack/column) orderings, as an (P, N) array."""
+    groups = list(permutations(range(box)))
+    perms = []
+    for order in groups:
+        for inner in product(groups, repeat=box):
+            perms.append([g * box + inner[k][i] for k, g in enumerate(order) for i in range(box)])
+    return np.array(perms, dtype=np.intp)
+
+
+def canonicalize(board: Board) -> Optional[Tuple[Board, Transform]]:
+    """
+    Return `(canonical, transform)` with `transform.apply(board) == canonical`,
+    or None if the board is too large or too symmetric to canonicalise.
+    """
+    box, n = board.box, board.size
+    if box > MAX_BOX:
+        return None
+    grid = board.to_numpy().astype(np.intp)
+    sources = np.stack([grid, grid.T])                      # (2, n, n)
+    col_perms = _line_permutations(box)
+    band_of = np.arange(n) // box
+    weights = (n + 1) ** np.arange(n - 1, -1, -1, dtype=np.int64)
+
+    # Row 0: every source row under every column permutation. Labels start
+    # empty, so each clue simply gets the next label.
+    values = sources.reshape(2 * n, n)[:, col_perms]        # (2n, P, n)
+    clues = values > 0
+    out = np.cumsum(clues, axis=2) * clues
+    key = out @ weights
+    source, cols = np.nonzero(key == key.min())
+    if len(source) > MAX_STATES:
+        return None
+    flip, row = source // n, source % n
+    values, out = values[source, cols], out[source, cols]
+
+    count = len(source)
+    labels = np.zeros((count, n + 1), dtype=np.intp)        # original digit -> label
+    np.put_along_axis(labels, values, out, axis=1)
+    labels[:, 0] = 0
+    next_label = 1 + (values > 0).sum(axis=1)
+    used = np.zeros((count, n), dtype=bool)                 # source rows already placed
+    used[np.arange(count), row] = True
+    chosen = np.zeros((count, n), dtype=np.intp)            # source row per output row
+    chosen[:, 0] = row
+    canonical = np.zeros((n, n), dtype=np.intp)
+    canonical[0] = out[0]
+
+    for i in range(1, n):
+        if i % box == 0:
+            # Start a new band: any row of a band that is still untouched
+            band_free = ~used.reshape(-1, box, box).any(axis=2)
+            allowed = np.repeat(band_free, box, axis=1)
+        else:
+            current = band_of[chosen[:, i - 1]]
+            allowed = ~used & (band_of[None, :] == current[:, None])
+        state, row = np.nonzero(allowed)
+        if len(state) > MAX_STATES:
+            return None
+
+        # The candidate output row, relabelled
+        values = sources[flip[state], row][np.arange(len(state))[:, None], col_perms[cols[state]]]
+        out = np.take_along_axis(labels[state], values, axis=1)
+        new = (values > 0) & (out == 0)
+        out = np.where(new, next_label[state, None] + np.cumsum(new, axis=1) - 1, out)
+
+        # Keep only the candidates giving the smallest row
+        key = out @ weights
+        keep = np.flatnonzero(key == key.min())
+        state, row, values, out, new = state[keep], row[keep], values[keep], out[keep], new[keep]
+        flip, cols, next_label = flip[state], cols[state], next_label[state]
+        labels, used, chosen = labels[state], used[state], chosen[state]
+
+        hit_state, hit_col = np.nonzero(new)
+        labels[hit_state, values[hit_state, hit_col]] = out[hit_state, hit_col]
+        next_label = next_label + new.sum(axis=1)
+        used[np.arange(len(row)), row] = True
+        chosen[:, i] = row
+        canonical[i] = out[0]
+
+    # Digits absent from the board take the remaining labels in order
+    digits = labels[0].copy()
+    missing = [d for d in range(1, n + 1) if digits[d] == 0]
+    for offset, d in enumerate(missing):
+        digits[d] = next_label[0] + offset
+
+    transform = Transform(
+        transpose=bool(flip[0]),
+        rows=tuple(int(r) for r in chosen[0]),
+        cols=tuple(int(c) for c in col_perms[cols[0]]),
+        digits=tuple(int(d) for d in digits),
+    )
+    return Board(canonical.astype(np.uint8).tobytes()), transform
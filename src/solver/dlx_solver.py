@@ -9,10 +9,16 @@ References:
   - https://en.wikipedia.org/wiki/Dancing_Links
 """
 
-import time
-from typing import Optional, List, Tuple
+import math
+import threading
+from typing import Any, Dict, Optional, List
 from src.solver.validator import SudokuValidator
 from src.solver.benchmarker import Benchmarker
+from src.solver.board import Board, BoardLike, as_rows
+from src.solver.limits import BudgetExceeded, SolveLimits
+from src.solver.propagation import ConstraintPropagator, PROPAGATION_MODES
+from src.solver.search_stats import CONSTRAINTS, SearchStats
+from src.config import settings
 from src.logging_config import logger
 
 # ---------------------------------------------------------------------------
@@ -46,92 +52,50 @@ class ColumnNode(Node):
 
 
 # ---------------------------------------------------------------------------
-# DLX Solver
+# Prebuilt exact-cover template
 # ---------------------------------------------------------------------------
 
-class DLXSolver:
+class ExactCoverMatrix:
     """
-    Solves 9×9 Sudoku using Algorithm X with Dancing Links (DLX).
-    Production-ready with validation and benchmarking.
+    The full exact-cover matrix of an empty N×N grid (N = box²): 4·N²
+    columns and all N³ candidate rows (324 and 729 for 9×9). Row
+    `(r * N + c) * N + (d - 1)` places digit d at (r, c). Clues are applied
+    by covering their rows and undone afterwards, so one matrix serves any
+    number of solves.
     """
 
-    COLS = 324          # total constraint columns
-    N = 9               # grid size
-
-    def __init__(self):
-        self.solution_rows: List[int] = []
-        self.result: Optional[List[List[int]]] = None
-        self.nodes_visited: int = 0
-        self.backtracks: int = 0
-        self.solve_time: float = 0.0
-        self.benchmarker = Benchmarker()
-
-    def solve(self, board: List[List[int]]) -> Optional[List[List[int]]]:
-        """
-        Solve a 9×9 Sudoku board (0 = empty cell).
-        Returns the solved board (list[list[int]]) or None if unsolvable.
-        """
-        if not SudokuValidator.is_valid_board(board):
-            logger.error("Initial board state is invalid")
-            return None
-
-        self.nodes_visited = 0
-        self.backtracks = 0
-        self.solve_time = 0.0
-        self.result = None
-        self.solution_rows = []
-
-        self.benchmarker.start_benchmark()
-
-        # Build the exact-cover matrix
-        header, row_map = self._build_matrix(board)
-
-        # Run Algorithm X
-        self._search(header)
+    def __init__(self, box: int = 3):
+        self.box = box
+        self.N = N = box * box
+        self.COLS = 4 * N * N
+        NN = N * N
 
-        if self.result is not None:
-            solved_board = self._decode(self.result, row_map)
-            bench = self.benchmarker.end_benchmark("DLX", self.nodes_visited, self.backtracks)
-            self.solve_time = bench.execution_time
-            return solved_board
-            
-        logger.warning("DLX: No solution found for the provided puzzle")
-        return None
-
-    def _build_matrix(self, board: List[List[int]]) -> Tuple[ColumnNode, List[Tuple[int, int, int]]]:
-        """Build the sparse exact-cover matrix for the given board state."""
-        N = self.N
-
-        # Create column headers
-        header = ColumnNode("root")
+        self.header = ColumnNode("root")
         col_headers: List[ColumnNode] = []
         for i in range(self.COLS):
             c = ColumnNode(str(i))
-            c.left = header.left
-            c.right = header
-            header.left.right = c
-            header.left = c
+            c.left = self.header.left
+            c.right = self.header
+            self.header.left.right = c
+            self.header.left = c
             col_headers.append(c)
 
-        # row_map[row_id] -> (r, c, d)  so we can decode the solution
-        row_map: List[Tuple[int, int, int]] = []
+        self.columns = col_headers
+        # row_nodes[row_id] -> the row's cell-constraint node
+        self.row_nodes: List[Node] = []
 
         for r in range(N):
             for c in range(N):
-                digit_start = 1 if board[r][c] == 0 else board[r][c]
-                digit_end   = 9 if board[r][c] == 0 else board[r][c]
-
-                for d in range(digit_start, digit_end + 1):
-                    row_id = len(row_map)
-                    row_map.append((r, c, d))
+                for d in range(1, N + 1):
+                    row_id = len(self.row_nodes)
 
                     # Compute the four constraint column indices
-                    box = (r // 3) * 3 + (c // 3)
+                    b = (r // box) * box + (c // box)
                     cols4 = [
                         r * N + c,                   # cell constraint
-                        81  + r * N + (d - 1),       # row constraint
-                        162 + c * N + (d - 1),       # col constraint
-                        243 + box * N + (d - 1),     # box constraint
+                        NN     + r * N + (d - 1),    # row constraint
+                        2 * NN + c * N + (d - 1),    # col constraint
+                        3 * NN + b * N + (d - 1),    # box constraint
                     ]
 
                     nodes: List[Node] = []
@@ -155,54 +119,492 @@ class DLXSolver:
                         node.left  = nodes[(i - 1) % 4]
                         node.right = nodes[(i + 1) % 4]
 
-        return header, row_map
+                    self.row_nodes.append(nodes[0])
 
-    def _search(self, header: ColumnNode):
-        if self.result is not None:
-            return  # already found a solution
+    def select_givens(self, board: List[List[int]]) -> List[Node]:
+        """Cover the rows of every clue on the board; returns them for `deselect_givens`."""
+        N = self.N
+        givens: List[Node] = []
+        for r in range(N):
+            for c in range(N):
+                d = board[r][c]
+                if d:
+                    node = self.row_nodes[(r * N + c) * N + (d - 1)]
+                    _cover(node.column)
+                    j = node.right
+                    while j is not node:
+                        _cover(j.column)
+                        j = j.right
+                    givens.append(node)
+        return givens
+
+    def deselect_givens(self, givens: List[Node]):
+        """Undo `select_givens`, restoring the empty-grid matrix."""
+        for node in reversed(givens):
+            j = node.left
+            while j is not node:
+                _uncover(j.column)
+                j = j.left
+            _uncover(node.column)
 
-        self.nodes_visited += 1
 
-        if header.right is header:
-            # All constraints satisfied → solution found
-            self.result = list(self.solution_rows)
-            return
+class _MatrixPool:
+    """
+    Thread-safe free lists of ExactCoverMatrix instances, one per box size.
+    A matrix is only ever used by one solve at a time; it is built on first
+    demand and then reused forever, so concurrent solvers never rebuild or
+    share state.
+    """
 
-        # Choose column with minimum size (S-heuristic)
-        col = self._choose_column(header)
-        if col.size == 0:
-            self.backtracks += 1
-            return   # dead end
+    def __init__(self):
+        self._free: Dict[int, List[ExactCoverMatrix]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, box: int = 3) -> ExactCoverMatrix:
+        with self._lock:
+            free = self._free.get(box)
+            if free:
+                return free.pop()
+        return ExactCoverMatrix(box)
+
+    def release(self, matrix: ExactCoverMatrix):
+        with self._lock:
+            self._free.setdefault(matrix.box, []).append(matrix)
+
+    def warm_up(self, count: int = 1, box: int = 3):
+        """Pre-build `count` matrices (e.g. at worker start-up)."""
+        matrices = [self.acquire(box) for _ in range(count)]
+        for matrix in matrices:
+            self.release(matrix)
+
+
+MATRIX_POOL = _MatrixPool()
+
+
+def _cover(col: ColumnNode):
+    """Remove column and all rows containing a 1 in this column."""
+    col.right.left = col.left
+    col.left.right = col.right
+
+    i = col.down
+    while i is not col:
+        j = i.right
+        while j is not i:
+            j.down.up = j.up
+            j.up.down = j.down
+            j.column.size -= 1
+            j = j.right
+        i = i.down
+
+
+def _uncover(col: ColumnNode):
+    """Restore column and all rows that were removed by cover."""
+    i = col.up
+    while i is not col:
+        j = i.left
+        while j is not i:
+            j.column.size += 1
+            j.down.up = j
+            j.up.down = j
+            j = j.left
+        i = i.up
+
+    col.right.left = col
+    col.left.right = col
 
-        self._cover(col)
 
-        row_node = col.down
-        while row_node is not col:
-            self.solution_rows.append(row_node.row_id)
+# ---------------------------------------------------------------------------
+# DLX Solver
+# ---------------------------------------------------------------------------
 
-            # Cover all other columns in this row
-            j = row_node.right
-            while j is not row_node:
-                self._cover(j.column)
-                j = j.right
+class DLXSolver:
+    """
+    Solves N×N Sudoku (4×4 up to 25×25) using Algorithm X with Dancing
+    Links (DLX). Production-ready with validation and benchmarking.
+
+    With propagation enabled ("prepass" or "nodes") the board is reduced by
+    ConstraintPropagator before the clues are applied; the column heuristic
+    already plays the role of per-node singles inside the search.
+
+    The exact-cover matrix is not built per solve: a prebuilt template is
+    taken from MATRIX_POOL, the clue rows are covered, and everything is
+    uncovered again before the template goes back to the pool.
 
-            self._search(header)
+    The search is an explicit-stack state machine, so besides `solve()` it
+    can be driven incrementally:
 
-            if self.result is not None:
-                return  # propagate solution upward immediately
+        solver.start(board)
+        while not solver.run(max_nodes=1000):
+            state = solver.checkpoint()      # JSON-serialisable
+        board = solver.solution()
 
-            # Undo (backtrack)
-            self.solution_rows.pop()
-            j = row_node.left
-            while j is not row_node:
-                self._uncover(j.column)
+    and a checkpoint can be continued later with `DLXSolver.resume(state)`.
+    A paused solver holds its template until it finishes or `close()` is
+    called.
+
+    `count_solutions(board, limit)` runs the same search past the first
+    solution and stops as soon as `limit` solutions have been seen.
+
+    `solve()` and `count_solutions()` run the search in slices under
+    SolveLimits (default: settings.MAX_STEPS nodes). If a limit trips they
+    release the template and raise BudgetExceeded.
+
+    With `instrument=True` each search also fills `stats` (a SearchStats:
+    nodes per depth, chosen column sizes, dead ends by constraint type).
+    """
+
+    COLS = 324          # total constraint columns (set per board by start())
+    N = 9               # grid size (set per board by start())
+    ALGORITHM = "DLX"
+
+    def __init__(self, propagation: Optional[str] = None, instrument: bool = False):
+        self.propagation = propagation or settings.PROPAGATION_MODE
+        if self.propagation not in PROPAGATION_MODES:
+            raise ValueError(f"Unknown propagation mode: {self.propagation}")
+        self.propagator = ConstraintPropagator()
+        self.result: Optional[List[int]] = None
+        self.finished: bool = False
+        self.solutions_found: int = 0
+        # Search nodes only: clues are covered up front by select_givens(),
+        # so they are not nodes (a solve visits at least search_cells + 1)
+        self.nodes_visited: int = 0
+        self.backtracks: int = 0
+        self.propagated_cells: int = 0
+        self.search_cells: int = 0
+        self.solve_time: float = 0.0
+        self.benchmarker = Benchmarker()
+        self.instrument = instrument
+        self.stats: Optional[SearchStats] = None   # filled per search when instrumented
+
+        self.box: int = 3
+        self._board: Optional[List[List[int]]] = None
+        self._attached: bool = False         # clues currently applied to a matrix
+        self._matrix: Optional[ExactCoverMatrix] = None
+        self._givens: List[Node] = []
+        self._stack: List[List[Node]] = []   # [column, row node] per search level
+        self._entering: bool = True          # next step enters a node (vs. returns to the parent)
+        self._limit: int = 1                 # stop after this many solutions
+
+    def solve(self, board: BoardLike, limits: Optional[SolveLimits] = None) -> Optional[BoardLike]:
+        """
+        Solve an N×N Sudoku board (0 = empty cell), given as rows or a Board.
+        Returns the solved board in the same form, or None if unsolvable.
+        """
+        if isinstance(board, Board):
+            solved = self.solve(board.to_rows(), limits)
+            return None if solved is None else Board.from_rows(solved)
+
+        if not self.start(board):
+            return None
+
+        try:
+            self._run_within(limits or SolveLimits.from_settings())
+        finally:
+            self.benchmarker.stop_tracing()
+        solved_board = self.solution()
+
+        if solved_board is not None:
+            return solved_board
+            
+        logger.warning("DLX: No solution found for the provided puzzle")
+        return None
+
+    def count_solutions(
+        self, board: BoardLike, limit: int = 2, limits: Optional[SolveLimits] = None
+    ) -> int:
+        """
+        Count the solutions of `board`, stopping once `limit` are found
+        (limit=2 is enough to decide uniqueness). Invalid boards count 0.
+        Search statistics are left on the solver as for `solve()`.
+        """
+        if not self.start(board, limit=limit):
+            return 0
+        try:
+            self._run_within(limits or SolveLimits.from_settings())
+        finally:
+            self.benchmarker.stop_tracing()
+        return self.solutions_found
+
+    def _run_within(self, limits: SolveLimits):
+        """`run()` in slices, consulting `limits` before each pending node."""
+        reason = limits.exceeded(self.nodes_visited)
+        while reason is None:
+            if self.run(limits.next_check(self.nodes_visited) - 1 - self.nodes_visited):
+                return
+            reason = limits.exceeded(self.nodes_visited + 1)
+
+        bench = self.benchmarker.end_benchmark(
+            f"{self.ALGORITHM} (stopped)", self.nodes_visited, self.backtracks,
+            propagated_cells=self.propagated_cells, search_cells=self.search_cells,
+        )
+        self.close()
+        self.finished = True
+        self.solve_time = bench.execution_time
+        raise BudgetExceeded(reason, self.ALGORITHM, self.nodes_visited, self.backtracks, bench.execution_time)
+
+    # -----------------------------------------------------------------------
+    # Incremental API
+    # -----------------------------------------------------------------------
+
+    def start(self, board: BoardLike, limit: int = 1) -> bool:
+        """
+        Validate, propagate and set up a search for up to `limit` solutions.
+        Returns False if the board is invalid.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        board = as_rows(board)
+        self.close()
+        if not SudokuValidator.is_valid_board(board):
+            logger.error("Initial board state is invalid")
+            return False
+
+        self.nodes_visited = 0
+        self.backtracks = 0
+        self.propagated_cells = 0
+        self.search_cells = 0
+        self.solve_time = 0.0
+        self.result = None
+        self.finished = False
+        self.solutions_found = 0
+        self._limit = limit
+        self._entering = True
+        self.stats = SearchStats() if self.instrument else None
+
+        self.benchmarker.start_benchmark()
+
+        empty_cells = sum(row.count(0) for row in board)
+        if self.propagation != "off":
+            board = self.propagator.reduce(board)
+            if board is None:
+                logger.warning("DLX: Propagation found a contradiction")
+                self.finished = True
+                self.benchmarker.stop_tracing()
+                return True
+        self.search_cells = sum(row.count(0) for row in board)
+        self.propagated_cells = empty_cells - self.search_cells
+        self._set_board(board)
+
+        if self.search_cells == 0:
+            self.result = []
+            self.solutions_found = 1
+            self._complete()
+        else:
+            # Apply the clues to a shared template
+            self._attach()
+        return True
+
+    def run(self, max_nodes: Optional[int] = None) -> bool:
+        """
+        Advance the search by at most `max_nodes` nodes (unbounded if None).
+        Returns True once the search has finished, False if it was paused.
+        """
+        if not self.finished and self._search(max_nodes):
+            self._complete()
+        return self.finished
+
+    def solution(self) -> Optional[List[List[int]]]:
+        """The solved board once `run()` has finished successfully, else None."""
+        if not self.finished or self.result is None:
+            return None
+        return self._decode(self._board, self.result)
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Serialisable snapshot of a paused search; see `resume()`."""
+        return {
+            "board": [row[:] for row in self._board] if self._board is not None else None,
+            "stack": self._frames(),
+            "entering": self._entering,
+            "finished": self.finished,
+            "result": list(self.result) if self.result is not None else None,
+            "solutions_found": self.solutions_found,
+            "limit": self._limit,
+            "nodes_visited": self.nodes_visited,
+            "backtracks": self.backtracks,
+            "propagated_cells": self.propagated_cells,
+            "search_cells": self.search_cells,
+        }
+
+    @classmethod
+    def resume(cls, state: Dict[str, Any]) -> "DLXSolver":
+        """Rebuild a solver from `checkpoint()` output, ready to `run()` again."""
+        solver = cls(propagation="off")
+        solver.nodes_visited = state["nodes_visited"]
+        solver.backtracks = state["backtracks"]
+        solver.propagated_cells = state["propagated_cells"]
+        solver.search_cells = state["search_cells"]
+        solver.finished = state["finished"]
+        solver.result = state["result"]
+        solver.solutions_found = state["solutions_found"]
+        solver._limit = state["limit"]
+        solver._set_board(state["board"])
+        solver._entering = state["entering"]
+        solver.benchmarker.start_benchmark()
+
+        if not solver.finished:
+            solver._attach()
+            for col_index, row_id in state["stack"]:
+                solver._push_frame(col_index, row_id)
+        return solver
+
+    def close(self):
+        """Abandon a paused search and hand its template back."""
+        if self._attached:
+            self._unwind()
+            self._detach()
+        self.benchmarker.stop_tracing()
+
+    def _complete(self):
+        self.finished = True
+        if self._attached:
+            self._detach()
+        if self.result is not None or self._limit > 1:
+            algorithm = self.ALGORITHM if self._limit == 1 else f"{self.ALGORITHM} count"
+            bench = self.benchmarker.end_benchmark(
+                algorithm, self.nodes_visited, self.backtracks,
+                propagated_cells=self.propagated_cells, search_cells=self.search_cells,
+                search_stats=self.stats.to_dict() if self.stats is not None else None,
+            )
+            self.solve_time = bench.execution_time
+        else:
+            self.benchmarker.stop_tracing()   # unsolvable: no benchmark to end
+
+    # -----------------------------------------------------------------------
+    # Matrix handling (overridden by ArrayDLXSolver)
+    # -----------------------------------------------------------------------
+
+    def _set_board(self, board: List[List[int]]):
+        self._board = [row[:] for row in board]
+        self.N = len(board)
+        self.box = math.isqrt(self.N)
+        self.COLS = 4 * self.N * self.N
+
+    def _attach(self):
+        self._matrix = MATRIX_POOL.acquire(self.box)
+        self._givens = self._matrix.select_givens(self._board)
+        self._stack = []
+        self._attached = True
+
+    def _detach(self):
+        """Restore the template and return it to the pool (only if fully unwound)."""
+        self._matrix.deselect_givens(self._givens)
+        MATRIX_POOL.release(self._matrix)
+        self._matrix = None
+        self._givens = []
+        self._attached = False
+
+    def _frames(self) -> List[List[int]]:
+        """The search stack as [column index, row id] pairs."""
+        return [[int(col.name), row.row_id] for col, row in self._stack]
+
+    def _push_frame(self, col_index: int, row_id: int):
+        """Replay one level of the search stack from a checkpoint."""
+        col = self._matrix.columns[col_index]
+        _cover(col)
+        row = col.down
+        while row.row_id != row_id:
+            row = row.down
+        self._stack.append([col, row])
+        j = row.right
+        while j is not row:
+            _cover(j.column)
+            j = j.right
+
+    def _unwind(self):
+        """Undo every level of the search stack."""
+        while self._stack:
+            col, row = self._stack.pop()
+            j = row.left
+            while j is not row:
+                _uncover(j.column)
                 j = j.left
+            _uncover(col)
 
-            row_node = row_node.down
-            if self.result is None and row_node is col:
-                self.backtracks += 1
+    # -----------------------------------------------------------------------
+    # Algorithm X as an explicit-stack state machine
+    # -----------------------------------------------------------------------
 
-        self._uncover(col)
+    def _search(self, max_nodes: Optional[int] = None) -> bool:
+        """
+        Equivalent to the textbook recursion (same node and backtrack counts):
+        entering a node either finishes, dead-ends or pushes the first row of
+        the smallest column; returning to a parent undoes its current row and
+        moves to the next one, popping the level when the column is exhausted.
+        """
+        header = self._matrix.header
+        stack = self._stack
+        entering = self._entering
+        stats = self.stats
+        budget = -1 if max_nodes is None else max_nodes
+
+        while True:
+            if entering:
+                if budget == 0:
+                    self._entering = True
+                    return False  # paused before entering this node
+                budget -= 1
+                self.nodes_visited += 1
+                if stats is not None:
+                    stats.node(len(stack))
+
+                if header.right is header:
+                    # All constraints satisfied → solution found
+                    self.solutions_found += 1
+                    if self.result is None:
+                        self.result = [row.row_id for _, row in stack]
+                    if self.solutions_found >= self._limit:
+                        self._unwind()
+                        return True
+                    entering = False   # keep counting
+                    continue
+
+                # Choose column with minimum size (S-heuristic)
+                col = self._choose_column(header)
+                if stats is not None:
+                    self._record_choice(stats, int(col.name), col.size, len(stack))
+                if col.size == 0:
+                    self.backtracks += 1
+                    entering = False   # dead end
+                    continue
+
+                _cover(col)
+                row = col.down
+                stack.append([col, row])
+            else:
+                if not stack:
+                    self._entering = False
+                    return True  # search space exhausted
+
+                frame = stack[-1]
+                col, row = frame
+
+                # Undo (backtrack)
+                j = row.left
+                while j is not row:
+                    _uncover(j.column)
+                    j = j.left
+
+                row = row.down
+                if row is col:
+                    self.backtracks += 1
+                    _uncover(col)
+                    stack.pop()
+                    continue
+                frame[1] = row
+                entering = True
+
+            # Cover all other columns in the row just chosen
+            j = row.right
+            while j is not row:
+                _cover(j.column)
+                j = j.right
+
+    def _record_choice(self, stats: SearchStats, col_index: int, size: int, depth: int):
+        """A zero-size column is a dead end: its constraint has no row left."""
+        if size:
+            stats.choice(size)
+        else:
+            stats.dead_end(depth, CONSTRAINTS[col_index // (self.N * self.N)])
 
     def _choose_column(self, header: ColumnNode) -> ColumnNode:
         """Select the column with the fewest 1s (minimum remaining values)."""
@@ -214,46 +616,15 @@ class DLXSolver:
             c = c.right
         return best
 
-    def _cover(self, col: ColumnNode):
-        """Remove column and all rows containing a 1 in this column."""
-        col.right.left = col.left
-        col.left.right = col.right
-
-        i = col.down
-        while i is not col:
-            j = i.right
-            while j is not i:
-                j.down.up = j.up
-                j.up.down = j.down
-                j.column.size -= 1
-                j = j.right
-            i = i.down
-
-    def _uncover(self, col: ColumnNode):
-        """Restore column and all rows that were removed by cover."""
-        i = col.up
-        while i is not col:
-            j = i.left
-            while j is not i:
-                j.column.size += 1
-                j.down.up = j
-                j.up.down = j
-                j = j.left
-            i = i.up
-
-        col.right.left = col
-        col.left.right = col
-
-    def _decode(
-        self,
-        solution: List[int],
-        row_map: List[Tuple[int, int, int]],
-    ) -> List[List[int]]:
-        board = [[0] * 9 for _ in range(9)]
+    def _decode(self, board: List[List[int]], solution: List[int]) -> List[List[int]]:
+        """Row id `(r * N + c) * N + (d - 1)` places digit d at (r, c)."""
+        N = len(board)
+        solved = [row[:] for row in board]
         for row_id in solution:
-            r, c, d = row_map[row_id]
-            board[r][c] = d
-        return board
+            cell, d = divmod(row_id, N)
+            r, c = divmod(cell, N)
+            solved[r][c] = d + 1
+        return solved
 
 
 # ---------------------------------------------------------------------------
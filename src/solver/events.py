@@ -0,0 +1,31 @@
+"""
+events.py
+=========
+Compact events emitted by `BacktrackingSolver.iter_solve()`.
+
+  try        digit considered for a cell (one per search step)
+  place      digit written to the cell
+  backtrack  digit removed again
+  solved     the board is complete (row/col are -1, digit 0)
+
+Consumers pull events at their own pace. The GUI animates them, the
+streaming endpoint serialises them as NDJSON, and tools can count them.
+"""
+
+from typing import Any, Dict, NamedTuple
+
+TRY = "try"
+PLACE = "place"
+BACKTRACK = "backtrack"
+SOLVED = "solved"
+
+
+class SolveEvent(NamedTuple):
+    kind: str
+    row: int
+    col: int
+    digit: int
+    step: int       # solver.steps when the event was emitted
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"event": self.kind, "row": self.row, "col": self.col, "digit": self.digit, "step": self.step}
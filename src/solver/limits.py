@@ -0,0 +1,103 @@
+"""
+limits.py
+=========
+Step budgets, wall-clock deadlines and cooperative cancellation for the
+solvers.
+
+A solver given a SolveLimits checks it every CHECK_INTERVAL steps (and
+exactly when the step budget runs out), so the hot loop only pays for one
+integer comparison per step. When a limit trips, the solver abandons the
+search and raises BudgetExceeded, carrying the statistics gathered so far.
+
+    token = CancellationToken()
+    limits = SolveLimits(max_steps=50_000, deadline=time.monotonic() + 0.5, token=token)
+    try:
+        DLXSolver().solve(board, limits=limits)
+    except BudgetExceeded as exc:
+        print(exc.reason, exc.steps, exc.elapsed)
+"""
+
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from src.config import settings
+
+CHECK_INTERVAL = 1024   # steps between deadline/cancellation checks
+
+
+class CancellationToken:
+    """Thread-safe flag another thread can set to stop a running solve."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised when a solve runs out of steps or time, or is cancelled.
+    `reason` is "steps", "deadline" or "cancelled".
+    """
+
+    def __init__(self, reason: str, algorithm: str, steps: int, backtracks: int, elapsed: float):
+        super().__init__(reason, algorithm, steps, backtracks, elapsed)
+        self.reason = reason
+        self.algorithm = algorithm
+        self.steps = steps
+        self.backtracks = backtracks
+        self.elapsed = elapsed
+
+    def __str__(self) -> str:
+        return (
+            f"{self.algorithm} stopped ({self.reason}) after {self.steps} steps, "
+            f"{self.backtracks} backtracks, {self.elapsed:.4f}s"
+        )
+
+
+@dataclass
+class SolveLimits:
+    """
+    `max_steps` bounds the solver's step counter (steps for backtracking,
+    nodes visited for DLX); `deadline` is a `time.monotonic()` timestamp.
+    None means no limit of that kind.
+    """
+    max_steps: Optional[int] = None
+    deadline: Optional[float] = None
+    token: Optional[CancellationToken] = None
+
+    @classmethod
+    def from_settings(
+        cls, timeout: Optional[float] = None, token: Optional[CancellationToken] = None
+    ) -> "SolveLimits":
+        """settings.MAX_STEPS (0 = unlimited) plus an optional timeout in seconds."""
+        return cls(
+            max_steps=settings.MAX_STEPS or None,
+            deadline=None if timeout is None else time.monotonic() + timeout,
+            token=token,
+        )
+
+    def exceeded(self, steps: int) -> Optional[str]:
+        """The reason the solve must stop after `steps` steps, or None."""
+        if self.token is not None and self.token.cancelled:
+            return "cancelled"
+        if self.max_steps is not None and steps > self.max_steps:
+            return "steps"
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "deadline"
+        return None
+
+    def next_check(self, steps: int) -> int:
+        """Step count at which `exceeded()` should be consulted next."""
+        if self.deadline is None and self.token is None:
+            return sys.maxsize if self.max_steps is None else self.max_steps + 1
+        if self.max_steps is None:
+            return steps + CHECK_INTERVAL
+        return min(steps + CHECK_INTERVAL, self.max_steps + 1)
@@ -0,0 +1,123 @@
+"""
+ordering.py
+===========
+Variable- and value-ordering strategies for BacktrackingSolver's bitmask
+engine.
+
+A variable ordering picks the open cell to branch on next:
+
+  first-empty  the next open cell in row-major order
+  mrv          minimum remaining values: the cell with the fewest candidates
+  mrv-degree   MRV, ties broken by degree: the cell that shares a row,
+               column or box with the most other open cells
+
+A value ordering decides in which order that cell's candidates are tried:
+
+  ascending    1, 2, ..., N
+  lcv          least constraining value first: the digit that appears in the
+               fewest candidate sets of the cell's open peers
+  random       a seeded shuffle (reproducible for a given seed)
+
+Strategies share one calling convention so the search can look them up in
+VARIABLE_ORDERINGS / VALUE_ORDERINGS. The open cells are `empties[k:]`, as
+(row, col, box) triples; `rows`, `cols` and `boxes` are the occupancy
+bitmasks and `full` has one bit per digit.
+"""
+
+import random
+from typing import Callable, Dict, List, Tuple
+
+Cell = Tuple[int, int, int]
+
+
+# ---------------------------------------------------------------------------
+# Variable orderings: return (index into empties, candidate mask)
+# ---------------------------------------------------------------------------
+
+def first_empty(empties: List[Cell], k: int, rows: List[int], cols: List[int], boxes: List[int], full: int):
+    r, c, b = empties[k]
+    return k, full & ~(rows[r] | cols[c] | boxes[b])
+
+
+def mrv(empties: List[Cell], k: int, rows: List[int], cols: List[int], boxes: List[int], full: int):
+    best, best_mask, best_count = k, 0, 64
+    for i in range(k, len(empties)):
+        r, c, b = empties[i]
+        mask = full & ~(rows[r] | cols[c] | boxes[b])
+        count = mask.bit_count()
+        if count < best_count:
+            best, best_mask, best_count = i, mask, count
+            if count <= 1:
+                break
+    return best, best_mask
+
+
+def mrv_degree(empties: List[Cell], k: int, rows: List[int], cols: List[int], boxes: List[int], full: int):
+    tied: List[Tuple[int, int]] = []
+    best_count = 64
+    for i in range(k, len(empties)):
+        r, c, b = empties[i]
+        mask = full & ~(rows[r] | cols[c] | boxes[b])
+        count = mask.bit_count()
+        if count < best_count:
+            tied, best_count = [(i, mask)], count
+            if count == 0:
+                break   # dead end whatever the degree
+        elif count == best_count:
+            tied.append((i, mask))
+    if len(tied) == 1:
+        return tied[0]
+    return max(tied, key=lambda entry: _degree(empties, k, entry[0]))
+
+
+def _degree(empties: List[Cell], k: int, i: int) -> int:
+    r, c, b = empties[i]
+    return sum(1 for j in range(k, len(empties)) if j != i and _is_peer(empties[j], r, c, b))
+
+
+def _is_peer(cell: Cell, r: int, c: int, b: int) -> bool:
+    return cell[0] == r or cell[1] == c or cell[2] == b
+
+
+# ---------------------------------------------------------------------------
+# Value orderings: return the candidate bits of empties[k] in trial order
+# ---------------------------------------------------------------------------
+
+def ascending(mask: int, empties: List[Cell], k: int, rows, cols, boxes, full, rng: random.Random) -> List[int]:
+    bits = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        bits.append(bit)
+    return bits
+
+
+def least_constraining(mask: int, empties: List[Cell], k: int, rows, cols, boxes, full, rng: random.Random) -> List[int]:
+    r, c, b = empties[k]
+    peer_masks = [
+        full & ~(rows[pr] | cols[pc] | boxes[pb])
+        for pr, pc, pb in empties[k + 1:]
+        if pr == r or pc == c or pb == b
+    ]
+    bits = ascending(mask, empties, k, rows, cols, boxes, full, rng)
+    # Stable sort: ties stay in ascending order
+    return sorted(bits, key=lambda bit: sum(1 for peer in peer_masks if peer & bit))
+
+
+def shuffled(mask: int, empties: List[Cell], k: int, rows, cols, boxes, full, rng: random.Random) -> List[int]:
+    bits = ascending(mask, empties, k, rows, cols, boxes, full, rng)
+    rng.shuffle(bits)
+    return bits
+
+
+VARIABLE_ORDERINGS: Dict[str, Callable] = {
+    "first-empty": first_empty,
+    "mrv": mrv,
+    "mrv-degree": mrv_degree,
+}
+
+VALUE_ORDERINGS: Dict[str, Callable] = {
+    "ascending": ascending,
+    "lcv": least_constraining,
+    "random": shuffled,
+}
@@ -0,0 +1,168 @@
+"""
+parallel.py
+===========
+Multi-core solving of many boards with a ProcessPoolExecutor.
+
+Boards are shipped to the workers in chunks. Each worker builds its solver
+once, in the pool initializer (which also builds the DLX matrices and
+array templates), and keeps it for all chunks it receives, so per-board
+cost is just the solve itself plus pickling the board. Every board gets
+the same step budget (`max_steps`, default settings.MAX_STEPS); a board
+that exhausts it comes back as None, like an unsolvable one, instead of
+aborting the whole run. The input is read
+lazily and at most `2 × workers` chunks are in flight, so a generator of
+boards is streamed through the pool with bounded memory.
+
+    from src.solver.parallel import solve_many, imap_solve
+
+    solutions = solve_many(boards, algorithm="dlx", workers=8)
+    for index, solution in imap_solve(boards, ordered=False):
+        ...
+"""
+
+import itertools
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.solver.array_dlx_solver import ArrayDLXSolver, template_for
+from src.solver.backtracking_solver import BacktrackingSolver
+from src.solver.dlx_solver import DLXSolver, MATRIX_POOL
+from src.solver.limits import BudgetExceeded, SolveLimits
+from src.config import settings
+from src.logging_config import logger
+
+Board = List[List[int]]
+
+SOLVERS = {
+    "dlx": DLXSolver,
+    "dlx-array": ArrayDLXSolver,
+    "backtracking": BacktrackingSolver,
+}
+
+# Per-process solver and step budget, set by _init_worker
+_worker_solver = None
+_worker_limits = SolveLimits()
+
+
+def _init_worker(algorithm: str, log_level: str, max_steps: Optional[int] = None):
+    """Pool initializer: build the solver and its templates once per process."""
+    global _worker_solver, _worker_limits
+    # One INFO line per solve from every worker would swamp the log
+    logger.remove()
+    logger.add(sys.stderr, level=log_level)
+    MATRIX_POOL.warm_up()
+    template_for(3)
+    _worker_solver = SOLVERS[algorithm]()
+    _worker_limits = SolveLimits(max_steps=max_steps)
+
+
+def _solve_one(board: Board) -> Optional[Board]:
+    try:
+        return _worker_solver.solve(board, _worker_limits)
+    except BudgetExceeded as exc:
+        logger.warning(f"Board given up: {exc}")
+        return None
+
+
+def _solve_chunk(start: int, boards: List[Board]) -> Tuple[int, List[Optional[Board]]]:
+    return start, [_solve_one(board) for board in boards]
+
+
+def _chunks(boards: Iterable[Board], size: int) -> Iterator[Tuple[int, List[Board]]]:
+    """(start index, boards) chunks of `boards`, read as they are needed."""
+    boards = iter(boards)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(boards, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _indexed(future) -> Iterator[Tuple[int, Optional[Board]]]:
+    start, results = future.result()
+    return enumerate(results, start)
+
+
+def imap_solve(
+    boards: Iterable[Board],
+    algorithm: str = "dlx",
+    workers: Optional[int] = None,
+    chunksize: int = 64,
+    ordered: bool = True,
+    log_level: str = "WARNING",
+    max_steps: Optional[int] = None,
+) -> Iterator[Tuple[int, Optional[Board]]]:
+    """
+    Solve `boards` across `workers` processes (default: all cores), yielding
+    `(index, solution)` pairs – in input order, or as chunks complete when
+    `ordered` is False. `solution` is None for unsolvable boards and for
+    boards that need more than `max_steps` steps each (default:
+    settings.MAX_STEPS; 0 = unlimited).
+    """
+    if algorithm not in SOLVERS:
+        raise ValueError(f"Unknown algorithm: {algorithm!r} (expected one of {sorted(SOLVERS)})")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    max_steps = (settings.MAX_STEPS if max_steps is None else max_steps) or None
+    chunks = _chunks(boards, chunksize)
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(algorithm, log_level, max_steps)
+    ) as pool:
+        if ordered:
+            pending = deque()
+            for start, chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    yield from _indexed(pending.popleft())
+                pending.append(pool.submit(_solve_chunk, start, chunk))
+            while pending:
+                yield from _indexed(pending.popleft())
+        else:
+            pending = set()
+            for start, chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from _indexed(future)
+                pending.add(pool.submit(_solve_chunk, start, chunk))
+            for future in as_completed(pending):
+                yield from _indexed(future)
+
+def solve_many(
+    boards: Iterable[Board],
+    algorithm: str = "dlx",
+    workers: Optional[int] = None,
+    chunksize: int = 64,
+    max_steps: Optional[int] = None,
+) -> List[Optional[Board]]:
+    """Solve `boards` in parallel and return the solutions in input order."""
+    return [
+        solution for _, solution in imap_solve(boards, algorithm, workers, chunksize, max_steps=max_steps)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Scaling check: throughput with 1, 2, 4, ... workers
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import time
+    from src.utils.generator import generate_sized_puzzle
+
+    boards = [generate_sized_puzzle(3, 0.5, seed=i) for i in range(4000)]
+    counts: Dict[int, float] = {}
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        t0 = time.perf_counter()
+        solve_many(boards, "dlx-array", workers=workers)
+        counts[workers] = len(boards) / (time.perf_counter() - t0)
+        workers *= 2
+
+    print(f"{'Workers':>8} {'Boards/s':>10} {'Scaling':>8}")
+    for workers, rate in counts.items():
+        print(f"{workers:>8} {rate:>10.0f} {rate / counts[1]:>7.2f}×")
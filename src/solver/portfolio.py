@@ -0,0 +1,155 @@
+"""
+portfolio.py
+============
+Races several solver engines on the same board, each in its own process,
+and keeps the first answer.
+
+The backtracker wins easily on boards that propagation nearly solves, but
+it can blow up on adversarial ones. DLX has a steadier cost, including its
+fixed set-up. Running both and killing the loser caps the latency at
+roughly that of the faster engine (plus a process start).
+Every engine is complete, so the first engine to report "unsolvable" is
+as final as the first solution.
+
+Engine processes come from the "forkserver" start method ("spawn" where
+that is unavailable), never a plain fork: the API calls the portfolio
+from a threadpool thread, and forking a multi-threaded server can leave
+the child holding locks (logging handlers, ...) that no thread will ever
+release. The fork server preloads this module, so each engine start is a
+fork of a small single-threaded process, not a fresh interpreter.
+
+Step budgets and deadlines are passed on to the engines. The parent also
+watches the deadline and the cancellation token, and kills every engine
+when either trips.
+"""
+
+import multiprocessing as mp
+import queue
+import time
+from dataclasses import asdict
+from typing import Dict, List, Optional
+from src.solver.backtracking_solver import BacktrackingSolver
+from src.solver.benchmarker import BenchmarkResult
+from src.solver.dlx_solver import DLXSolver
+from src.solver.limits import BudgetExceeded, SolveLimits
+from src.logging_config import logger
+
+ENGINES = {
+    "Backtracking": BacktrackingSolver,
+    "DLX": DLXSolver,
+}
+
+
+def _context():
+    if "forkserver" in mp.get_all_start_methods():
+        context = mp.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return mp.get_context("spawn")
+
+
+_CONTEXT = _context()
+
+
+def _run_engine(name: str, board: List[List[int]], max_steps: Optional[int], deadline: Optional[float], results):
+    """Process target: solve with one engine and report (name, solution, benchmark, error)."""
+    solver = ENGINES[name]()
+    try:
+        solution = solver.solve(board, SolveLimits(max_steps=max_steps, deadline=deadline))
+    except BudgetExceeded as exc:
+        results.put((name, None, None, exc))
+        return
+    if solution is None:
+        # Rejected or unsolvable boards carry no benchmark
+        results.put((name, None, None, None))
+        return
+    results.put((name, solution, asdict(solver.benchmarker.last), None))
+
+
+class PortfolioSolver:
+    """
+    Runs `engines` (default: all of ENGINES) concurrently and returns the
+    first result. After `solve()`, `winner` names the engine that answered
+    and `benchmark` holds its BenchmarkResult (None if there was no solution).
+    """
+
+    def __init__(self, engines: Optional[List[str]] = None):
+        self.engines = list(engines or ENGINES)
+        unknown = [name for name in self.engines if name not in ENGINES]
+        if unknown:
+            raise ValueError(f"Unknown engine(s): {unknown} (expected {list(ENGINES)})")
+        self.winner: Optional[str] = None
+        self.benchmark: Optional[BenchmarkResult] = None
+        self.solve_time: float = 0.0
+
+    def solve(self, board: List[List[int]], limits: Optional[SolveLimits] = None) -> Optional[List[List[int]]]:
+        """
+        Return the first engine's solution (None if unsolvable). Raises
+        BudgetExceeded if every engine ran out of budget, or if the deadline
+        passes or the token is cancelled first.
+        """
+        limits = limits or SolveLimits.from_settings()
+        self.winner = None
+        self.benchmark = None
+        start = time.perf_counter()
+
+        results = _CONTEXT.Queue()
+        processes: Dict[str, mp.Process] = {
+            name: _CONTEXT.Process(
+                target=_run_engine,
+                args=(name, board, limits.max_steps, limits.deadline, results),
+                daemon=True,
+            )
+            for name in self.engines
+        }
+        for process in processes.values():
+            process.start()
+
+        try:
+            name, solution, bench = self._first_result(results, processes, limits, start)
+        finally:
+            self._cancel(processes)
+            results.close()
+            results.cancel_join_thread()
+
+        self.winner = name
+        self.benchmark = BenchmarkResult(**bench) if bench else None
+        self.solve_time = time.perf_counter() - start
+        logger.info(f"Portfolio won by {name} in {self.solve_time:.4f}s")
+        return solution
+
+    def _first_result(self, results, processes: Dict[str, mp.Process], limits: SolveLimits, start: float):
+        """
+        Wait for the first engine to answer. Engines that ran out of budget
+        are skipped until none is left.
+        """
+        errors: List[BudgetExceeded] = []
+        while True:
+            reason = limits.exceeded(0)
+            if reason is not None:
+                raise BudgetExceeded(reason, "Portfolio", 0, 0, time.perf_counter() - start)
+            wait = 0.05
+            if limits.deadline is not None:
+                wait = max(0.0, min(wait, limits.deadline - time.monotonic()))
+            try:
+                name, solution, bench, error = results.get(timeout=wait)
+            except queue.Empty:
+                if not any(p.is_alive() for p in processes.values()) and results.empty():
+                    raise RuntimeError("All portfolio engines exited without a result")
+                continue
+            if error is None:
+                return name, solution, bench
+            errors.append(error)
+            if len(errors) == len(processes):
+                # Report the engine that got furthest
+                raise max(errors, key=lambda exc: exc.steps)
+
+    @staticmethod
+    def _cancel(processes: Dict[str, mp.Process]):
+        """Terminate and reap every engine still running."""
+        for name, process in processes.items():
+            if process.is_alive():
+                process.terminate()
+                logger.debug(f"Portfolio cancelled {name}")
+        for process in processes.values():
+            process.join()
@@ -0,0 +1,174 @@
+"""
+profiling.py
+============
+Per-call profiling of solver work, written to disk for offline analysis.
+
+Two modes:
+
+  cprofile  deterministic cProfile of the call, saved as `.pstats`
+            (open it with `python -m pstats`, snakeviz or gprof2dot)
+  sampling  a background thread records the calling thread's Python stack
+            every PROFILE_INTERVAL_MS and saves the counts as collapsed
+            stacks, `.folded` (one "frame;frame;frame count" line per stack,
+            the input of flamegraph.pl and speedscope)
+
+cProfile sees every call but slows pure-Python hot loops down severalfold;
+sampling costs little, but misses anything shorter than the interval and
+is only useful for slow calls.
+
+`RequestProfiler.profile(label)` decides per call whether to profile: always
+when a mode is asked for explicitly (the API's `?profile=` flag), otherwise
+every PROFILE_SAMPLE_EVERY-th call (0 = never). Calls that are not profiled
+pay one counter increment. Files go to PROFILE_DIR.
+"""
+
+import cProfile
+import itertools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from src.config import settings
+from src.logging_config import logger
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack every `interval` seconds."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, thread_id: Optional[int] = None):
+        """Start sampling `thread_id` (default: the calling thread)."""
+        self._target = thread_id if thread_id is not None else threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack = ";".join(reversed(names))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+
+    def write(self, path: str):
+        """Write the samples in collapsed-stack format."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class ProfileCapture:
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.path: Optional[str] = None
+
+
+class RequestProfiler:
+    """
+    Profiles selected calls and writes one file per profiled call.
+    `path` of the yielded capture is set once the block has finished.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        mode: Optional[str] = None,
+        sample_every: Optional[int] = None,
+        interval_ms: Optional[float] = None,
+    ):
+        self.directory = directory or settings.PROFILE_DIR
+        self.mode = mode or settings.PROFILE_MODE
+        if self.mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {self.mode}")
+        self.sample_every = settings.PROFILE_SAMPLE_EVERY if sample_every is None else sample_every
+        self.interval = (settings.PROFILE_INTERVAL_MS if interval_ms is None else interval_ms) / 1000
+        self._calls = itertools.count(1)
+        self._files = itertools.count(1)
+
+    def should_profile(self) -> bool:
+        """True for every `sample_every`-th call."""
+        return self.sample_every > 0 and next(self._calls) % self.sample_every == 0
+
+    @contextmanager
+    def profile(self, label: str, mode: Optional[str] = None) -> Iterator[Optional[ProfileCapture]]:
+        """
+        Profile the block in `mode`, or in the default mode if this call is
+        sampled; yields None when the block is not profiled. The file is
+        written even if the block raises (e.g. BudgetExceeded).
+        """
+        if mode is None and not self.should_profile():
+            yield None
+            return
+        mode = mode or self.mode
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+
+        capture = ProfileCapture(mode)
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = SamplingProfiler(self.interval)
+            profiler.start()
+        try:
+            yield capture
+        finally:
+            if mode == "cprofile":
+                profiler.disable()
+            else:
+                profiler.stop()
+            capture.path = self._write(profiler, label, mode)
+
+    def _write(self, profiler, label: str, mode: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        extension = ".pstats" if mode == "cprofile" else ".folded"
+        path = os.path.join(self.directory, f"{stamp}-{os.getpid()}-{next(self._files):05d}-{label}{extension}")
+        if mode == "cprofile":
+            profiler.dump_stats(path)
+        else:
+            profiler.write(path)
+        logger.info(f"Profile of {label} written to {path}")
+        return path
+
+
+if __name__ == "__main__":
+    import pstats
+    import tempfile
+    from src.solver.backtracking_solver import BacktrackingSolver
+    from src.solver.limits import SolveLimits
+    from src.utils.generator import generate_sized_puzzle
+
+    puzzle = generate_sized_puzzle(3, 0.65, seed=3)
+    profiler = RequestProfiler(directory=tempfile.mkdtemp(), interval_ms=1)
+    paths = {}
+    for mode in PROFILE_MODES:
+        with profiler.profile("classic-9x9", mode=mode) as capture:
+            BacktrackingSolver(engine="classic", propagation="off").solve(puzzle, SolveLimits())
+        paths[mode] = capture.path
+        print(f"{mode:<9} -> {capture.path}")
+    pstats.Stats(paths["cprofile"]).sort_stats("tottime").print_stats(5)
@@ -0,0 +1,218 @@
+"""
+propagation.py
+==============
+Logical reduction of a Sudoku board before (or during) search.
+
+The propagator works on a flat candidate representation: `cands[i]` is a
+bitmask of the digits still possible in cell i (bit d-1 for digit d) and
+`values[i]` is the placed digit or 0. It repeatedly applies:
+
+  - naked singles:    a cell with one candidate gets that digit
+  - hidden singles:   a digit with one possible cell in a unit goes there
+  - pointing/claiming: a digit confined to one box/line intersection is
+                       removed from the rest of the line/box
+
+until nothing changes or a contradiction is found.
+"""
+
+import math
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+PROPAGATION_MODES = ("off", "prepass", "nodes")
+
+
+class _Tables:
+    """Precomputed unit/peer/intersection tables for an N×N grid (N = box²)."""
+
+    def __init__(self, box: int):
+        self.BOX = B = box
+        self.N = N = box * box
+        self.full = (1 << N) - 1
+
+        rows = [[r * N + c for c in range(N)] for r in range(N)]
+        cols = [[r * N + c for r in range(N)] for c in range(N)]
+        boxes = [
+            [(br + i) * N + (bc + j) for i in range(B) for j in range(B)]
+            for br in range(0, N, B) for bc in range(0, N, B)
+        ]
+        self.units: List[List[int]] = rows + cols + boxes
+
+        self.peers: List[Tuple[int, ...]] = []
+        for i in range(N * N):
+            r, c = divmod(i, N)
+            b = (r // B) * B + c // B
+            peers = set(rows[r]) | set(cols[c]) | set(boxes[b])
+            peers.discard(i)
+            self.peers.append(tuple(sorted(peers)))
+
+        # (intersection, rest of box, rest of line) for every box/line pair
+        self.intersections: List[Tuple[List[int], List[int], List[int]]] = []
+        for box in boxes:
+            box_set = set(box)
+            for line in rows + cols:
+                inter = [i for i in line if i in box_set]
+                if not inter:
+                    continue
+                self.intersections.append((
+                    inter,
+                    [i for i in box if i not in inter],
+                    [i for i in line if i not in box_set],
+                ))
+
+
+@lru_cache(maxsize=None)
+def tables_for(box: int) -> _Tables:
+    return _Tables(box)
+
+
+class ConstraintPropagator:
+    """
+    Naked/hidden singles and pointing/claiming eliminations.
+    `filled` counts the cells placed by propagation since the last reset.
+    """
+
+    def __init__(self):
+        self.tables = tables_for(3)
+        self.filled: int = 0
+
+    # -----------------------------------------------------------------------
+    # Board-level helpers
+    # -----------------------------------------------------------------------
+
+    def reduce(self, board: List[List[int]]) -> Optional[List[List[int]]]:
+        """
+        Return a copy of `board` with every cell propagation can deduce filled
+        in, or None if the board is contradictory.
+        """
+        self.filled = 0
+        state = self.initial_state(board)
+        if state is None:
+            return None
+        cands, values = state
+        if not self.propagate(cands, values):
+            return None
+        N = self.tables.N
+        return [values[r * N:(r + 1) * N] for r in range(N)]
+
+    def initial_state(self, board: List[List[int]]) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Build (cands, values) for a board, or None if a clue conflicts.
+        Also selects the tables for the board's size for later calls.
+        """
+        t = self.tables = tables_for(math.isqrt(len(board)))
+        values = [d for row in board for d in row]
+        cands = [t.full] * len(values)
+        for i, d in enumerate(values):
+            if d:
+                bit = 1 << (d - 1)
+                if not cands[i] & bit:
+                    return None
+                cands[i] = bit
+                for p in t.peers[i]:
+                    cands[p] &= ~bit
+        return cands, values
+
+    # -----------------------------------------------------------------------
+    # Propagation
+    # -----------------------------------------------------------------------
+
+    def propagate(self, cands: List[int], values: List[int]) -> bool:
+        """
+        Run all rules to a fixpoint, updating `cands` and `values` in place.
+        Returns False if the position is contradictory.
+        """
+        while True:
+            singles = self._singles(cands, values)
+            if singles is None:
+                return False
+            eliminated = self._pointing(cands)
+            if eliminated is None:
+                return False
+            if not singles and not eliminated:
+                return True
+
+    def _assign(self, cands: List[int], values: List[int], i: int, bit: int) -> bool:
+        values[i] = bit.bit_length()
+        cands[i] = bit
+        self.filled += 1
+        for p in self.tables.peers[i]:
+            if cands[p] & bit:
+                cands[p] &= ~bit
+                if not cands[p]:
+                    return False
+        return True
+
+    def _singles(self, cands: List[int], values: List[int]) -> Optional[int]:
+        """Naked and hidden singles to a fixpoint. Returns cells placed, or None."""
+        placed = 0
+        progress = True
+        while progress:
+            progress = False
+
+            for i, m in enumerate(cands):
+                if not m:
+                    return None
+                if not values[i] and not m & (m - 1):
+                    if not self._assign(cands, values, i, m):
+                        return None
+                    placed += 1
+                    progress = True
+
+            for unit in self.tables.units:
+                seen_once = 0
+                seen_twice = 0
+                solved = 0
+                for i in unit:
+                    m = cands[i]
+                    seen_twice |= seen_once & m
+                    seen_once |= m
+                    if values[i]:
+                        solved |= m
+                if seen_once != self.tables.full:
+                    return None  # some digit has nowhere to go
+                hidden = seen_once & ~seen_twice & ~solved
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for i in unit:
+                        if cands[i] & bit:
+                            if values[i]:
+                                break
+                            if not self._assign(cands, values, i, bit):
+                                return None
+                            placed += 1
+                            progress = True
+                            break
+        return placed
+
+    def _pointing(self, cands: List[int]) -> Optional[int]:
+        """Pointing pairs/triples and box/line claiming. Returns eliminations, or None."""
+        eliminated = 0
+        for inter, box_rest, line_rest in self.tables.intersections:
+            inter_mask = 0
+            for i in inter:
+                inter_mask |= cands[i]
+            box_mask = 0
+            for i in box_rest:
+                box_mask |= cands[i]
+            line_mask = 0
+            for i in line_rest:
+                line_mask |= cands[i]
+
+            # Digits the box can only place in this line leave the rest of the line
+            pointing = inter_mask & ~box_mask & line_mask
+            # Digits the line can only place in this box leave the rest of the box
+            claiming = inter_mask & ~line_mask & box_mask
+
+            for cells, mask in ((line_rest, pointing), (box_rest, claiming)):
+                if not mask:
+                    continue
+                for i in cells:
+                    if cands[i] & mask:
+                        cands[i] &= ~mask
+                        eliminated += 1
+                        if not cands[i]:
+                            return None
+        return eliminated
+
@@ -0,0 +1,78 @@
+"""
+search_stats.py
+===============
+Opt-in search-tree instrumentation for BacktrackingSolver and DLXSolver.
+
+Scalar counters (steps, backtracks, nodes_visited) say how much a search
+did, but not why. A solver created with `instrument=True` also fills a
+SearchStats for every solve:
+
+  nodes_by_depth      nodes entered at each depth of the search tree
+  choice_sizes        how many options each branching node had: the
+                      candidate count of the chosen cell (backtracking) or
+                      the size of the chosen column (DLX)
+  branching_factor    average of choice_sizes
+  dead_ends_by_depth  leaves where the search had to give up, per depth
+  dead_end_reasons    what ran out at those leaves: "cell" (a cell with no
+                      candidate), "row"/"column"/"box" (a digit with no
+                      place left in that unit, DLX only) or "propagation"
+                      (propagation found a contradiction)
+
+Uninstrumented solvers keep `stats` at None and pay one `is not None`
+test per node. The result is exposed as `solver.stats`, in
+`BenchmarkResult.search_stats` and, with `?instrument=true`, in the API.
+"""
+
+from typing import Any, Dict, List
+
+CONSTRAINTS = ("cell", "row", "column", "box")   # DLX column blocks, in matrix order
+
+
+class SearchStats:
+    """Per-depth node, choice and dead-end counts of one search."""
+
+    __slots__ = ("nodes_by_depth", "dead_ends_by_depth", "choice_sizes", "dead_end_reasons")
+
+    def __init__(self):
+        self.nodes_by_depth: List[int] = []
+        self.dead_ends_by_depth: List[int] = []
+        self.choice_sizes: Dict[int, int] = {}
+        self.dead_end_reasons: Dict[str, int] = {}
+
+    def node(self, depth: int):
+        if depth >= len(self.nodes_by_depth):
+            self.nodes_by_depth.extend([0] * (depth + 1 - len(self.nodes_by_depth)))
+        self.nodes_by_depth[depth] += 1
+
+    def choice(self, size: int):
+        self.choice_sizes[size] = self.choice_sizes.get(size, 0) + 1
+
+    def dead_end(self, depth: int, reason: str):
+        if depth >= len(self.dead_ends_by_depth):
+            self.dead_ends_by_depth.extend([0] * (depth + 1 - len(self.dead_ends_by_depth)))
+        self.dead_ends_by_depth[depth] += 1
+        self.dead_end_reasons[reason] = self.dead_end_reasons.get(reason, 0) + 1
+
+    @property
+    def nodes(self) -> int:
+        return sum(self.nodes_by_depth)
+
+    @property
+    def max_depth(self) -> int:
+        return max(0, len(self.nodes_by_depth) - 1)
+
+    @property
+    def branching_factor(self) -> float:
+        choices = sum(self.choice_sizes.values())
+        return sum(size * count for size, count in self.choice_sizes.items()) / choices if choices else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nodes": self.nodes,
+            "max_depth": self.max_depth,
+            "branching_factor": self.branching_factor,
+            "nodes_by_depth": list(self.nodes_by_depth),
+            "choice_sizes": dict(sorted(self.choice_sizes.items())),
+            "dead_ends_by_depth": list(self.dead_ends_by_depth),
+            "dead_end_reasons": dict(self.dead_end_reasons),
+        }
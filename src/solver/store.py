@@ -0,0 +1,220 @@
+"""
+store.py
+========
+Persistent puzzle -> solution store backed by SQLite.
+
+Rows live in one `WITHOUT ROWID` table keyed by the puzzle's compact
+encoding: two cells per byte for 4×4 and 9×9 (41 bytes for a 9×9 board),
+raw bytes for larger sizes. Lookups are B-tree probes on disk, so the
+store scales to tens of millions of entries without loading them into
+memory.
+
+Writes are buffered and committed in batches of `batch_size` (or on
+`flush()`/`close()`). Buffered entries are visible to `get()` straight away.
+
+Bulk-loading a corpus:
+
+    python -m src.solver.store load puzzles.csv --db data/solutions.db
+    python -m src.solver.store stats --db data/solutions.db
+
+Corpus lines are either `puzzle,solution` (81-character strings, as in
+the common Kaggle CSVs; a header line is skipped) or JSON objects with
+"puzzle" and "solution" keys. Lines without a solution are solved with
+DLXSolver when `--solve` is given and skipped otherwise. `--validate`
+checks every solution against its puzzle, a batch at a time.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+import numpy as np
+from src.solver.board import Board
+from src.solver.validator import SudokuValidator
+from src.logging_config import logger
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS solutions (puzzle BLOB PRIMARY KEY, solution BLOB NOT NULL) WITHOUT ROWID"
+_PACKED_SIZES = {8: 4, 41: 9}     # packed blob length -> board size
+
+
+def encode(board: Board) -> bytes:
+    """Compact, unambiguous key/value encoding of a board."""
+    return board.pack() if board.size <= 9 else board.cells
+
+
+def decode(blob: bytes) -> Board:
+    size = _PACKED_SIZES.get(len(blob))
+    return Board.from_packed(blob, size) if size else Board(blob)
+
+
+class SolutionStore:
+    """Thread-safe SQLite-backed store with batched write-back."""
+
+    def __init__(self, path: str, batch_size: int = 500):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._pending: Dict[bytes, bytes] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, board: Board) -> Optional[Board]:
+        key = encode(board)
+        with self._lock:
+            value = self._pending.get(key)
+            if value is None:
+                row = self._conn.execute("SELECT solution FROM solutions WHERE puzzle = ?", (key,)).fetchone()
+                value = row[0] if row else None
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return decode(value)
+
+    def put(self, board: Board, solution: Board):
+        """Buffer an entry; the buffer is committed once it holds `batch_size` entries."""
+        with self._lock:
+            self._pending[encode(board)] = encode(solution)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def put_many(self, pairs: Iterable[Tuple[Board, Board]], validate: bool = False) -> int:
+        """
+        Insert many entries in batched transactions. Returns the number inserted.
+        With `validate`, each batch is checked with SudokuValidator.validate_many
+        and pairs whose solution is incomplete, invalid or contradicts the
+        puzzle's clues are skipped.
+        """
+        inserted = 0
+        batch = []
+        for pair in pairs:
+            batch.append(pair)
+            if len(batch) >= self.batch_size:
+                inserted += self._insert(batch, validate)
+                batch = []
+        if batch:
+            inserted += self._insert(batch, validate)
+        return inserted
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        batch = list(self._pending.items())
+        self._pending.clear()
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?)", batch)
+        logger.debug(f"Solution store: committed {len(batch)} entries")
+
+    def _insert(self, batch, validate: bool) -> int:
+        if validate:
+            batch = _valid_pairs(batch)
+        rows = [(encode(board), encode(solution)) for board, solution in batch]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO solutions VALUES (?, ?)", rows)
+            return self._conn.total_changes - before
+
+
+def _valid_pairs(batch):
+    """The pairs of `batch` whose solution is a correct completion of the puzzle."""
+    keep = []
+    for size in {solution.size for _, solution in batch}:
+        group = [(b, s) for b, s in batch if s.size == size and b.size == size]
+        if not group:
+            continue
+        puzzles = np.frombuffer(b"".join(b.cells for b, _ in group), dtype=np.uint8).reshape(len(group), -1)
+        solutions = np.frombuffer(b"".join(s.cells for _, s in group), dtype=np.uint8).reshape(len(group), -1)
+        valid, _ = SudokuValidator.validate_many(solutions, group[0][1].box)
+        valid &= (solutions > 0).all(axis=1)
+        valid &= ((puzzles == 0) | (puzzles == solutions)).all(axis=1)
+        keep.extend(pair for pair, ok in zip(group, valid) if ok)
+    if len(keep) < len(batch):
+        logger.warning(f"Solution store: skipped {len(batch) - len(keep)} invalid entries")
+    return keep
+
+
+# ---------------------------------------------------------------------------
+# Corpus loading
+# ---------------------------------------------------------------------------
+
+def read_corpus(path: str, solve: bool = False) -> Iterator[Tuple[Board, Board]]:
+    """Stream (puzzle, solution) pairs from a CSV or JSONL corpus file."""
+    solver = None
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                if line.startswith("{"):
+                    record = json.loads(line)
+                    puzzle, solution = record["puzzle"], record.get("solution")
+                else:
+                    fields = line.split(",")
+                    puzzle, solution = fields[0], (fields[1] if len(fields) > 1 else None)
+                puzzle = Board.coerce(puzzle)
+                solution = Board.coerce(solution) if solution else None
+            except (ValueError, KeyError) as exc:
+                if number > 1:
+                    logger.warning(f"{path}:{number}: skipped ({exc})")
+                continue   # a bad first line is taken to be a header
+
+            if solution is None:
+                if not solve:
+                    continue
+                if solver is None:
+                    from src.solver.dlx_solver import DLXSolver
+                    solver = DLXSolver()
+                solution = solver.solve(puzzle)
+                if solution is None:
+                    logger.warning(f"{path}:{number}: unsolvable puzzle skipped")
+                    continue
+            yield puzzle, solution
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from src.config import settings
+
+    parser = argparse.ArgumentParser(description="Manage the persistent solution store")
+    parser.add_argument("command", choices=["load", "stats"])
+    parser.add_argument("corpus", nargs="?", help="CSV or JSONL corpus file (for 'load')")
+    parser.add_argument("--db", default=settings.SOLUTION_STORE_PATH or "data/solutions.db")
+    parser.add_argument("--batch", type=int, default=10_000, help="rows per transaction")
+    parser.add_argument("--solve", action="store_true", help="solve puzzles that come without a solution")
+    parser.add_argument("--validate", action="store_true", help="skip entries whose solution does not check out")
+    args = parser.parse_args()
+
+    store = SolutionStore(args.db, batch_size=args.batch)
+    if args.command == "load":
+        if not args.corpus:
+            parser.error("load needs a corpus file")
+        t0 = time.perf_counter()
+        inserted = store.put_many(read_corpus(args.corpus, solve=args.solve), validate=args.validate)
+        print(f"Inserted {inserted} new entries in {time.perf_counter() - t0:.1f}s")
+    print(f"{args.db}: {len(store)} entries")
+    store.close()
@@ -1,69 +1,128 @@
-from typing import List, Optional
+import math
+from functools import lru_cache
+from typing import Optional, Tuple
 import numpy as np
+from src.solver.board import Board, BoardLike, SUPPORTED_BOX_SIZES, SUPPORTED_SIZES
 from src.logging_config import logger
 
+_VALIDATE_CHUNK = 16384    # boards per bincount in validate_many (bounds the count table)
+
+
+@lru_cache(maxsize=None)
+def _unit_cells(box: int) -> np.ndarray:
+    """Cell indices of every row, column and box, as a (3N, N) array."""
+    n = box * box
+    grid = np.arange(n * n).reshape(n, n)
+    boxes = grid.reshape(box, box, box, box).transpose(0, 2, 1, 3).reshape(n, n)
+    return np.concatenate([grid, grid.T, boxes])
+
+
 class SudokuValidator:
     """
     Validation logic for Sudoku boards and moves.
+    Boards are N×N with N = box², for the box sizes in SUPPORTED_BOX_SIZES,
+    given as lists of rows or as Board objects.
     """
+
+    @staticmethod
+    def box_size(board: BoardLike) -> Optional[int]:
+        """Returns the box size of a square board with a supported size, else None."""
+        if isinstance(board, Board):
+            return board.box
+        n = len(board) if board else 0
+        box = math.isqrt(n)
+        if box * box != n or box not in SUPPORTED_BOX_SIZES or any(len(row) != n for row in board):
+            return None
+        return box
     
     @staticmethod
-    def is_valid_board(board: List[List[int]]) -> bool:
+    def is_valid_board(board: BoardLike) -> bool:
         """Checks if the initial board config is valid (no duplicates in rows, cols, or boxes)."""
-        if not board or len(board) != 9 or any(len(row) != 9 for row in board):
+        box = SudokuValidator.box_size(board)
+        if box is None:
             logger.error("Invalid board dimensions")
             return False
+        n = box * box
             
-        board_np = np.array(board)
-        
-        # Check rows and columns
-        for i in range(9):
-            if not SudokuValidator._is_valid_group(board_np[i, :]) or \
-               not SudokuValidator._is_valid_group(board_np[:, i]):
-                return False
-                
-        # Check 3x3 boxes
-        for r in range(0, 9, 3):
-            for c in range(0, 9, 3):
-                box = board_np[r:r+3, c:c+3].flatten()
-                if not SudokuValidator._is_valid_group(box):
-                    return False
-                    
-        return True
+        board_np = SudokuValidator._as_array(board)
+        if board_np.min() < 0 or board_np.max() > n:
+            logger.error(f"Board values must be between 0 and {n}")
+            return False
+
+        return bool(SudokuValidator._first_conflicts(board_np.reshape(1, n * n), box)[0] < 0)
+
+    @staticmethod
+    def validate_many(boards: np.ndarray, box: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Validate a batch of boards, given as a (B, N²) or (B, N, N) array.
+        Returns `(valid, conflicts)`: a (B,) bool mask, and for each board the
+        first unit holding a duplicate digit (rows 0..N-1, columns N..2N-1,
+        boxes 2N..3N-1 in row-major order), or -1. A board with values
+        outside 0..N is invalid with conflict -1.
+        """
+        n = box * box
+        boards = np.asarray(boards)
+        if box not in SUPPORTED_BOX_SIZES or boards.size % (n * n):
+            raise ValueError(f"Expected a batch of {n}×{n} boards, got shape {boards.shape}")
+        boards = boards.reshape(-1, n * n)
+        in_range = ((boards >= 0) & (boards <= n)).all(axis=1)
+        conflicts = np.full(len(boards), -1, dtype=np.intp)
+        for start in range(0, len(boards), _VALIDATE_CHUNK):
+            chunk = boards[start:start + _VALIDATE_CHUNK]
+            chunk = np.where(in_range[start:start + _VALIDATE_CHUNK, None], chunk, 0)
+            conflicts[start:start + len(chunk)] = SudokuValidator._first_conflicts(chunk, box)
+        return in_range & (conflicts < 0), conflicts
 
     @staticmethod
-    def _is_valid_group(group: np.ndarray) -> bool:
-        """Helper to check for duplicates in a 1D array, ignoring zeros."""
-        nums = group[group != 0]
-        return len(nums) == len(set(nums))
+    def _first_conflicts(boards: np.ndarray, box: int) -> np.ndarray:
+        """
+        First duplicated unit per board (-1 if none) for a (B, N²) array with
+        values in 0..N: one bincount of (board, unit, digit) triples.
+        """
+        n = box * box
+        units = _unit_cells(box)                              # (3N, N) cell indices
+        values = boards[:, units].astype(np.intp)             # (B, 3N, N)
+        slots = np.arange(values.shape[0] * 3 * n).reshape(-1, 3 * n, 1) * (n + 1)
+        counts = np.bincount((slots + values).ravel(), minlength=values.shape[0] * 3 * n * (n + 1))
+        dup = (counts.reshape(-1, 3 * n, n + 1)[:, :, 1:] > 1).any(axis=2)
+        return np.where(dup.any(axis=1), dup.argmax(axis=1), -1)
 
     @staticmethod
-    def is_safe_move(board: List[List[int]], row: int, col: int, num: int) -> bool:
+    def _as_array(board: BoardLike) -> np.ndarray:
+        return board.to_numpy() if isinstance(board, Board) else np.array(board)
+
+    @staticmethod
+    def is_safe_move(board: BoardLike, row: int, col: int, num: int) -> bool:
         """Checks if placing num at board[row][col] is valid."""
+        n = len(board)
+        box = math.isqrt(n)
+
         # Row check
-        for x in range(9):
+        for x in range(n):
             if board[row][x] == num:
                 return False
         
         # Column check
-        for x in range(9):
+        for x in range(n):
             if board[x][col] == num:
                 return False
         
         # Box check
-        start_row = row - row % 3
-        start_col = col - col % 3
-        for i in range(3):
-            for j in range(3):
+        start_row = row - row % box
+        start_col = col - col % box
+        for i in range(box):
+            for j in range(box):
                 if board[i + start_row][j + start_col] == num:
                     return False
         
         return True
 
     @staticmethod
-    def is_solved(board: List[List[int]]) -> bool:
+    def is_solved(board: BoardLike) -> bool:
         """Verifies if the board is completely and correctly filled."""
-        board_np = np.array(board)
+        if SudokuValidator.box_size(board) is None:
+            return False
+        board_np = SudokuValidator._as_array(board)
         if 0 in board_np:
             return False
             
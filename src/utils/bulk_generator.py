@@ -0,0 +1,152 @@
+"""
+bulk_generator.py
+=================
+Seeded, parallel generation of large unique-puzzle sets, streamed to disk:
+
+    python -m src.utils.bulk_generator puzzles.jsonl --count 100000 --difficulty easy --difficulty hard
+    python -m src.utils.bulk_generator hard.txt --count 5000 --difficulty hard --seed 7 --workers 8
+
+Each difficulty is split into chunks of `chunksize` puzzles. A chunk is
+generated by one SudokuGenerator whose RNG is seeded from (seed,
+difficulty, chunk index) through numpy's SeedSequence, so every chunk has
+an independent stream and the output depends only on the seed and the
+chunk size, never on the worker count or on scheduling. Chunks are written in order, and at
+most `2 × workers` of them are in flight, so memory stays bounded however
+many puzzles are asked for.
+
+Formats: "jsonl" writes {"puzzle", "solution", "difficulty", "clues"}
+records, which `python -m src.solver.store load` accepts. "lines" writes
+one 81-character puzzle per line, with 0 for an empty cell. The format
+follows the file extension unless given.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from src.solver.board import Board
+from src.utils.generator import DIFFICULTY_REMOVALS, SudokuGenerator
+
+FORMATS = ("jsonl", "lines")
+
+Puzzle = Tuple[str, str, int]   # puzzle, solution (81-character strings), clue count
+
+
+def chunk_seed(seed: int, difficulty: str, chunk: int) -> int:
+    """Seed of one chunk's RNG stream, independent of every other chunk's."""
+    level = list(DIFFICULTY_REMOVALS).index(difficulty)
+    state = np.random.SeedSequence(seed, spawn_key=(level, chunk)).generate_state(2, dtype=np.uint64)
+    return int(state[0]) << 64 | int(state[1])
+
+
+def generate_chunk(difficulty: str, seed: int, chunk: int, size: int) -> List[Puzzle]:
+    generator = SudokuGenerator(difficulty, seed=chunk_seed(seed, difficulty, chunk))
+    puzzles = []
+    for _ in range(size):
+        puzzle = generator.generate_puzzle()
+        clues = sum(1 for row in puzzle for v in row if v)
+        puzzles.append((str(Board.from_rows(puzzle)), str(Board.from_rows(generator.solution)), clues))
+    return puzzles
+
+
+def iter_puzzles(
+    difficulty: str,
+    count: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    chunksize: int = 100,
+) -> Iterator[Puzzle]:
+    """
+    `count` unique puzzles of one difficulty, in a reproducible order,
+    generated across `workers` processes (default: all cores; 1 runs
+    in-process).
+    """
+    if difficulty not in DIFFICULTY_REMOVALS:
+        raise ValueError(f"Unknown difficulty: {difficulty!r} (expected one of {list(DIFFICULTY_REMOVALS)})")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    sizes = [min(chunksize, count - start) for start in range(0, count, chunksize)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for chunk, size in enumerate(sizes):
+            yield from generate_chunk(difficulty, seed, chunk, size)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk, size in enumerate(sizes):
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(generate_chunk, difficulty, seed, chunk, size))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def generate_bulk(
+    path: str,
+    counts: Dict[str, int],
+    seed: int = 0,
+    fmt: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 100,
+    progress: Optional[Callable[[str, int, int, float], None]] = None,
+) -> int:
+    """
+    Write `counts[difficulty]` puzzles per difficulty to `path`. `progress`
+    is called as (difficulty, done, total, seconds spent on this difficulty)
+    after every chunk. Returns the number of puzzles written.
+    """
+    fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".json")) else "lines")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt!r} (expected one of {FORMATS})")
+
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for difficulty, count in counts.items():
+            done = 0
+            start = time.perf_counter()
+            for puzzle, solution, clues in iter_puzzles(difficulty, count, seed, workers, chunksize):
+                if fmt == "jsonl":
+                    record = {"puzzle": puzzle, "solution": solution, "difficulty": difficulty, "clues": clues}
+                    f.write(json.dumps(record) + "\n")
+                else:
+                    f.write(puzzle + "\n")
+                done += 1
+                if progress is not None and (done % chunksize == 0 or done == count):
+                    progress(difficulty, done, count, time.perf_counter() - start)
+            written += done
+    return written
+
+
+def _print_progress(difficulty: str, done: int, total: int, elapsed: float):
+    print(f"\r  {difficulty:<7} {done:>9}/{total:<9} {done / elapsed if elapsed else 0:>8.0f} puzzles/s",
+          end="\n" if done == total else "", file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate seeded sets of unique Sudoku puzzles")
+    parser.add_argument("output", help="output file (.jsonl for JSON lines, anything else for 81-character lines)")
+    parser.add_argument("--count", type=int, default=1000, help="puzzles per difficulty")
+    parser.add_argument("--difficulty", action="append", choices=list(DIFFICULTY_REMOVALS),
+                        help="difficulty to generate (repeatable; default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=FORMATS, help="output format (default: from the extension)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=100, help="puzzles per task")
+    args = parser.parse_args()
+
+    difficulties = args.difficulty or list(DIFFICULTY_REMOVALS)
+    t0 = time.perf_counter()
+    total = generate_bulk(
+        args.output, {d: args.count for d in difficulties}, args.seed, args.format,
+        args.workers, args.chunksize, _print_progress,
+    )
+    elapsed = time.perf_counter() - t0
+    print(f"Wrote {total} puzzles to {args.output} in {elapsed:.1f}s ({total / elapsed:.0f} puzzles/s)")
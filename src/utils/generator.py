@@ -1,10 +1,34 @@
 import random
-from .helpers import valid
+from src.solver.incremental import IncrementalBoard
+from src.solver.ordering import ascending, mrv, shuffled
+
+# Cells blanked per difficulty: a target, as the puzzle must stay unique
+DIFFICULTY_REMOVALS = {'easy': 30, 'medium': 45, 'hard': 55}
 
 class SudokuGenerator:
-    def __init__(self, difficulty='medium'):
+    """
+    Random 9×9 puzzles with exactly one solution.
+
+    The solution grid is filled by an MRV search that tries digits in
+    random order. Clues are then removed one at a time, in random order,
+    and a removal is kept only if the puzzle stays unique, until the
+    difficulty's target is met or every cell has been tried (hard targets
+    are not always reachable). Removing clue d from a cell keeps the puzzle
+    unique exactly when no solution puts another digit there, so each
+    check is a solution search with a cutoff on the cell's other candidates.
+    A cell left with d as its only candidate is accepted without search.
+
+    The searches run on an IncrementalBoard, kept up to date across
+    removals, with the cell and digit orderings of ordering.py. Pass `seed`
+    for a reproducible puzzle.
+    """
+
+    def __init__(self, difficulty='medium', seed=None):
         self.grid = [[0 for _ in range(9)] for _ in range(9)]
+        self.solution = None
         self.difficulty = difficulty
+        self.rng = random.Random(seed)
+        self._found = 0
 
     def fill_diagonal(self):
         """Fills the three diagonal 3x3 matrices."""
@@ -14,50 +38,137 @@ class SudokuGenerator:
     def fill_box(self, row, col):
         """Fills a 3x3 box with random numbers 1-9."""
         num_list = list(range(1, 10))
-        random.shuffle(num_list)
+        self.rng.shuffle(num_list)
         for i in range(3):
             for j in range(3):
                 self.grid[row + i][col + j] = num_list.pop()
 
     def solve_grid(self):
-        """Recursively fills the rest of the grid to create a complete valid Soduko."""
-        for i in range(9):
-            for j in range(9):
-                if self.grid[i][j] == 0:
-                    nums = list(range(1, 10))
-                    random.shuffle(nums)
-                    for num in nums:
-                        if valid(self.grid, i, j, num):
-                            self.grid[i][j] = num
-                            if self.solve_grid():
-                                return True
-                            self.grid[i][j] = 0
-                    return False
-        return True
+        """Fills the rest of the grid to create a complete valid Sudoku."""
+        state, empties = self._load()
+        return self._fill(state, empties, 0)
+
+    def count_solutions(self, limit=2):
+        """Solutions of the current grid, counting stops at `limit`. The grid is left unchanged."""
+        state, empties = self._load()
+        self._found = 0
+        self._count(state, empties, 0, limit)
+        return self._found
 
     def remove_digits(self):
-        """Removes digits based on difficulty level."""
-        count = {
-            'easy': 30,
-            'medium': 45,
-            'hard': 55
-        }.get(self.difficulty, 45)
-
-        while count > 0:
-            i = random.randint(0, 8)
-            j = random.randint(0, 8)
-            if self.grid[i][j] != 0:
-                self.grid[i][j] = 0
-                count -= 1
+        """Blanks cells while the puzzle keeps a unique solution."""
+        target = DIFFICULTY_REMOVALS.get(self.difficulty, 45)
+        state, empties = self._load()
+        cells = list(range(81))
+        self.rng.shuffle(cells)
+
+        removed = 0
+        for cell in cells:
+            if removed == target:
+                break
+            r, c = divmod(cell, 9)
+            digit = self.grid[r][c]
+            state.place(r, c, 0)
+            if self._unique_without(state, r, c, digit, empties):
+                empties.append((r, c, (r // 3) * 3 + c // 3))
+                removed += 1
+            else:
+                state.undo()
+        return removed
 
     def generate_puzzle(self):
-        """Generates a new random Sudoku puzzle."""
+        """Generates a new random Sudoku puzzle with a unique solution."""
         self.grid = [[0 for _ in range(9)] for _ in range(9)]
         self.fill_diagonal()
         self.solve_grid()
+        self.solution = [row[:] for row in self.grid]
         self.remove_digits()
         return [row[:] for row in self.grid]
 
-def generate_new_puzzle(difficulty='medium'):
-    generator = SudokuGenerator(difficulty)
+    # -----------------------------------------------------------------------
+    # Search
+    # -----------------------------------------------------------------------
+
+    def _load(self):
+        """An IncrementalBoard sharing self.grid, and its blank cells as (row, col, box)."""
+        state = IncrementalBoard(self.grid)
+        self.grid = state.grid
+        empties = [(r, c, (r // 3) * 3 + c // 3) for r in range(9) for c in range(9) if not self.grid[r][c]]
+        return state, empties
+
+    def _choose(self, state, empties, k):
+        """MRV cell among empties[k:], swapped to position k; returns its candidates."""
+        best, mask = mrv(empties, k, state.rows, state.cols, state.boxes, state.full)
+        empties[k], empties[best] = empties[best], empties[k]
+        return mask
+
+    def _fill(self, state, empties, k):
+        if k == len(empties):
+            return True
+        mask = self._choose(state, empties, k)
+        r, c, _ = empties[k]
+        for bit in shuffled(mask, empties, k, state.rows, state.cols, state.boxes, state.full, self.rng):
+            state.place(r, c, bit.bit_length())
+            if self._fill(state, empties, k + 1):
+                return True
+            state.undo()
+        return False
+
+    def _count(self, state, empties, k, limit):
+        """Count solutions into self._found; True once `limit` is reached. The board is restored."""
+        if k == len(empties):
+            self._found += 1
+            return self._found >= limit
+        mask = self._choose(state, empties, k)
+        r, c, _ = empties[k]
+        for bit in ascending(mask, empties, k, state.rows, state.cols, state.boxes, state.full, self.rng):
+            state.place(r, c, bit.bit_length())
+            stop = self._count(state, empties, k + 1, limit)
+            state.undo()
+            if stop:
+                return True
+        return False
+
+    def _unique_without(self, state, r, c, digit, empties):
+        """Whether the puzzle, with (r, c) just blanked from `digit`, still has one solution."""
+        others = state.candidates(r, c) & ~(1 << (digit - 1))
+        if not others:
+            return True   # the clue is a naked single: implied by the others
+        # Any solution with another digit in (r, c) would be a second solution
+        self._found = 0
+        for bit in ascending(others, empties, 0, state.rows, state.cols, state.boxes, state.full, self.rng):
+            state.place(r, c, bit.bit_length())
+            found = self._count(state, empties, 0, 1)
+            state.undo()
+            if found:
+                return False
+        return True
+
+def generate_sized_puzzle(box=3, empty_ratio=0.5, seed=None):
+    """
+    Returns a random N×N puzzle (N = box²) with roughly `empty_ratio` of the
+    cells blanked. The solution grid comes from the standard shifted
+    pattern with rows, columns and digits shuffled; uniqueness is not
+    guaranteed, so this is meant for tests and benchmarks.
+    """
+    rng = random.Random(seed)
+    n = box * box
+
+    def shuffled_axis():
+        bands = rng.sample(range(box), box)
+        return [b * box + i for b in bands for i in rng.sample(range(box), box)]
+
+    rows, cols = shuffled_axis(), shuffled_axis()
+    digits = rng.sample(range(1, n + 1), n)
+    grid = [
+        [digits[(box * (r % box) + r // box + c) % n] for c in cols]
+        for r in rows
+    ]
+
+    for cell in rng.sample(range(n * n), int(n * n * empty_ratio)):
+        grid[cell // n][cell % n] = 0
+    return grid
+
+def generate_new_puzzle(difficulty='medium', seed=None):
+    generator = SudokuGenerator(difficulty, seed)
     return generator.generate_puzzle()
@@ -0,0 +1,30 @@
+import os
+import pytest
+
+PERF_BASELINE = os.path.join(os.path.dirname(__file__), "perf_baseline.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "performance regression suite")
+    group.addoption("--perf", action="store_true", help="run the performance regression suite")
+    group.addoption("--perf-update", action="store_true", help="run the suite and rewrite the baseline")
+    group.addoption("--perf-baseline", default=PERF_BASELINE, help="baseline JSON file")
+    group.addoption("--perf-tolerance", type=float, default=None,
+                    help="allowed growth of search counters as a fraction (default 0.25)")
+    group.addoption("--perf-timing-tolerance", type=float, default=None,
+                    help="allowed slowdown of latency/throughput as a fraction (default 0.5)")
+    group.addoption("--perf-timing", action="store_true",
+                    help="also compare latency and throughput (only meaningful on the baseline's machine)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: performance regression suite (run with --perf)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--perf") or config.getoption("--perf-update"):
+        return
+    skip = pytest.mark.skip(reason="performance suite: run with --perf")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip)
@@ -1,3 +1,5 @@
+import threading
+import time
 import pytest
 from fastapi.testclient import TestClient
 from src.api.main import app
@@ -46,3 +48,164 @@ def test_solve_dlx():
     assert response.status_code == 200
     assert response.json()["success"] is True
     assert response.json()["algorithm"] == "DLX"
+
+def test_count_solutions_unique():
+    puzzle = {
+        "board": [
+            [5, 3, 0, 0, 7, 0, 0, 0, 0],
+            [6, 0, 0, 1, 9, 5, 0, 0, 0],
+            [0, 9, 8, 0, 0, 0, 0, 6, 0],
+            [8, 0, 0, 0, 6, 0, 0, 0, 3],
+            [4, 0, 0, 8, 0, 3, 0, 0, 1],
+            [7, 0, 0, 0, 2, 0, 0, 0, 6],
+            [0, 6, 0, 0, 0, 0, 2, 8, 0],
+            [0, 0, 0, 4, 1, 9, 0, 0, 5],
+            [0, 0, 0, 0, 8, 0, 0, 7, 9]
+        ]
+    }
+    for algorithm in ("dlx", "backtracking"):
+        response = client.post("/api/v1/count", json={**puzzle, "algorithm": algorithm})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["count"] == 1
+        assert body["unique"] is True
+        assert body["exhaustive"] is True
+
+def test_count_solutions_stops_at_limit():
+    response = client.post("/api/v1/count", json={"board": [[0] * 9 for _ in range(9)], "limit": 5})
+    assert response.status_code == 200
+    assert response.json()["count"] == 5
+    assert response.json()["exhaustive"] is False
+
+def test_solve_dlx_16x16():
+    from src.utils.generator import generate_sized_puzzle
+    board = generate_sized_puzzle(box=4, empty_ratio=0.5, seed=7)
+    response = client.post("/api/v1/solve/dlx", json={"board": board})
+    assert response.status_code == 200
+    assert len(response.json()["solved_board"]) == 16
+
+def test_solve_rejects_bad_dimensions():
+    response = client.post("/api/v1/solve/dlx", json={"board": [[0] * 8 for _ in range(8)]})
+    assert response.status_code == 422
+
+def test_solve_portfolio():
+    response = client.post("/api/v1/solve/portfolio", json={"board": [[0] * 9 for _ in range(9)]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["algorithm"] == "Portfolio"
+    assert data["winner"] in ("Backtracking", "DLX")
+    assert data["message"] == f"Solved successfully by {data['winner']}"
+
+def test_solve_budget_exceeded(monkeypatch):
+    from src.config import settings
+    monkeypatch.setattr(settings, "MAX_STEPS", 5)
+    response = client.post("/api/v1/solve/backtracking", json={"board": [[0] * 9 for _ in range(9)]})
+    assert response.status_code == 503
+    data = response.json()
+    assert data["reason"] == "steps"
+    assert data["algorithm"] == "Backtracking"
+    assert data["steps"] == 5
+
+def test_solve_rejects_bad_deadline_header():
+    response = client.post(
+        "/api/v1/solve/dlx", json={"board": [[0] * 9 for _ in range(9)]}, headers={"X-Deadline-Ms": "0"}
+    )
+    assert response.status_code == 422
+
+def test_solve_stream():
+    import json
+    board = [[0] * 4 for _ in range(4)]
+    response = client.post("/api/v1/solve/stream", json={"board": board, "engine": "classic"})
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["event"] == "try"
+    assert events[-1]["event"] == "solved"
+    for event in events:
+        if event["event"] == "place":
+            board[event["row"]][event["col"]] = event["digit"]
+        elif event["event"] == "backtrack":
+            board[event["row"]][event["col"]] = 0
+    assert all(all(row) for row in board)
+
+def test_solve_accepts_board_string():
+    text = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+    response = client.post("/api/v1/solve/dlx", json={"board": text})
+    assert response.status_code == 200
+    assert response.json()["solved_board"][0] == [5, 3, 4, 6, 7, 8, 9, 1, 2]
+
+    response = client.post("/api/v1/solve/dlx", json={"board": text[:-1]})
+    assert response.status_code == 422
+
+def test_solve_served_from_cache():
+    board = [
+        [0, 0, 0, 0, 0, 0, 0, 1, 2], [0, 0, 0, 0, 3, 5, 0, 0, 0], [0, 0, 0, 6, 0, 0, 0, 7, 0],
+        [7, 0, 0, 0, 0, 0, 3, 0, 0], [0, 0, 0, 4, 0, 0, 8, 0, 0], [1, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 2, 0, 0, 0, 0], [0, 8, 0, 0, 0, 0, 0, 4, 0], [0, 5, 0, 0, 0, 0, 6, 0, 0],
+    ]
+    before = client.get("/api/v1/cache").json()
+    first = client.post("/api/v1/solve/dlx", json={"board": board}).json()
+    second = client.post("/api/v1/solve/backtracking", json={"board": board}).json()
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["solved_board"] == first["solved_board"]
+    after = client.get("/api/v1/cache").json()
+    assert after["hits"] == before["hits"] + 1
+
+def test_solve_instrumented():
+    board = [
+        [0, 0, 0, 0, 0, 0, 0, 1, 2], [0, 0, 0, 0, 3, 5, 0, 0, 0], [0, 0, 0, 6, 0, 0, 0, 7, 0],
+        [7, 0, 0, 0, 0, 0, 3, 0, 0], [0, 0, 0, 4, 0, 0, 8, 0, 0], [1, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 2, 0, 0, 0, 0], [0, 8, 0, 0, 0, 0, 0, 4, 0], [0, 5, 0, 0, 0, 0, 6, 0, 0],
+    ]
+    client.post("/api/v1/solve/dlx", json={"board": board})   # now cached
+    data = client.post("/api/v1/solve/dlx?instrument=true", json={"board": board}).json()
+    assert data["cached"] is False
+    stats = data["search_stats"]
+    assert stats["nodes"] == sum(stats["nodes_by_depth"]) == data["steps"]
+    assert stats["max_depth"] == data["search_cells"]
+    assert sum(stats["dead_ends_by_depth"]) == sum(stats["dead_end_reasons"].values())
+    assert client.post("/api/v1/solve/dlx", json={"board": board}).json()["search_stats"] is None
+
+def test_solve_profiled(monkeypatch, tmp_path):
+    from src.api import routes
+    monkeypatch.setattr(routes.request_profiler, "directory", str(tmp_path))
+    board = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+    data = client.post("/api/v1/solve/backtracking?profile=cprofile", json={"board": board}).json()
+    assert data["profile"].endswith(".pstats") and data["profile"].startswith(str(tmp_path))
+    assert client.post("/api/v1/solve/dlx", json={"board": board}).json()["profile"] is None
+    data = client.post("/api/v1/count?profile=sampling", json={"board": board}).json()
+    assert data["profile"].endswith(".folded")
+    assert client.post("/api/v1/solve/dlx?profile=flame", json={"board": board}).status_code == 422
+
+def test_solve_backtracking_ordering():
+    board = [[0] * 4 for _ in range(4)]
+    board[0] = [1, 2, 3, 4]
+    data = client.post(
+        "/api/v1/solve/backtracking?variable_order=mrv-degree&value_order=lcv&instrument=true", json={"board": board}
+    ).json()
+    assert data["ordering"] == "mrv-degree/lcv" and data["success"] is True
+    response = client.post("/api/v1/solve/backtracking?value_order=widest", json={"board": board})
+    assert response.status_code == 422
+
+def test_health_answers_during_deadline_limited_solve():
+    from src.utils.generator import generate_sized_puzzle
+    # mrv-degree/lcv searches this board slowly, so the deadline stops it
+    board = generate_sized_puzzle(box=5, empty_ratio=0.9, seed=1)
+    responses = {}
+    with TestClient(app) as shared:   # one event loop serves both requests
+        def solve():
+            responses["solve"] = shared.post(
+                "/api/v1/solve/backtracking?variable_order=mrv-degree&value_order=lcv",
+                json={"board": board}, headers={"X-Deadline-Ms": "1500"},
+            )
+        worker = threading.Thread(target=solve)
+        worker.start()
+        time.sleep(0.2)
+        start = time.perf_counter()
+        health = shared.get("/api/v1/health")
+        waited = time.perf_counter() - start
+        still_solving = worker.is_alive()
+        worker.join()
+    assert health.status_code == 200
+    assert still_solving and waited < 0.5
+    assert responses["solve"].status_code == 503
@@ -0,0 +1,117 @@
+import json
+import os
+import time
+import pytest
+from src.bench.cli import ci95, main as bench_main
+from src.solver.board import Board
+from src.bench.suite import (
+    CORPORA, DEFAULT_TIMING_TOLERANCE, DEFAULT_TOLERANCE, RunResult, compare, load_baseline, machine_fingerprint, run_suite, save_baseline,
+)
+
+
+@pytest.fixture(scope="module")
+def suite_results():
+    return run_suite()
+
+@pytest.mark.perf
+def test_corpus_fully_solved(suite_results):
+    assert {r.corpus for r in suite_results} == set(CORPORA)
+    for result in suite_results:
+        assert result.solved == result.puzzles, result.key
+
+@pytest.mark.perf
+def test_no_performance_regressions(suite_results, request):
+    config = request.config
+    path = config.getoption("--perf-baseline")
+    if config.getoption("--perf-update"):
+        save_baseline(path, suite_results)
+        pytest.skip(f"baseline written to {path}")
+    if not os.path.exists(path):
+        pytest.skip(f"no baseline at {path}; create one with --perf-update")
+
+    tolerance = config.getoption("--perf-tolerance")
+    timing_tolerance = config.getoption("--perf-timing-tolerance")
+    regressions = compare(
+        load_baseline(path), suite_results,
+        tolerance=DEFAULT_TOLERANCE if tolerance is None else tolerance,
+        timing_tolerance=DEFAULT_TIMING_TOLERANCE if timing_tolerance is None else timing_tolerance,
+        check_timing=config.getoption("--perf-timing"),
+    )
+    assert not regressions, "\n".join(regressions)
+
+def _result(**changes):
+    fields = dict(engine="dlx", corpus="9x9-hard", puzzles=20, solved=20, steps=1000, backtracks=400,
+                  p50_ms=2.0, p95_ms=5.0, throughput=200.0)
+    fields.update(changes)
+    return RunResult(**fields)
+
+def test_compare_flags_regressions_beyond_tolerance(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, [_result()])
+    baseline = load_baseline(path)
+    assert baseline["machine"] == machine_fingerprint()
+
+    ok = _result(steps=1100, p50_ms=2.4, throughput=175.0)
+    assert compare(baseline, [ok], tolerance=0.25, timing_tolerance=0.25, check_timing=True) == []
+    slow = _result(steps=1300, p95_ms=7.0, throughput=150.0)
+    assert len(compare(baseline, [slow], tolerance=0.25, timing_tolerance=0.5, check_timing=True)) == 1
+    regressions = compare(baseline, [slow], tolerance=0.25, timing_tolerance=0.25, check_timing=True)
+    assert [r.split(":")[1].split()[0] for r in regressions] == ["steps", "p95_ms", "throughput"]
+
+    # Sub-millisecond timing changes are noise, however large in percent
+    jitter = _result(p95_ms=5.9, throughput=180.0)
+    assert compare(baseline, [jitter], timing_tolerance=0.1, check_timing=True) == []
+
+    # By default only the deterministic counters are compared
+    assert len(compare(baseline, [_result(steps=1300, p95_ms=7.0)])) == 1
+    assert compare(baseline, [_result(solved=19)])[0].startswith("dlx/9x9-hard: solved")
+
+def test_bench_cli_writes_json_and_csv(tmp_path, capsys):
+    puzzles = tmp_path / "puzzles.txt"
+    puzzles.write_text("puzzle\n" + "\n".join(str(Board.from_rows(p)) for p in CORPORA["4x4"].puzzles()[:3]) + "\n")
+    out_json, out_csv = tmp_path / "out.json", tmp_path / "out.csv"
+    rows = bench_main([
+        "--puzzles", str(puzzles), "--engine", "dlx", "--engine", "backtracking-bitmask",
+        "--trials", "3", "--no-isolate", "--json", str(out_json), "--csv", str(out_csv),
+    ])
+    assert [r["engine"] for r in rows] == ["dlx", "backtracking-bitmask"]
+    assert [r["ordering"] for r in rows] == [None, "mrv/ascending"]
+    assert all(r["puzzles"] == 3 and r["solved"] == 3 and r["trials"] == 3 for r in rows)
+    assert json.loads(out_json.read_text())["results"][1]["mean_ms_ci95"] >= 0
+    assert out_csv.read_text().splitlines()[0].startswith("engine,ordering,corpus,puzzles")
+    assert "puzzles.txt" in capsys.readouterr().out
+
+def test_ci95_uses_student_t():
+    assert ci95([1.0]) == 0.0
+    assert ci95([1.0, 3.0]) == pytest.approx(12.706)    # t(1) * stdev 1.414 / sqrt(2)
+
+@pytest.mark.perf
+def test_cold_cache_is_not_slower_than_solving():
+    # Every puzzle is new, so each cached solve is a miss plus a put. That
+    # bookkeeping must stay small next to the solve itself.
+    from src.solver.backtracking_solver import BacktrackingSolver
+    from src.solver.cache import CachedSolver, SolutionCache
+    from src.utils.generator import generate_sized_puzzle
+
+    puzzles = [Board.from_rows(generate_sized_puzzle(3, 0.6, seed=seed)) for seed in range(40)]
+    solver = BacktrackingSolver()
+
+    def uncached():
+        for puzzle in puzzles:
+            solver.solve(puzzle)
+
+    def cold_cached():
+        cached = CachedSolver(solver, SolutionCache())
+        for puzzle in puzzles:
+            cached.solve(puzzle)
+            assert not cached.hit
+
+    uncached()   # warm up
+    times = {run: [] for run in (uncached, cold_cached)}
+    for _ in range(5):
+        for run in times:
+            start = time.perf_counter()
+            run()
+            times[run].append(time.perf_counter() - start)
+    plain, cached = min(times[uncached]), min(times[cold_cached])
+    assert cached <= plain * 1.2, f"cold cache {cached * 1000:.1f}ms vs uncached {plain * 1000:.1f}ms"
@@ -1,7 +1,29 @@
+import json
+import pstats
+import time
+import tracemalloc
 import pytest
 from src.solver.backtracking_solver import BacktrackingSolver
-from src.solver.dlx_solver import DLXSolver
+from src.solver.dlx_solver import DLXSolver, MATRIX_POOL
+from src.solver.array_dlx_solver import ArrayDLXSolver
 from src.solver.validator import SudokuValidator
+from src.solver.propagation import ConstraintPropagator
+from src.solver.batch_solver import BatchSolver
+from src.solver.board import Board
+from src.solver.cache import CachedSolver, SolutionCache
+from src.solver.canonical import Transform, canonicalize
+from src.solver.store import SolutionStore, read_corpus
+from src.solver.incremental import IncrementalBoard
+from src.solver.benchmarker import Benchmarker, summarize
+from src.solver.profiling import RequestProfiler
+from src.solver.parallel import solve_many, imap_solve
+from src.solver.portfolio import PortfolioSolver
+from src.config import settings
+from src.solver.events import SOLVED, PLACE, BACKTRACK
+from src.solver.limits import BudgetExceeded, CancellationToken, SolveLimits
+from src.utils.generator import SudokuGenerator, generate_new_puzzle, generate_sized_puzzle
+from src.utils.bulk_generator import chunk_seed, generate_bulk
+import numpy as np
 
 @pytest.fixture
 def easy_puzzle():
@@ -49,3 +71,599 @@ def test_dlx_solver(easy_puzzle):
     result = solver.solve(easy_puzzle)
     assert result is not None
     assert SudokuValidator.is_solved(result) is True
+
+@pytest.fixture
+def hard_puzzle():
+    # Arto Inkala's "world's hardest" Sudoku
+    return [
+        [8, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 3, 6, 0, 0, 0, 0, 0],
+        [0, 7, 0, 0, 9, 0, 2, 0, 0],
+        [0, 5, 0, 0, 0, 7, 0, 0, 0],
+        [0, 0, 0, 0, 4, 5, 7, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0, 3, 0],
+        [0, 0, 1, 0, 0, 0, 0, 6, 8],
+        [0, 0, 8, 5, 0, 0, 0, 1, 0],
+        [0, 9, 0, 0, 0, 0, 4, 0, 0]
+    ]
+
+@pytest.mark.parametrize("engine", ["classic", "bitmask"])
+def test_backtracking_engines_agree(engine, easy_puzzle):
+    result = BacktrackingSolver(engine=engine).solve(easy_puzzle)
+    assert result == DLXSolver().solve(easy_puzzle)
+
+def test_bitmask_engine_hard_puzzle(hard_puzzle):
+    solver = BacktrackingSolver(engine="bitmask", propagation="off")
+    result = solver.solve(hard_puzzle)
+    assert result is not None
+    assert SudokuValidator.is_solved(result) is True
+    assert solver.steps > 0
+    assert solver.backtracks == solver.steps - 60  # every placement but the final 60 was undone
+
+def test_backtracking_unknown_engine():
+    with pytest.raises(ValueError):
+        BacktrackingSolver(engine="quantum")
+
+def test_propagation_solves_easy_puzzle(easy_puzzle):
+    propagator = ConstraintPropagator()
+    reduced = propagator.reduce(easy_puzzle)
+    assert SudokuValidator.is_solved(reduced) is True
+    assert propagator.filled == 51
+
+def test_propagation_detects_contradiction():
+    # No clue clashes, but cell (0, 8) has no legal digit left
+    board = [[0] * 9 for _ in range(9)]
+    board[0] = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    board[1][8] = 9
+    assert SudokuValidator.is_valid_board(board) is True
+    assert ConstraintPropagator().reduce(board) is None
+
+@pytest.mark.parametrize("mode", ["off", "prepass", "nodes"])
+def test_propagation_modes_agree(mode, hard_puzzle):
+    expected = DLXSolver(propagation="off").solve(hard_puzzle)
+    solver = BacktrackingSolver(engine="bitmask", propagation=mode)
+    assert solver.solve(hard_puzzle) == expected
+    assert solver.propagated_cells + solver.search_cells == 60
+    assert DLXSolver(propagation=mode).solve(hard_puzzle) == expected
+
+def test_dlx_reports_propagated_cells(easy_puzzle):
+    solver = DLXSolver(propagation="prepass")
+    assert solver.solve(easy_puzzle) is not None
+    assert (solver.propagated_cells, solver.search_cells) == (51, 0)
+
+def test_array_dlx_matches_dlx(hard_puzzle):
+    expected = DLXSolver(propagation="off").solve(hard_puzzle)
+    solver = ArrayDLXSolver(propagation="off")
+    assert solver.solve(hard_puzzle) == expected
+    assert solver.nodes_visited > 0
+    # Preallocated buffers are reused on the next solve
+    assert solver.solve(hard_puzzle) == expected
+
+def test_dlx_template_shared_across_threads(easy_puzzle, hard_puzzle):
+    from concurrent.futures import ThreadPoolExecutor
+    expected = {
+        "easy": DLXSolver(propagation="off").solve(easy_puzzle),
+        "hard": DLXSolver(propagation="off").solve(hard_puzzle),
+    }
+    jobs = [("easy", easy_puzzle), ("hard", hard_puzzle)] * 8
+
+    def run(job):
+        name, puzzle = job
+        return name, DLXSolver(propagation="off").solve(puzzle)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for name, result in pool.map(run, jobs):
+            assert result == expected[name]
+
+    # Every pooled template is back in its empty-grid state
+    for matrix in MATRIX_POOL._free[3]:
+        assert all(matrix.row_nodes[i].column.size == 9 for i in range(0, 729, 37))
+
+@pytest.mark.parametrize("solver_cls", [DLXSolver, ArrayDLXSolver])
+def test_dlx_pause_resume_matches_uninterrupted(solver_cls, hard_puzzle):
+    import json
+    reference = solver_cls(propagation="off")
+    expected = reference.solve(hard_puzzle)
+
+    solver = solver_cls(propagation="off")
+    assert solver.start(hard_puzzle) is True
+    slices = 0
+    while not solver.run(max_nodes=100):
+        slices += 1
+        # Round-trip through JSON and continue in a fresh solver
+        state = json.loads(json.dumps(solver.checkpoint()))
+        solver.close()
+        solver = solver_cls.resume(state)
+
+    assert slices == reference.nodes_visited // 100
+    assert solver.solution() == expected
+    assert (solver.nodes_visited, solver.backtracks) == (reference.nodes_visited, reference.backtracks)
+
+@pytest.mark.parametrize("solver_cls", [BacktrackingSolver, DLXSolver, ArrayDLXSolver])
+def test_count_solutions(solver_cls, hard_puzzle):
+    assert solver_cls(propagation="off").count_solutions(hard_puzzle) == 1
+
+    # Removing clues from a unique puzzle opens up more solutions
+    hard_puzzle[0][0] = 0
+    hard_puzzle[1][2] = 0
+    assert solver_cls().count_solutions(hard_puzzle, limit=2) == 2
+    assert solver_cls().count_solutions(hard_puzzle, limit=1) == 1
+
+@pytest.mark.parametrize("box", [2, 3, 4, 5])
+def test_solvers_handle_all_sizes(box):
+    puzzle = generate_sized_puzzle(box, empty_ratio=0.5, seed=box)
+    assert SudokuValidator.is_valid_board(puzzle) is True
+    # Without per-node propagation the bitmask engine can stall on 25×25
+    for solver in (BacktrackingSolver(engine="bitmask", propagation="nodes"), DLXSolver(), ArrayDLXSolver()):
+        result = solver.solve(puzzle)
+        assert result is not None
+        assert SudokuValidator.is_solved(result) is True
+        assert all(result[r][c] == v for r, row in enumerate(puzzle) for c, v in enumerate(row) if v)
+
+def test_validate_many_reports_first_conflict(easy_puzzle):
+    base = np.array(easy_puzzle).ravel()
+    batch = np.tile(base, (4, 1))
+    batch[1, 2] = 5             # row 0 already has a 5
+    batch[2, 9 * 8 + 1] = 3     # column 1 already has a 3 (row 0)
+    batch[3, 0] = 10            # out of range
+    valid, conflicts = SudokuValidator.validate_many(batch)
+    assert valid.tolist() == [True, False, False, False]
+    assert conflicts.tolist() == [-1, 0, 9 + 1, -1]
+    assert [SudokuValidator.is_valid_board(b.reshape(9, 9).tolist()) for b in batch[:3]] == valid[:3].tolist()
+
+def test_validator_rejects_unsupported_sizes():
+    assert SudokuValidator.is_valid_board([[0] * 8 for _ in range(8)]) is False
+    assert SudokuValidator.is_valid_board([[0] * 36 for _ in range(36)]) is False
+    board = [[0] * 4 for _ in range(4)]
+    board[0][0] = 5  # out of range for 4×4
+    assert SudokuValidator.is_valid_board(board) is False
+
+def test_batch_solver_matches_dlx(easy_puzzle, hard_puzzle, invalid_puzzle):
+    puzzles = [easy_puzzle, hard_puzzle, invalid_puzzle]
+    puzzles += [generate_sized_puzzle(3, empty_ratio=0.55, seed=i) for i in range(20)]
+    batch = np.array([sum(p, []) for p in puzzles], dtype=np.uint8)
+
+    solver = BatchSolver(chunk_size=8)
+    solutions, solved = solver.solve(batch)
+    for puzzle, solution, ok in zip(puzzles, solutions, solved):
+        expected = DLXSolver(propagation="prepass").solve(puzzle)
+        if expected is None:
+            assert not ok
+            assert solution.tolist() == sum(puzzle, [])
+        else:
+            assert ok
+            assert solution.tolist() == sum(expected, [])
+    assert solver.failed == 1
+    assert solver.propagated + solver.searched == len(puzzles) - 1
+
+def test_batch_solver_gives_up_on_budget_exceeding_boards(easy_puzzle, hard_puzzle):
+    puzzles = [easy_puzzle, hard_puzzle, easy_puzzle]
+    batch = np.array([sum(p, []) for p in puzzles], dtype=np.uint8)
+    solver = BatchSolver(max_steps=1)
+    solutions, solved = solver.solve(batch)
+    assert solved.tolist() == [True, False, True]
+    assert solutions[1].tolist() == batch[1].tolist()
+    assert solutions[0].tolist() == sum(DLXSolver().solve(easy_puzzle), [])
+    assert solver.gave_up == solver.failed == 1
+
+def test_batch_solver_rejects_bad_shape():
+    with pytest.raises(ValueError):
+        BatchSolver().solve(np.zeros((2, 80), dtype=np.uint8))
+
+def test_batch_solver_empty_batch():
+    solver = BatchSolver()
+    for empty in ([], np.zeros((0, 81), dtype=np.uint8)):
+        solutions, solved = solver.solve(empty)
+        assert len(solutions) == len(solved) == 0
+        assert solver.propagated == solver.searched == solver.failed == 0
+
+def test_solve_many_matches_serial(easy_puzzle, hard_puzzle, invalid_puzzle):
+    boards = [easy_puzzle, invalid_puzzle, hard_puzzle] * 3
+    expected = [DLXSolver().solve(board) for board in boards]
+    assert solve_many(boards, "dlx", workers=2, chunksize=2) == expected
+
+    unordered = dict(imap_solve(boards, "backtracking", workers=2, chunksize=4, ordered=False))
+    assert [unordered[i] for i in range(len(boards))] == expected
+
+def test_solve_many_gives_up_on_budget_exceeding_boards(easy_puzzle, hard_puzzle):
+    # Propagation alone solves the easy board; the hard one needs a search
+    boards = [easy_puzzle, hard_puzzle, easy_puzzle]
+    solutions = solve_many(boards, "backtracking", workers=1, chunksize=3, max_steps=1)
+    assert solutions == [DLXSolver().solve(easy_puzzle), None, DLXSolver().solve(easy_puzzle)]
+    assert solve_many(boards, "backtracking", workers=1, max_steps=0)[1] == DLXSolver().solve(hard_puzzle)
+
+def test_imap_solve_reads_input_lazily(easy_puzzle):
+    consumed = 0
+    def boards():
+        nonlocal consumed
+        for _ in range(40):
+            consumed += 1
+            yield easy_puzzle
+
+    results = imap_solve(boards(), "backtracking", workers=1, chunksize=2)
+    index, solution = next(results)
+    assert index == 0 and solution == DLXSolver().solve(easy_puzzle)
+    assert consumed <= 3 * 2   # two chunks in flight plus the one just read
+    assert [i for i, _ in results] == list(range(1, 40))
+
+def test_solve_many_unknown_algorithm(easy_puzzle):
+    with pytest.raises(ValueError):
+        solve_many([easy_puzzle], "nope")
+
+def test_portfolio_returns_first_engine(hard_puzzle, invalid_puzzle):
+    solver = PortfolioSolver()
+    assert solver.solve(hard_puzzle) == DLXSolver().solve(hard_puzzle)
+    assert solver.winner in ("Backtracking", "DLX")
+    assert solver.benchmark.algorithm == solver.winner
+
+    solo = PortfolioSolver(engines=["DLX"])
+    assert solo.solve(invalid_puzzle) is None
+    assert solo.winner == "DLX"
+
+    with pytest.raises(ValueError):
+        PortfolioSolver(engines=["Quantum"])
+
+def test_portfolio_starts_engines_without_fork_from_a_thread(easy_puzzle):
+    # The API calls the portfolio from a threadpool thread
+    from concurrent.futures import ThreadPoolExecutor
+    from src.solver import portfolio
+    assert portfolio._CONTEXT.get_start_method() in ("forkserver", "spawn")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        solution = pool.submit(PortfolioSolver().solve, easy_puzzle).result(timeout=60)
+    assert solution == DLXSolver().solve(easy_puzzle)
+
+@pytest.mark.parametrize("solver_cls", [BacktrackingSolver, DLXSolver, ArrayDLXSolver])
+def test_step_budget_stops_search(solver_cls, hard_puzzle):
+    solver = solver_cls(propagation="off")
+    with pytest.raises(BudgetExceeded) as info:
+        solver.solve(hard_puzzle, SolveLimits(max_steps=50))
+    assert info.value.reason == "steps"
+    assert info.value.steps == 50
+
+    # The solver (and, for DLX, the pooled template) is still usable afterwards
+    assert solver.solve(hard_puzzle, SolveLimits()) == DLXSolver().solve(hard_puzzle)
+
+@pytest.mark.parametrize("solver_cls", [BacktrackingSolver, DLXSolver])
+def test_deadline_and_cancellation(solver_cls, easy_puzzle):
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(BudgetExceeded) as info:
+        solver_cls().solve(easy_puzzle, SolveLimits(token=token))
+    assert info.value.reason == "cancelled"
+
+    with pytest.raises(BudgetExceeded) as info:
+        solver_cls().count_solutions(easy_puzzle, limits=SolveLimits(deadline=time.monotonic() - 1))
+    assert info.value.reason == "deadline"
+
+def test_solvers_default_to_max_steps_setting(monkeypatch, hard_puzzle):
+    monkeypatch.setattr(settings, "MAX_STEPS", 10)
+    with pytest.raises(BudgetExceeded):
+        BacktrackingSolver(propagation="off").solve(hard_puzzle)
+    monkeypatch.setattr(settings, "MAX_STEPS", 0)  # 0 = unlimited
+    assert BacktrackingSolver(propagation="off").solve(hard_puzzle) is not None
+
+@pytest.mark.parametrize("engine", ["classic", "bitmask"])
+def test_iter_solve_events_replay_solution(engine, hard_puzzle):
+    reference = BacktrackingSolver(engine=engine, propagation="off")
+    expected = reference.solve(hard_puzzle, SolveLimits())
+
+    solver = BacktrackingSolver(engine=engine)
+    board = [row[:] for row in hard_puzzle]
+    events = list(solver.iter_solve(hard_puzzle, SolveLimits()))
+    for event in events:
+        if event.kind == PLACE:
+            board[event.row][event.col] = event.digit
+        elif event.kind == BACKTRACK:
+            board[event.row][event.col] = 0
+
+    assert events[-1].kind == SOLVED
+    assert board == expected
+    assert (solver.steps, solver.backtracks) == (reference.steps, reference.backtracks)
+    assert sum(e.kind == BACKTRACK for e in events) == solver.backtracks
+
+def test_iter_solve_unsolvable_has_no_solved_event(invalid_puzzle):
+    assert list(BacktrackingSolver().iter_solve(invalid_puzzle)) == []
+
+def test_board_conversions(easy_puzzle):
+    board = Board.from_rows(easy_puzzle)
+    text = board.to_string()
+    assert len(board.cells) == 81 and len(text) == 81
+    assert text.startswith("530070000")
+    assert Board.from_string(text.replace("0", ".")) == board
+    assert board.to_rows() == easy_puzzle
+    assert board[0][1] == 3 and board.get(0, 1) == 3
+    assert len(board.pack()) == 41
+    assert Board.from_packed(board.pack()) == board
+    assert hash(board) == hash(Board.from_string(text))
+    assert board.with_cell(0, 2, 4) != board
+
+    big = Board.from_string("0123456789ABCDEFG" + "0" * 239)
+    assert big.size == 16 and big[0][16 - 1] == 15
+    with pytest.raises(ValueError):
+        big.pack()
+    with pytest.raises(ValueError):
+        Board.from_string("12x" + "0" * 78)
+    with pytest.raises(ValueError):
+        Board(b"\x00" * 80)
+
+@pytest.mark.parametrize("solver_cls", [BacktrackingSolver, DLXSolver, ArrayDLXSolver])
+def test_solvers_accept_board(solver_cls, hard_puzzle):
+    board = Board.from_rows(hard_puzzle)
+    assert SudokuValidator.is_valid_board(board) is True
+    result = solver_cls().solve(board)
+    assert isinstance(result, Board)
+    assert result.to_rows() == DLXSolver().solve(hard_puzzle)
+    assert SudokuValidator.is_solved(result) is True
+    assert solver_cls().count_solutions(board) == 1
+
+def _scramble(board: Board) -> Board:
+    """An isomorphic copy: relabelled, transposed, bands/rows and stacks/columns moved."""
+    digits = (0, 4, 9, 1, 7, 2, 8, 6, 3, 5)
+    return Transform(True, (5, 3, 4, 8, 6, 7, 1, 0, 2), (2, 0, 1, 6, 7, 8, 4, 3, 5), digits).apply(board)
+
+def test_canonical_form_is_invariant(hard_puzzle):
+    board = Board.from_rows(hard_puzzle)
+    form, transform = canonicalize(board)
+    assert transform.apply(board) == form
+    assert transform.invert(form) == board
+
+    other = _scramble(board)
+    assert other != board
+    other_form, other_transform = canonicalize(other)
+    assert other_form == form
+    assert other_transform.invert(other_form) == other
+
+def test_cached_solver_maps_isomorphic_hits(hard_puzzle):
+    cache = SolutionCache(max_bytes=1 << 20, canonical=True)
+    solver = CachedSolver(DLXSolver(), cache)
+    assert solver.solve(hard_puzzle) == DLXSolver().solve(hard_puzzle)
+    assert not solver.hit
+
+    assert solver.solve(hard_puzzle) == DLXSolver().solve(hard_puzzle)
+    assert solver.hit and cache.exact_hits == 1
+
+    scrambled = _scramble(Board.from_rows(hard_puzzle))
+    result = solver.solve(scrambled)
+    assert solver.hit and cache.canonical_hits == 1
+    assert result == DLXSolver().solve(scrambled)
+    assert cache.stats()["misses"] == 1
+
+def test_cold_cache_solves_once_without_canonicalising(monkeypatch, easy_puzzle):
+    # A miss must cost one solve plus dictionary work; canonical forms are opt-in
+    import src.solver.cache as cache_module
+    canonicalised = []
+    monkeypatch.setattr(cache_module, "_canonical_form", lambda board: canonicalised.append(board))
+
+    class CountingSolver:
+        calls = 0
+        def solve(self, board, limits=None):
+            self.calls += 1
+            return DLXSolver().solve(board, limits)
+
+    inner = CountingSolver()
+    cached = CachedSolver(inner, SolutionCache(max_bytes=1 << 20))
+    puzzles = [Board.from_rows(generate_sized_puzzle(3, 0.5, seed=seed)) for seed in range(5)]
+    for puzzle in puzzles + puzzles:
+        cached.solve(puzzle)
+    assert inner.calls == len(puzzles)
+    assert cached.cache.exact_hits == len(puzzles) and canonicalised == []
+
+    SolutionCache(max_bytes=1 << 20, canonical=True).put(puzzles[0], DLXSolver().solve(puzzles[0]))
+    assert canonicalised == [puzzles[0]]
+
+def test_solution_cache_evicts_to_memory_cap(easy_puzzle, hard_puzzle):
+    easy, hard = Board.from_rows(easy_puzzle), Board.from_rows(hard_puzzle)
+    probe = SolutionCache(max_bytes=1 << 20)
+    probe.put(easy, DLXSolver().solve(easy))
+    cache = SolutionCache(max_bytes=probe.bytes_used + 10)   # room for one puzzle
+    cache.put(easy, DLXSolver().solve(easy))
+    cache.put(hard, DLXSolver().solve(hard))
+    assert cache.evictions == 1
+    assert cache.bytes_used <= cache.max_bytes
+    assert cache.get(easy) is None
+    assert cache.get(hard) is not None
+
+def test_solution_store_round_trip(tmp_path, hard_puzzle):
+    puzzle = Board.from_rows(hard_puzzle)
+    solution = DLXSolver().solve(puzzle)
+    path = str(tmp_path / "solutions.db")
+    store = SolutionStore(path, batch_size=10)
+    assert store.get(puzzle) is None
+    store.put(puzzle, solution)
+    assert store.get(puzzle) == solution          # visible before the batch commits
+    store.close()
+
+    store = SolutionStore(path)
+    assert len(store) == 1 and store.get(puzzle) == solution
+    cached = CachedSolver(DLXSolver(), SolutionCache(max_bytes=1 << 20), store)
+    assert cached.solve(puzzle) == solution and cached.source == "store"
+    assert cached.solve(puzzle) == solution and cached.source == "cache"
+    store.close()
+
+def test_solution_store_bulk_load(tmp_path, easy_puzzle):
+    easy = Board.from_rows(easy_puzzle)
+    big = Board(bytes(256))
+    corpus = tmp_path / "corpus.csv"
+    corpus.write_text(
+        "quizzes,solutions\n"
+        f"{easy},{DLXSolver().solve(easy)}\n"
+        f'{{"puzzle": "{big}"}}\n'
+    )
+    store = SolutionStore(str(tmp_path / "solutions.db"))
+    wrong = DLXSolver().solve(easy).with_cell(0, 2, 0)
+    assert store.put_many([(easy, wrong)], validate=True) == 0
+    assert store.put_many(read_corpus(str(corpus)), validate=True) == 1
+    assert store.put_many(read_corpus(str(corpus), solve=True)) == 1   # only the 16×16 is new
+    assert store.get(easy) == DLXSolver().solve(easy)
+    assert SudokuValidator.is_solved(store.get(big).to_rows())
+    store.close()
+
+def test_incremental_board_place_and_undo(easy_puzzle):
+    state = IncrementalBoard(easy_puzzle)
+    empty = state.empty
+    assert state.can_place(0, 2, 4) is True
+    assert state.can_place(0, 2, 5) is False        # 5 already in row 0
+    assert [state.can_place(0, 2, d) for d in range(1, 10)] == \
+        [SudokuValidator.is_safe_move(easy_puzzle, 0, 2, d) for d in range(1, 10)]
+
+    state.place(0, 2, 4)
+    assert state.can_place(1, 1, 4) is False        # same box
+    assert state.can_place(0, 2, 4) is True         # its own value
+    assert state.empty == empty - 1
+    assert state.undo() == (0, 2, 4)
+    assert state.to_rows() == easy_puzzle and state.empty == empty
+    assert state.candidate_count(0, 2) == 3         # 1, 2, 4
+
+    with pytest.raises(ValueError):
+        IncrementalBoard([[1, 1, 0, 0]] + [[0] * 4 for _ in range(3)])
+
+def test_benchmarker_measure_and_phases(hard_puzzle):
+    bench = Benchmarker()
+    solver = DLXSolver()
+    result = bench.measure("DLX", solver.solve, hard_puzzle, repeat=5, warmup=1)
+    assert result.repeats == 5 and result.warmup == 1
+    assert result.min_time <= result.median_time <= result.p95_time
+    assert result.steps == solver.nodes_visited > 0
+    assert result.peak_memory_mb > 0 and result.cpu_time > 0
+
+    @bench.phase("solve")
+    def run():
+        return solver.solve(hard_puzzle)
+    run(); run()
+    with bench.phase("validate"):
+        SudokuValidator.is_valid_board(hard_puzzle)
+    stats = bench.phase_stats()
+    assert stats["solve"]["count"] == 2 and stats["validate"]["count"] == 1
+    assert summarize([3.0, 1.0, 2.0]) == {"min": 1.0, "median": 2.0, "p95": 3.0, "stdev": 1.0, "mean": 2.0}
+
+def test_benchmarker_traces_solve_memory(hard_puzzle):
+    solver = DLXSolver()
+    solver.benchmarker = Benchmarker(trace_memory=True)
+    solver.solve(hard_puzzle)
+    bench = solver.benchmarker.last
+    assert bench.peak_memory_mb is not None and bench.memory_usage_mb == bench.peak_memory_mb > 0
+
+@pytest.mark.parametrize("solver_cls", [DLXSolver, ArrayDLXSolver])
+def test_dlx_search_stats(solver_cls, hard_puzzle):
+    solver = solver_cls(propagation="off", instrument=True)
+    assert solver.solve(hard_puzzle) is not None
+    stats = solver.benchmarker.last.search_stats
+    assert stats["nodes"] == sum(stats["nodes_by_depth"]) == solver.nodes_visited
+    assert stats["max_depth"] == solver.search_cells
+    assert sum(stats["dead_ends_by_depth"]) == sum(stats["dead_end_reasons"].values()) <= solver.backtracks
+    assert set(stats["dead_end_reasons"]) <= {"cell", "row", "column", "box"}
+    assert stats["branching_factor"] >= 1
+
+    plain = solver_cls(propagation="off")
+    plain.solve(hard_puzzle)
+    assert plain.stats is None and plain.benchmarker.last.search_stats is None
+    assert plain.nodes_visited == solver.nodes_visited
+
+@pytest.mark.parametrize("engine", ["classic", "bitmask"])
+def test_backtracking_search_stats(engine, easy_puzzle):
+    solver = BacktrackingSolver(engine=engine, propagation="off", instrument=True)
+    assert solver.solve(easy_puzzle) is not None
+    stats = solver.stats
+    assert stats.max_depth == solver.search_cells
+    assert stats.nodes_by_depth[0] == 1
+    if engine == "bitmask":
+        assert stats.nodes == solver.steps + 1   # every step enters one child
+    assert sum(stats.dead_ends_by_depth) == stats.dead_end_reasons.get("cell", 0)
+    assert solver.benchmarker.last.search_stats == stats.to_dict()
+
+def test_request_profiler_writes_profiles(tmp_path, hard_puzzle):
+    profiler = RequestProfiler(directory=str(tmp_path), mode="sampling", sample_every=3, interval_ms=1)
+    sampled = []
+    for _ in range(6):
+        with profiler.profile("dlx") as capture:
+            DLXSolver().solve(hard_puzzle)
+        sampled.append(capture is not None)
+    assert sampled == [False, False, True, False, False, True]
+    assert sorted(p.suffix for p in tmp_path.iterdir()) == [".folded", ".folded"]
+
+    with profiler.profile("dlx", mode="cprofile") as capture:
+        DLXSolver().solve(hard_puzzle)
+    stats = pstats.Stats(capture.path)
+    assert any(func[2] == "_search" for func in stats.stats)
+
+@pytest.mark.parametrize("variable_order", ["first-empty", "mrv", "mrv-degree"])
+@pytest.mark.parametrize("value_order", ["ascending", "lcv", "random"])
+def test_ordering_strategies(variable_order, value_order, hard_puzzle):
+    solver = BacktrackingSolver("bitmask", "off", variable_order=variable_order, value_order=value_order)
+    assert solver.solve(hard_puzzle, SolveLimits()) == DLXSolver().solve(hard_puzzle)
+    assert solver.benchmarker.last.ordering == f"{variable_order}/{value_order}"
+    assert solver.count_solutions([[0] * 4 for _ in range(4)], limit=1000) == 288
+
+def test_ordering_random_is_seeded(hard_puzzle):
+    def steps(seed):
+        solver = BacktrackingSolver("bitmask", "off", value_order="random", seed=seed)
+        solver.solve(hard_puzzle, SolveLimits())
+        return solver.steps
+    assert steps(1) == steps(1)
+    assert len({steps(seed) for seed in range(5)}) > 1
+
+def test_ordering_validation():
+    with pytest.raises(ValueError):
+        BacktrackingSolver("bitmask", variable_order="widest")
+    with pytest.raises(ValueError):
+        BacktrackingSolver("classic", variable_order="mrv")
+    with pytest.raises(ValueError):
+        BacktrackingSolver("bitmask", "nodes", value_order="lcv")
+    assert BacktrackingSolver("classic").ordering == "first-empty/ascending"
+
+@pytest.mark.parametrize("difficulty", ["easy", "hard"])
+def test_generator_makes_unique_puzzles(difficulty):
+    for seed in range(5):
+        generator = SudokuGenerator(difficulty, seed=seed)
+        puzzle = generator.generate_puzzle()
+        assert DLXSolver(propagation="off").count_solutions(puzzle, limit=2, limits=SolveLimits()) == 1
+        assert DLXSolver().solve(puzzle) == generator.solution
+        assert generator.count_solutions() == 1
+    assert generate_new_puzzle(difficulty, seed=1) == generate_new_puzzle(difficulty, seed=1)
+
+def test_generator_counts_with_cutoff(easy_puzzle):
+    generator = SudokuGenerator()
+    generator.grid = [row[:] for row in easy_puzzle]
+    assert generator.count_solutions() == 1
+    generator.grid = [[0] * 9 for _ in range(9)]
+    assert generator.count_solutions(limit=2) == 2
+    assert generator.grid == [[0] * 9 for _ in range(9)]
+
+def test_bulk_generation_is_reproducible(tmp_path):
+    counts = {"easy": 5, "hard": 3}
+    serial, parallel = tmp_path / "serial.jsonl", tmp_path / "parallel.jsonl"
+    calls = []
+    assert generate_bulk(str(serial), counts, seed=3, workers=1, chunksize=2,
+                         progress=lambda *args: calls.append(args[:3])) == 8
+    generate_bulk(str(parallel), counts, seed=3, workers=2, chunksize=2)
+    assert serial.read_text() == parallel.read_text()
+    assert calls[-1] == ("hard", 3, 3) and ("easy", 4, 5) in calls
+
+    records = [json.loads(line) for line in serial.read_text().splitlines()]
+    assert [r["difficulty"] for r in records] == ["easy"] * 5 + ["hard"] * 3
+    for record in records:
+        assert DLXSolver(propagation="off").count_solutions(Board.coerce(record["puzzle"]), limits=SolveLimits()) == 1
+    assert [pair[0] for pair in read_corpus(str(serial))] == [Board.coerce(r["puzzle"]) for r in records]
+
+    lines = tmp_path / "hard.txt"
+    generate_bulk(str(lines), {"hard": 3}, seed=3, workers=1, chunksize=2)
+    assert lines.read_text().splitlines() == [r["puzzle"] for r in records[5:]]
+    assert chunk_seed(3, "easy", 0) != chunk_seed(3, "easy", 1) != chunk_seed(3, "hard", 1)
+
+@pytest.mark.parametrize("make_solver", [
+    lambda: BacktrackingSolver("classic", "off"),
+    lambda: BacktrackingSolver("bitmask", "off"),
+    lambda: BacktrackingSolver("bitmask", "nodes"),
+    lambda: DLXSolver(propagation="off"),
+    lambda: DLXSolver(propagation="prepass"),
+    lambda: ArrayDLXSolver(propagation="off"),
+])
+def test_unsolvable_solve_stops_tracing(make_solver):
+    # Valid but unsolvable: (0, 8) has no candidate left
+    board = [[1, 2, 3, 4, 5, 6, 7, 8, 0], [0] * 8 + [9]] + [[0] * 9 for _ in range(7)]
+    solver = make_solver()
+    solver.benchmarker = Benchmarker(trace_memory=True)
+    assert solver.solve(board, SolveLimits()) is None
+    assert not tracemalloc.is_tracing()
+    assert solver.count_solutions(board, limits=SolveLimits()) == 0
+    assert not tracemalloc.is_tracing()